@@ -0,0 +1,444 @@
+"""Offline benchmarks of the price calculation hot paths.
+
+Every stage runs against recorded fixture payloads served by a stubbed aiohttp
+session, so no network access or running Home Assistant is needed. Run from the
+repository root, with the development requirements installed:
+
+    python -m benchmarks [--repeat N] [--json results.json] [stage ...]
+
+For each stage the best and median wall time of N runs is reported, along with
+the peak and retained memory allocated by a single run.
+"""
+
+from __future__ import annotations
+
+import argparse
+import asyncio
+import json
+import os
+import statistics
+import sys
+import tracemalloc
+from collections import namedtuple
+from datetime import timedelta
+from importlib import import_module
+from time import perf_counter
+from zoneinfo import ZoneInfo
+
+import homeassistant.util.dt as dt_util
+from homeassistant.helpers.json import json_dumps
+
+from custom_components.energidataservice.connectors import (
+    Connectors,
+    energidataservice,
+)
+from custom_components.energidataservice.const import CONF_RESOLUTION, DEFAULT_TEMPLATE
+from custom_components.energidataservice.forecasts import Forecast, carnot
+from custom_components.energidataservice.sensor import show_with_vat
+from custom_components.energidataservice.tariffs import Tariff
+from custom_components.energidataservice.tariffs.energidataservice import (
+    Connector as TariffConnector,
+)
+from custom_components.energidataservice.utils import providers
+from custom_components.energidataservice.utils.costtemplate import CostTemplate
+from custom_components.energidataservice.utils.forecasthandler import ForecastHandler
+from custom_components.energidataservice.utils.metrics import Metrics
+from custom_components.energidataservice.utils.periods import PriceSlots
+from custom_components.energidataservice.utils.pricecalc import PriceCalculator
+from custom_components.energidataservice.utils.regionhandler import RegionHandler
+from custom_components.energidataservice.utils.registry import ProviderRegistry
+from custom_components.energidataservice.utils.series import TimeSeries
+from custom_components.energidataservice.utils.statistics import PriceStatistics
+
+from .stubs import FakeEntry, FakeHass, FakeSession, JinjaTemplate
+
+TZ = ZoneInfo("Europe/Copenhagen")
+REGION = "DK1"
+VERSION = "benchmark"
+
+# A template that can't be reduced to a sum, so every distinct input is rendered
+RENDERED_TEMPLATE = (
+    "{% if now().hour >= 17 and now().hour < 21 %}"
+    "{{ current_tariff * 1.1 + 0.05 }}"
+    "{% else %}{{ current_tariff + 0.05 }}{% endif %}"
+)
+
+PROVIDER_PACKAGES = tuple(f"{providers.PACKAGE}.{kind}." for kind in providers.KINDS)
+
+Result = namedtuple("Result", "stage runs best median peak retained")
+
+LOOP = asyncio.new_event_loop()
+
+
+def run(coro):
+    """Run a coroutine to completion on the benchmark loop."""
+    return LOOP.run_until_complete(coro)
+
+
+def spot_connector(fixture: str, hourly: bool) -> energidataservice.Connector:
+    """Return a spot price connector answering from fixture."""
+    return energidataservice.Connector(
+        RegionHandler(REGION),
+        FakeSession({"DayAheadPrices": fixture}),
+        TZ,
+        FakeEntry(**{CONF_RESOLUTION: hourly}),
+        VERSION,
+    )
+
+
+def fetched(connector: energidataservice.Connector) -> energidataservice.Connector:
+    """Return connector after fetching the spot prices."""
+    run(connector.async_get_spotprices())
+    return connector
+
+
+def prepare(connector: energidataservice.Connector):
+    """Return a function parsing the fetched records and selecting both days."""
+
+    def parse_and_select():
+        # Drop the parsed records, like a new fetch does
+        connector._series = None  # pylint: disable=protected-access
+        return connector.today, connector.tomorrow
+
+    return parse_and_select
+
+
+def tariff_session() -> FakeSession:
+    """Return a session serving the pricelist and system tariffs."""
+    return FakeSession(
+        {
+            '"Note"': "system_tariffs.json",
+            "DatahubPricelist": "datahubpricelist.json",
+        }
+    )
+
+
+def tariff_connector(session: FakeSession | None = None) -> TariffConnector:
+    """Return a tariff connector with the pricelist fetched."""
+    connector = TariffConnector(
+        FakeHass(), session or tariff_session(), "Radius", VERSION
+    )
+    run(connector.async_get_tariffs())
+    return connector
+
+
+def forecast() -> list:
+    """Return the parsed 7 day forecast."""
+    connector = carnot.Connector(
+        RegionHandler(REGION),
+        FakeSession({"get_predict": "carnot_7days.json"}),
+        TZ,
+        VERSION,
+    )
+    return run(connector.async_get_forecast("apikey", "benchmark@example.com"))
+
+
+def calculator(tariffs: TariffConnector, template: str) -> PriceCalculator:
+    """Return a price calculator using tariffs and a fresh template."""
+    api = type(
+        "API",
+        (),
+        {
+            "tariff_data": tariffs.tariffs,
+            "tariff_connector": tariffs,
+            "metrics": Metrics(),
+        },
+    )()
+    return PriceCalculator(
+        api,
+        RegionHandler(REGION),
+        "DKK",
+        "kWh",
+        0.25,
+        False,
+        CostTemplate(JinjaTemplate(template)),
+    )
+
+
+def stage_fetch_spotprices():
+    """Request and decode the 15 minute DayAheadPrices."""
+    connector = spot_connector("dayaheadprices_15min.json", True)
+    return lambda: run(connector.async_get_spotprices())
+
+
+def stage_prepare_hourly():
+    """Average the 15 minute DayAheadPrices to hourly prices."""
+    return prepare(fetched(spot_connector("dayaheadprices_15min.json", True)))
+
+
+def stage_prepare_15min():
+    """Parse the 15 minute DayAheadPrices."""
+    return prepare(fetched(spot_connector("dayaheadprices_15min.json", False)))
+
+
+def stage_prepare_hourly_payload():
+    """Parse an hourly DayAheadPrices payload."""
+    return prepare(fetched(spot_connector("dayaheadprices_hourly.json", False)))
+
+
+def stage_co2():
+    """Request, decode and parse a day of CO2EmisProg."""
+    connector = energidataservice.Connector(
+        RegionHandler(REGION),
+        FakeSession({"CO2EmisProg": "co2emisprog.json"}),
+        TZ,
+        FakeEntry(),
+        VERSION,
+    )
+
+    async def fetch_and_parse():
+        await connector.async_get_co2emissions()
+        return connector.co2data
+
+    return lambda: run(fetch_and_parse())
+
+
+def stage_carnot():
+    """Request, decode and parse the 7 day Carnot forecast."""
+    return forecast
+
+
+def stage_carnot_filter():
+    """Filter the Carnot forecast like APIConnector.update_carnot."""
+    predictions = forecast()
+    return lambda: ForecastHandler.filter_predictions(predictions, True)
+
+
+def stage_tariffs():
+    """Request the 500 row DatahubPricelist and system tariffs, and index them."""
+    session = tariff_session()
+    return lambda: tariff_connector(session)
+
+
+def stage_dated_tariffs():
+    """Look up the tariffs for every hour of a week."""
+    connector = tariff_connector()
+    start = dt_util.start_of_local_day()
+    hours = [start + timedelta(hours=hour) for hour in range(7 * 24)]
+
+    def lookup():
+        for hour in hours:
+            connector.get_dated_tariff(hour)
+            connector.get_dated_system_tariff(hour)
+
+    return lookup
+
+
+def stage_calculate_default():
+    """Localize todays 15 minute prices using the default cost template."""
+    today = fetched(spot_connector("dayaheadprices_15min.json", False)).today
+    tariffs = tariff_connector()
+    return lambda: calculator(tariffs, DEFAULT_TEMPLATE).calculate(today, "EUR")
+
+
+def stage_calculate_rendered():
+    """Localize todays 15 minute prices using a template that must be rendered."""
+    today = fetched(spot_connector("dayaheadprices_15min.json", False)).today
+    tariffs = tariff_connector()
+    return lambda: calculator(tariffs, RENDERED_TEMPLATE).calculate(today, "EUR")
+
+
+def stage_calculate_forecast():
+    """Localize the 7 day forecast."""
+    predictions = forecast()
+    tariffs = tariff_connector()
+    return lambda: calculator(tariffs, DEFAULT_TEMPLATE).calculate(predictions, "DKK")
+
+
+def stage_statistics():
+    """Calculate the aggregates of todays 15 minute prices."""
+    today = fetched(spot_connector("dayaheadprices_15min.json", False)).today
+
+    def aggregate():
+        stats = PriceStatistics(today)
+        return stats.min(), stats.max(), stats.mean(), stats.raw(3)
+
+    return aggregate
+
+
+def stage_periods():
+    """Find the cheapest and most expensive 3 hours in all known prices."""
+    connector = fetched(spot_connector("dayaheadprices_15min.json", False))
+    datasets = [connector.today, connector.tomorrow, forecast()]
+
+    def search():
+        slots = PriceSlots(datasets)
+        return (
+            slots.cheapest_window(timedelta(hours=3)),
+            slots.most_expensive_window(timedelta(hours=3)),
+            slots.cheapest_slots(timedelta(hours=3)),
+        )
+
+    return search
+
+
+def _purge_providers() -> None:
+    """Forget the imported provider modules, as on a cold start."""
+    for name in list(sys.modules):
+        if name.startswith(PROVIDER_PACKAGES):
+            del sys.modules[name]
+
+
+async def _scan_providers(hass: FakeHass) -> None:
+    """Discover the providers like the loaders did before the manifest.
+
+    Every entry listed the provider directories and imported every provider, each
+    in an executor job.
+    """
+    for kind in providers.KINDS:
+        path = providers.PACKAGE_DIR / kind
+        for module in sorted(await hass.async_add_executor_job(os.listdir, path)):
+            if (path / module).is_dir() and not module.endswith("__pycache__"):
+                await hass.async_add_executor_job(
+                    import_module, f".{kind}.{module}", providers.PACKAGE
+                )
+
+
+def stage_providers_scan():
+    """Discover the providers of 10 entries by importing every provider module."""
+
+    def scan():
+        _purge_providers()
+        hass = FakeHass(executor=True)
+        for _ in range(10):
+            run(_scan_providers(hass))
+
+    return scan
+
+
+def stage_providers_manifest():
+    """Discover the providers of 10 entries from the manifest, importing lazily."""
+
+    def discover():
+        _purge_providers()
+        hass = FakeHass(executor=True)
+        registries = []
+        for _ in range(10):
+            connectors = Connectors(hass)
+            forecasts = Forecast(hass)
+            tariffs = Tariff(hass)
+            run(connectors.load_connectors())
+            run(forecasts.load_modules())
+            run(tariffs.load_modules())
+            registry = ProviderRegistry(hass, "SE3")
+            run(registry.async_setup(connectors, forecasts, tariffs))
+            registries.append(registry)
+
+        return registries
+
+    return discover
+
+
+def _price_datasets() -> list:
+    """Return todays and tomorrows 15 minute prices and the 7 day forecast."""
+    connector = fetched(spot_connector("dayaheadprices_15min.json", False))
+    return [connector.today, connector.tomorrow, forecast()]
+
+
+def stage_attributes_raw():
+    """Serialize the raw price attributes as hour/price dicts."""
+    stats = [PriceStatistics(data) for data in _price_datasets()]
+    return lambda: json_dumps([dataset.raw(3) for dataset in stats])
+
+
+def stage_attributes_compact():
+    """Serialize the raw price attributes as start/step/prices."""
+    compact = [
+        TimeSeries(data).compact([round(row.price, 3) for row in data])
+        for data in _price_datasets()
+    ]
+    return lambda: json_dumps(compact)
+
+
+def stage_show_with_vat():
+    """Add VAT to the tariff attribute."""
+    tariff_data = tariff_connector().tariffs
+    return lambda: show_with_vat(tariff_data, 0.25)
+
+
+STAGES = {
+    "dayahead.fetch": stage_fetch_spotprices,
+    "dayahead.prepare_data[hourly]": stage_prepare_hourly,
+    "dayahead.prepare_data[15min]": stage_prepare_15min,
+    "dayahead.prepare_data[hourly payload]": stage_prepare_hourly_payload,
+    "co2.fetch_and_prepare": stage_co2,
+    "carnot.fetch_and_prepare": stage_carnot,
+    "carnot.filter_predictions": stage_carnot_filter,
+    "tariffs.fetch_and_index": stage_tariffs,
+    "tariffs.get_dated_tariff[7d]": stage_dated_tariffs,
+    "calculate[default template]": stage_calculate_default,
+    "calculate[rendered template]": stage_calculate_rendered,
+    "calculate[forecast]": stage_calculate_forecast,
+    "statistics": stage_statistics,
+    "periods": stage_periods,
+    "show_with_vat": stage_show_with_vat,
+    "attributes.serialize[raw]": stage_attributes_raw,
+    "attributes.serialize[compact]": stage_attributes_compact,
+    "providers.scan[10 entries]": stage_providers_scan,
+    "providers.manifest[10 entries]": stage_providers_manifest,
+}
+
+
+def measure(stage: str, func, repeat: int) -> Result:
+    """Time func and trace the memory allocated by a single run."""
+    func()
+
+    times = []
+    for _ in range(repeat):
+        start = perf_counter()
+        func()
+        times.append(perf_counter() - start)
+
+    tracemalloc.start()
+    baseline = tracemalloc.get_traced_memory()[0]
+    result = func()
+    retained, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    del result
+
+    return Result(
+        stage,
+        repeat,
+        min(times) * 1000,
+        statistics.median(times) * 1000,
+        (peak - baseline) / 1024,
+        (retained - baseline) / 1024,
+    )
+
+
+def main() -> None:
+    """Run the benchmarks and print the results."""
+    parser = argparse.ArgumentParser(prog="python -m benchmarks")
+    parser.add_argument("stages", nargs="*", help="stages to run, default all")
+    parser.add_argument("--repeat", type=int, default=20, help="timed runs per stage")
+    parser.add_argument("--json", help="also write the results to this file")
+    args = parser.parse_args()
+
+    dt_util.set_default_time_zone(TZ)
+    unknown = set(args.stages) - STAGES.keys()
+    if unknown:
+        parser.error(f"unknown stages: {', '.join(sorted(unknown))}")
+
+    results = [
+        measure(stage, STAGES[stage](), args.repeat)
+        for stage in (args.stages or STAGES)
+    ]
+
+    width = max(len(result.stage) for result in results)
+    print(
+        f"{'stage':<{width}}  {'best ms':>9}  {'median ms':>9}"
+        f"  {'peak KiB':>9}  {'kept KiB':>9}"
+    )
+    for result in results:
+        print(
+            f"{result.stage:<{width}}  {result.best:9.3f}  {result.median:9.3f}"
+            f"  {result.peak:9.1f}  {result.retained:9.1f}"
+        )
+
+    if args.json:
+        with open(args.json, "w", encoding="utf-8") as file:
+            json.dump([result._asdict() for result in results], file, indent=2)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,179 @@
+"""Generate the benchmark fixture payloads.
+
+The payloads follow the shape of the API responses, using the columns the
+integration requests. All timestamps are relative to BASE_DATE and are moved to
+the current date when loaded by the benchmarks. Run from the repository root:
+
+    python -m benchmarks.fixtures.generate
+"""
+
+from __future__ import annotations
+
+import json
+import math
+import random
+from datetime import datetime, timedelta
+from pathlib import Path
+
+BASE_DATE = datetime(2025, 1, 15)
+FIXTURE_DIR = Path(__file__).parent
+
+RADIUS_GLN = "5790000705689"
+
+
+def _price(rnd: random.Random, when: datetime) -> float:
+    """Return a plausible spot price in EUR/MWh."""
+    daily = math.sin((when.hour + when.minute / 60 - 6) / 24 * 2 * math.pi)
+    return round(80 + 45 * daily + rnd.uniform(-15, 15), 2)
+
+
+def dayaheadprices(step: timedelta) -> dict:
+    """Return DayAheadPrices records from yesterday until the day after tomorrow."""
+    rnd = random.Random(1)
+    start = BASE_DATE - timedelta(days=1)
+    records = []
+    when = start
+    while when < BASE_DATE + timedelta(days=2):
+        records.append(
+            {"TimeUTC": when.isoformat(), "DayAheadPriceEUR": _price(rnd, when)}
+        )
+        when += step
+
+    return {"total": len(records), "records": records}
+
+
+def _pricelist_row(
+    rnd: random.Random, chargeowner: str, gln: str, code: str, note: str, valid: tuple
+) -> dict:
+    """Return a single DatahubPricelist row."""
+    row = {
+        "ChargeOwner": chargeowner,
+        "GLN_Number": gln,
+        "ChargeType": "D03",
+        "ChargeTypeCode": code,
+        "Note": note,
+        "Description": f"{note} - benchmark fixture",
+        "ValidFrom": valid[0].isoformat(),
+        "ValidTo": valid[1].isoformat() if valid[1] else None,
+        "VATClass": "D02",
+        "TransparentInvoicing": 0,
+        "TaxIndicator": 0,
+        "ResolutionDuration": "PT1H",
+    }
+    flat = rnd.random() < 0.3
+    base = round(rnd.uniform(0.05, 0.4), 6)
+    for hour in range(24):
+        peak = 17 <= hour < 21
+        row[f"Price{hour + 1}"] = (
+            None if flat and hour else round(base * (2.5 if peak else 1), 6)
+        )
+
+    return row
+
+
+def datahubpricelist() -> dict:
+    """Return 4 years of charge owner tariff rows."""
+    rnd = random.Random(2)
+    records = []
+    start = BASE_DATE - timedelta(days=4 * 365)
+    for idx in range(500):
+        valid_from = start + timedelta(days=idx * 3)
+        valid_to = valid_from + timedelta(days=rnd.choice((30, 90, 182)))
+        if idx == 499:
+            # Only the latest tariff is open ended, the older ones were replaced
+            valid_to = None
+        records.append(
+            _pricelist_row(
+                rnd,
+                "Radius Elnet A/S",
+                RADIUS_GLN,
+                "DT_C_01",
+                "Nettarif C time",
+                (valid_from, valid_to),
+            )
+        )
+
+    records.sort(key=lambda row: row["ValidFrom"], reverse=True)
+    return {"total": len(records), "records": records}
+
+
+def system_tariffs() -> dict:
+    """Return the government system tariffs for a few years."""
+    rnd = random.Random(3)
+    records = []
+    for note in ("Elafgift", "Systemtarif", "Transmissions nettarif"):
+        for quarter in range(16):
+            valid_from = BASE_DATE - timedelta(days=4 * 365 - quarter * 91)
+            valid_to = valid_from + timedelta(days=91) if quarter < 15 else None
+            row = _pricelist_row(
+                rnd,
+                "Energinet Systemansvar A/S",
+                "5790000432752",
+                "41000",
+                note,
+                (valid_from, valid_to),
+            )
+            for hour in range(2, 25):
+                row[f"Price{hour}"] = None
+            records.append(row)
+
+    return {"total": len(records), "records": records}
+
+
+def carnot() -> dict:
+    """Return a 7 day Carnot prediction in DKK/MWh."""
+    rnd = random.Random(4)
+    predictions = []
+    for hour in range(7 * 24):
+        when = BASE_DATE + timedelta(hours=hour)
+        predictions.append(
+            {
+                "utctime": when.isoformat(),
+                "dktime": (when + timedelta(hours=1)).isoformat(),
+                "pricearea": "dk1",
+                "energysource": "spotprice",
+                "prediction": round(_price(rnd, when) * 7.46, 2),
+            }
+        )
+
+    return {"predictions": predictions}
+
+
+def co2emisprog() -> dict:
+    """Return a day of 5 minute CO2 emission prognosis."""
+    rnd = random.Random(5)
+    records = []
+    for minute in range(0, 24 * 60, 5):
+        when = BASE_DATE + timedelta(minutes=minute)
+        records.append(
+            {
+                "Minutes5UTC": when.isoformat(),
+                "Minutes5DK": (when + timedelta(hours=1)).isoformat(),
+                "PriceArea": "DK1",
+                "CO2Emission": round(rnd.uniform(40, 220), 1),
+            }
+        )
+
+    return {"total": len(records), "records": records}
+
+
+FIXTURES = {
+    "dayaheadprices_15min.json": lambda: dayaheadprices(timedelta(minutes=15)),
+    "dayaheadprices_hourly.json": lambda: dayaheadprices(timedelta(hours=1)),
+    "datahubpricelist.json": datahubpricelist,
+    "system_tariffs.json": system_tariffs,
+    "carnot_7days.json": carnot,
+    "co2emisprog.json": co2emisprog,
+}
+
+
+def main() -> None:
+    """Write all fixtures."""
+    for name, generate in FIXTURES.items():
+        with open(FIXTURE_DIR / name, "w", encoding="utf-8") as file:
+            json.dump(generate(), file, indent=1)
+            file.write("\n")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,190 @@
+"""Stand-ins for Home Assistant and aiohttp, serving the recorded fixtures."""
+
+from __future__ import annotations
+
+import asyncio
+import json
+from datetime import date, datetime, timedelta
+from pathlib import Path
+from types import SimpleNamespace
+from urllib.parse import parse_qs, urlsplit
+
+from jinja2 import Environment
+
+from .fixtures.generate import BASE_DATE
+
+FIXTURE_DIR = Path(__file__).parent / "fixtures"
+
+# Fields holding timestamps that are moved to the current date
+TIME_FIELDS = (
+    "TimeUTC",
+    "Minutes5UTC",
+    "Minutes5DK",
+    "utctime",
+    "dktime",
+    "ValidFrom",
+    "ValidTo",
+)
+
+
+def _shift(value, days: int):
+    """Move all timestamps in a fixture payload by a number of days."""
+    if isinstance(value, list):
+        return [_shift(item, days) for item in value]
+
+    if isinstance(value, dict):
+        return {
+            key: (
+                (datetime.fromisoformat(item) + timedelta(days=days)).isoformat()
+                if key in TIME_FIELDS and item
+                else _shift(item, days)
+            )
+            for key, item in value.items()
+        }
+
+    return value
+
+
+def load_fixture(name: str) -> bytes:
+    """Return a fixture as a response body, with today as the base date."""
+    with open(FIXTURE_DIR / name, encoding="utf-8") as file:
+        payload = json.load(file)
+
+    days = (date.today() - BASE_DATE.date()).days
+    return json.dumps(_shift(payload, days)).encode()
+
+
+class FakeStream:
+    """Response body read in chunks, like aiohttp's StreamReader."""
+
+    def __init__(self, body: bytes) -> None:
+        """Initialize the stream."""
+        self._body = body
+        self._pos = 0
+
+    async def read(self, size: int = -1) -> bytes:
+        """Return the next chunk of at most size bytes."""
+        end = len(self._body) if size < 0 else self._pos + size
+        chunk = self._body[self._pos : end]
+        self._pos += len(chunk)
+        return chunk
+
+
+def select(body: bytes, url: str) -> bytes:
+    """Apply the end, sort, offset, limit and columns of a paged query to body.
+
+    Only paged (DatahubPricelist) queries are filtered, like the API does on its
+    side. Other fixtures are served whole.
+    """
+    params = {key: values[0] for key, values in parse_qs(urlsplit(url).query).items()}
+    if "offset" not in params:
+        return body
+
+    records = json.loads(body)["records"]
+    if "end" in params:
+        records = [row for row in records if row["ValidFrom"] < params["end"]]
+    if "sort" in params:
+        column, _, order = params["sort"].partition(" ")
+        records.sort(key=lambda row: row[column], reverse=order == "desc")
+
+    offset = int(params["offset"])
+    records = records[offset : offset + int(params.get("limit", len(records)))]
+    if "columns" in params:
+        columns = params["columns"].split(",")
+        records = [{column: row.get(column) for column in columns} for row in records]
+
+    return json.dumps({"total": len(records), "records": records}).encode()
+
+
+class FakeResponse:
+    """Recorded aiohttp response."""
+
+    def __init__(self, body: bytes, status: int = 200) -> None:
+        """Initialize the response."""
+        self.status = status
+        self._body = None
+        self.content = FakeStream(body)
+
+    async def read(self) -> bytes:
+        """Read the rest of content and keep it as the body, like aiohttp."""
+        if self._body is None:
+            self._body = await self.content.read()
+        return self._body
+
+    async def json(self):
+        """Decode the body, like aiohttp does for every call."""
+        return json.loads(await self.read())
+
+    def raise_for_status(self) -> None:
+        """Responses are always successful."""
+
+
+class FakeSession:
+    """aiohttp session answering requests from fixtures by URL substring."""
+
+    def __init__(self, routes: dict[str, str]) -> None:
+        """Load the fixtures for each route."""
+        self._routes = [(part, load_fixture(name)) for part, name in routes.items()]
+        self._selected: dict[str, bytes] = {}
+        self.requests = []
+
+    async def get(self, url: str, headers: dict | None = None) -> FakeResponse:
+        """Return the fixture of the first route found in url."""
+        self.requests.append(url)
+        for part, body in self._routes:
+            if part in url:
+                if url not in self._selected:
+                    self._selected[url] = select(body, url)
+                return FakeResponse(self._selected[url])
+
+        return FakeResponse(b"{}", 404)
+
+
+class FakeHass:
+    """The parts of Home Assistant used by the benchmarked code."""
+
+    def __init__(self, executor: bool = False) -> None:
+        """Initialize the instance.
+
+        Executor jobs run inline, as the benchmarks time the work itself, unless
+        executor is set to include the hop to the thread pool like Home Assistant.
+        """
+        self.data = {}
+        self.config = SimpleNamespace(time_zone="Europe/Copenhagen", currency="DKK")
+        self._executor = executor
+
+    async def async_add_executor_job(self, target, *args):
+        """Run the job."""
+        if self._executor:
+            return await asyncio.get_running_loop().run_in_executor(None, target, *args)
+
+        return target(*args)
+
+
+class FakeEntry:
+    """Config entry holding only options."""
+
+    def __init__(self, **options) -> None:
+        """Initialize the entry."""
+        self.entry_id = "benchmark"
+        self.data = dict(options)
+        self.options = dict(options)
+
+
+class JinjaTemplate:
+    """Cost template rendered by plain Jinja instead of the Home Assistant engine."""
+
+    _env = Environment()
+
+    def __init__(self, template: str) -> None:
+        """Compile the template."""
+        self.template = template
+        self._compiled = self._env.from_string(template)
+
+    def async_render(self, **kwargs):
+        """Render the template and return the result as a number, if possible."""
+        result = self._compiled.render(**kwargs)
+        try:
+            return float(result)
+        except ValueError:
+            return result
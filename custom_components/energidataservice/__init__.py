@@ -2,7 +2,8 @@
 
 from __future__ import annotations
 
-from datetime import datetime, timedelta
+import asyncio
+from datetime import timedelta
 from logging import getLogger
 from random import randint
 
@@ -11,18 +12,19 @@ from homeassistant.core import HomeAssistant
 from homeassistant.helpers.dispatcher import async_dispatcher_send
 from homeassistant.helpers.event import async_call_later, async_track_time_change
 from homeassistant.loader import async_get_integration
-from homeassistant.util import dt as dt_utils
 
 from .api import APIConnector
-from .const import CONF_ENABLE_FORECAST, DOMAIN, STARTUP, UPDATE_EDS, UPDATE_EDS_5MIN
-
-RETRY_MINUTES = 5
-MAX_RETRY_MINUTES = 60
+from .const import (
+    CONF_ENABLE_FORECAST,
+    DOMAIN,
+    STARTUP,
+    UPDATE_EDS,
+    UPDATE_EDS_5MIN,
+)
+from .services import async_setup_services
+from .utils.scheduler import async_get_price_scheduler
 
 CARNOT_UPDATE = timedelta(minutes=30)
-CO2_UPDATE = timedelta(hours=1)
-
-DEBUG = False
 
 _LOGGER = getLogger(__name__)
 
@@ -31,6 +33,7 @@ async def async_setup(hass: HomeAssistant, config: dict) -> bool:
     """Set up the component."""
 
     hass.data.setdefault(DOMAIN, {})
+    async_setup_services(hass)
 
     if DOMAIN not in config:
         return True
@@ -68,6 +71,7 @@ async def async_unload_entry(hass: HomeAssistant, entry: ConfigEntry) -> bool:
         for unsub in api.listeners:
             unsub()
         api.cancel_retry_updates()
+        api.release_tariffs()
         hass.data[DOMAIN].pop(entry.entry_id)
 
         return True
@@ -90,7 +94,7 @@ async def _setup(hass: HomeAssistant, entry: ConfigEntry) -> bool:
     api = APIConnector(hass, entry, rand_min, rand_sec, integration.version)
     await api.initialize()
 
-    connectors = api._connectors.get_connectors(api._region.region)
+    connectors = api.registry.price_endpoints
     for connector in connectors:
         if connector.co2regions == []:
             api.has_co2 = False
@@ -113,67 +117,44 @@ async def _setup(hass: HomeAssistant, entry: ConfigEntry) -> bool:
         api._tomorrow_valid = False  # pylint: disable=protected-access
         api.tomorrow_calculated = False
 
-        await api.updateco2()
+        # Without prices for today, poll now instead of at the publication
+        api.scheduler.schedule()
 
         async_dispatcher_send(hass, UPDATE_EDS.format(entry.entry_id))
         async_dispatcher_send(hass, UPDATE_EDS_5MIN.format(entry.entry_id))
 
+        # The price polls only fetch spot prices, tariffs are refreshed daily
+        api.refresh_tariffs()
+        await api.async_refresh_co2()
+
     async def new_price(n):  # type: ignore pylint: disable=unused-argument, invalid-name
         """Tell the sensor to update to a new quarter."""
         _LOGGER.debug("New quarter, updating state")
 
-        if not api.tomorrow_valid and dt_utils.now().hour > 13:
-            _LOGGER.info(
-                "Prices for tomorrow is missing - trying to fetch data from API"
-            )
-            await api.update()
-            await api.async_get_tariffs()
-
-        api.today = api.api_today
-        api.today_calculated = False
-        api.tomorrow = api.api_tomorrow
-        api.tomorrow_calculated = False
-        api.predictions = api.api_predictions
-        api.predictions_calculated = False
-
+        # Calculated prices are only redone by the sensor if their inputs changed
         async_dispatcher_send(hass, UPDATE_EDS.format(entry.entry_id))
 
     async def five_min(n):  # type: ignore pylint: disable=unused-argument, invalid-name
         """Tell the sensor to update when 5 minutes have passed."""
         async_dispatcher_send(hass, UPDATE_EDS_5MIN.format(entry.entry_id))
 
-    async def refresh_co2_data(n):
-        """Update CO2 data hourly."""
-        _LOGGER.debug("Getting latest CO2 dataset")
-        await api.updateco2()
-        if api.is_unloading:
-            return
-        api.co2_update_listener = async_call_later(hass, CO2_UPDATE, refresh_co2_data)
-
-        api.co2_refresh = (dt_utils.now() + CO2_UPDATE).strftime("%H:%M:%S")
-
-        _LOGGER.debug("Next CO2 data refresh '%s'", api.co2_refresh)
-
     async def get_new_data(n):  # type: ignore pylint: disable=unused-argument, invalid-name
-        """Fetch new data for tomorrows prices at 13:00ish CET."""
+        """Fetch every dataset, when nothing was restored from the cache."""
         _LOGGER.debug("Getting latest dataset")
-        await api.update()
-        await api.update_carnot()
-        await api.async_get_tariffs()
-
-        async_dispatcher_send(hass, UPDATE_EDS.format(entry.entry_id))
+        # Each source is sent to the sensors as it arrives, tariffs by the refresh
+        api.refresh_tariffs()
+        await asyncio.gather(api.async_refresh_prices(), api.async_refresh_forecast())
 
     async def update_carnot(n):  # type: ignore pylint: disable=unused-argument, invalid-name
         """Fetch new data from Carnot every 30 minutes."""
         _LOGGER.debug("Getting latest Carnot forecast")
-        await api.update_carnot()
+        await api.async_refresh_forecast()
         if api.is_unloading:
             return
 
         api.carnot_update_listener = async_call_later(
             hass, CARNOT_UPDATE, update_carnot
         )
-        async_dispatcher_send(hass, UPDATE_EDS.format(entry.entry_id))
 
     def stop_co2_updates() -> None:
         """Cancel pending CO2 update callback."""
@@ -188,14 +169,6 @@ async def _setup(hass: HomeAssistant, entry: ConfigEntry) -> bool:
             api.carnot_update_listener = None
 
     # Handle dataset updates
-    update_tomorrow = async_track_time_change(
-        hass,
-        get_new_data,
-        hour=13,  # LOCAL time!!
-        minute=rand_min,
-        second=rand_sec,
-    )
-
     update_new_day = async_track_time_change(
         hass,
         new_day,
@@ -207,19 +180,37 @@ async def _setup(hass: HomeAssistant, entry: ConfigEntry) -> bool:
     update_new_price = async_track_time_change(hass, new_price, minute="/15", second=1)
     update_5min = async_track_time_change(hass, five_min, minute="/5", second=1)
 
-    await get_new_data(0)
-    # async_call_later(hass, timedelta(seconds=1), refresh_co2_data)
-    await refresh_co2_data(0)
+    api.scheduler = async_get_price_scheduler(
+        hass, api._region.region, api.publication  # pylint: disable=protected-access
+    )
+
+    if await api.async_restore_cache():
+        _LOGGER.debug("Using cached datasets, refreshing stale data in the background")
+        entry.async_create_background_task(
+            hass, api.async_refresh_cached(), f"{DOMAIN}_refresh_{entry.entry_id}"
+        )
+    else:
+        # An unknown charge owner fails the setup before anything is fetched
+        api.refresh_tariffs()
+        # The sources are fetched concurrently, so this takes as long as the slowest
+        await asyncio.gather(get_new_data(0), api.async_poll_co2())
 
     if use_forecast:
         api.carnot_update_listener = async_call_later(
             hass, CARNOT_UPDATE, update_carnot
         )
 
+    # Polls for tomorrows prices, and retries until the prices are complete
+    update_prices = api.scheduler.subscribe(
+        entry.entry_id,
+        api.async_refresh_prices,
+        api.has_complete_prices,
+    )
+
     api.listeners.append(update_new_day)
     api.listeners.append(update_new_price)
     api.listeners.append(update_5min)
-    api.listeners.append(update_tomorrow)
+    api.listeners.append(update_prices)
     api.listeners.append(stop_co2_updates)
     api.listeners.append(stop_carnot_updates)
 
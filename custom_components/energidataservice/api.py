@@ -2,10 +2,10 @@
 
 from __future__ import annotations
 
-import datetime
-import json
+import asyncio
+from collections import namedtuple
+from datetime import UTC, datetime, time, timedelta
 from functools import partial
-from importlib import import_module
 from logging import getLogger
 
 import homeassistant.util.dt as dt_util
@@ -17,6 +17,7 @@ from homeassistant.core import HomeAssistant
 from homeassistant.exceptions import ConfigEntryNotReady
 from homeassistant.helpers import config_validation as cv
 from homeassistant.helpers.aiohttp_client import async_get_clientsession
+from homeassistant.helpers.dispatcher import async_dispatcher_send
 from homeassistant.helpers.event import async_call_later
 from pytz import timezone
 
@@ -25,17 +26,43 @@ from .const import (
     CONF_AREA,
     CONF_ENABLE_FORECAST,
     CONF_ENABLE_TARIFFS,
+    CONF_FIXED_PRICE_VALUE,
+    CONF_RESOLUTION,
     CONF_TARIFF_CHARGE_OWNER,
+    DOMAIN,
+    UPDATE_EDS,
+    UPDATE_EDS_CO2,
+    UPDATE_EDS_FORECAST,
+    UPDATE_EDS_TARIFFS,
 )
 from .exceptions import UnknownChargeOwnerError
 from .forecasts import Forecast
 from .tariffs import Tariff
+from .utils.datacache import async_get_data_cache
+from .utils.forecasthandler import ForecastHandler
+from .utils.metrics import Metrics, MetricsSession
+from .utils.periods import PriceSlots, slots_for
+from .utils.pricestore import async_get_price_store
+from .utils.rates import RATES
 from .utils.regionhandler import RegionHandler
+from .utils.registry import ProviderRegistry
+from .utils.tariffstore import async_get_tariff_store
 
 RETRY_MINUTES = 5
 MAX_RETRY_MINUTES = 60
 
-CARNOT_UPDATE = datetime.timedelta(minutes=30)
+CARNOT_UPDATE = timedelta(minutes=30)
+CO2_UPDATE = timedelta(hours=1)
+# Time to wait on a connector before also asking the next one of the region
+HEDGE_DELAY = 5
+CO2_MAX_AGE = timedelta(hours=1)
+
+# Time allowed for each source to update, in seconds
+PRICE_TIMEOUT = 120
+FORECAST_TIMEOUT = 60
+CO2_TIMEOUT = 60
+
+PriceResult = namedtuple("PriceResult", "endpoint module prices today tomorrow")
 
 EMPTY_SCHEME = vol.All(cv.make_entity_service_schema({}))
 
@@ -80,23 +107,39 @@ class APIConnector:
         self.tomorrow_calculated = False
         self.predictions = None
         self.api_predictions = None
+        self._carnot_predictions = None
         self.tariff_data = None
         self.tariff_connector = None
+        self.tariff_refresh = None
+        self.tariff_version = 0
+        self.cost_template = None
         self.predictions_calculated = False
         self.predictions_currency = None
         self.connector_currency = "EUR"
         self.forecast_currency = "EUR"
         self.listeners = []
         self.retry_unsubscribers = {}
+        self.scheduler = None
+        self.registry = None
+        self.hedge_delay = HEDGE_DELAY
+        self.winner = None
         self.co2_update_listener = None
         self.carnot_update_listener = None
         self.is_unloading = False
+        self.fetched = {}
+        self._price_slots = {}
 
         # Retry handling
         self.retry_count = {}
         self.next_retry_delay = RETRY_MINUTES
 
-        self._client = async_get_clientsession(hass)
+        self.metrics = Metrics()
+        self._client = MetricsSession(async_get_clientsession(hass), self.metrics)
+        self._price_store = async_get_price_store(hass)
+        self._tariff_store = async_get_tariff_store(hass)
+        self._tariff_key = None
+        self._tariff_shared = None
+        self._cache = async_get_data_cache(hass)
         self._region = RegionHandler(
             (entry.options.get(CONF_AREA) or entry.data.get(CONF_AREA)) or "FIXED"
         )
@@ -118,24 +161,127 @@ class APIConnector:
         self.tariffs = Tariff(hass=self.hass)
         await self.tariffs.load_modules()
 
+        self.registry = ProviderRegistry(self.hass, self._region.region)
+        await self.registry.async_setup(self._connectors, self.forecasts, self.tariffs)
+
+        await self._cache.async_load()
+        await RATES.async_load(self.hass)
+
+    async def async_restore_cache(self) -> bool:
+        """Populate datasets from the persistent cache.
+
+        Returns True if cached prices for today was found.
+        """
+        for endpoint in self.registry.price_endpoints:
+            cached_prices = self._cache.get(self._cache_key("prices", endpoint.module))
+            cached_co2 = self._cache.get(self._cache_key("co2", endpoint.module))
+            if cached_prices is None and cached_co2 is None:
+                continue
+
+            module = self.registry.module(endpoint)
+
+            if cached_prices is not None and not self.today:
+                api = self._price_connector(module)
+                api.result = cached_prices.data
+                api.status = 200
+                prices = self._price_store.seed(
+                    self._price_store_key(endpoint.module), api, cached_prices.fetched
+                )
+                today = prices.today(self._hourly)
+                if today:
+                    _LOGGER.debug(
+                        "%s restored cached values from %s fetched %s",
+                        self._region.region,
+                        endpoint.module,
+                        prices.fetched,
+                    )
+                    tomorrow = prices.tomorrow(self._hourly)
+                    self.today = today
+                    self.api_today = today
+                    self.tomorrow = tomorrow
+                    self.api_tomorrow = tomorrow
+                    self._tomorrow_valid = bool(tomorrow)
+                    self._source = module.SOURCE_NAME
+                    self.connector_currency = module.DEFAULT_CURRENCY
+                    self.fetched["prices"] = prices.fetched
+
+            if cached_co2 is not None and not self.co2:
+                api = self._co2_connector(endpoint)
+                api._co2_result = cached_co2.data  # pylint: disable=protected-access
+                if api.co2data:
+                    self.co2 = api.co2data
+                    self.fetched["co2"] = cached_co2.fetched
+
+        if self.tariff:
+            tariff_endpoint = self.registry.tariff_endpoints
+            cached_tariffs = self._cache.get(
+                self._tariff_cache_key(tariff_endpoint[0].module)
+            )
+            try:
+                tariff = (
+                    self._tariff_connector(tariff_endpoint[0])
+                    if cached_tariffs is not None
+                    else None
+                )
+            except UnknownChargeOwnerError:
+                # Reported when fetching the tariffs
+                tariff = None
+
+            if tariff is not None:
+                with self.metrics.timer("tariff_restore"):
+                    # Another entry may already hold newer tariffs of the charge owner
+                    self._tariff_store.seed(
+                        self._tariff_key,
+                        cached_tariffs.fetched,
+                        lambda: tariff.restore(
+                            cached_tariffs.data["tariffs"],
+                            cached_tariffs.data["additional_tariffs"],
+                        ),
+                    )
+                self.tariff_data = tariff.tariffs
+                self.tariff_connector = tariff
+                self.tariff_version += 1
+                self.fetched["tariffs"] = cached_tariffs.fetched
+
+        return bool(self.today)
+
+    def is_stale(self, dataset: str) -> bool:
+        """Check if a dataset should be refreshed from the API."""
+        fetched = self.fetched.get(dataset)
+        if fetched is None:
+            return True
+
+        now = dt_util.now(self._tz)
+        if dataset == "co2":
+            return now - fetched >= CO2_MAX_AGE
+
+        if dt_util.as_local(fetched).date() != now.date():
+            return True
+
+        if dataset == "prices":
+            return (
+                not self._tomorrow_valid
+                and now.strftime("%H:%M:%S") >= self.next_data_refresh
+            )
+
+        return False
+
     async def updateco2(self, dt=None, request_module=None) -> None:  # type: ignore pylint: disable=unused-argument
         """Fetch CO2 emissions from API."""
         _LOGGER.debug("Updating CO2 emissions for '%s'", self._region.region)
-        connectors = self._connectors.get_connectors(self._region.region)
+        connectors = self.registry.price_endpoints
         _LOGGER.debug(
             "Valid connectors for '%s' is: %s", self._region.region, connectors
         )
-        self.co2 = None
+        # The current dataset is kept until the update completes
+        co2 = None
 
         try:
             for endpoint in connectors:
-                module = await self.hass.async_add_executor_job(
-                    import_module, endpoint.namespace, __name__.removesuffix(".api")
-                )
-                api = module.Connector(
-                    self._region, self._client, self._tz, self._config, self._version
-                )
-                self.connector_currency = module.DEFAULT_CURRENCY
+                api = self._co2_connector(endpoint)
+                self.connector_currency = self.registry.module(
+                    endpoint
+                ).DEFAULT_CURRENCY
                 # await api.async_get_spotprices()
 
                 try:
@@ -147,7 +293,10 @@ class APIConnector:
                     else:
                         self.clear_retry(endpoint.module + "_co2")
 
-                    if api.co2data:
+                    with self.metrics.timer("prepare_co2_data"):
+                        co2data = api.co2data
+
+                    if co2data:
                         _LOGGER.debug(
                             "%s got CO2 values from %s (namespace='%s')",
                             self._region.region,
@@ -155,226 +304,362 @@ class APIConnector:
                             endpoint.namespace,
                         )
                         # _LOGGER.debug(api.co2data)
-                        self.co2 = api.co2data
+                        co2 = co2data
+
+                        now = dt_util.now(self._tz)
+                        self.fetched["co2"] = now
+                        self._cache.set(
+                            self._cache_key("co2", endpoint.module),
+                            api._co2_result,  # pylint: disable=protected-access
+                            now,
+                        )
                 except AttributeError:
                     _LOGGER.debug(
                         "CO2 values not available from %s (namespace='%s')",
                         endpoint.module,
                         endpoint.namespace,
                     )
-        except:
+        except Exception:  # pylint: disable=broad-except
             _LOGGER.debug("No CO2 data for this region")
 
+        self.co2 = co2
+
     async def update(self, dt=None, request_module=None) -> None:  # type: ignore pylint: disable=unused-argument,invalid-name
         """Fetch latest prices from API."""
         _LOGGER.debug("Updating data for '%s'", self._region.region)
-        connectors = self._connectors.get_connectors(self._region.region)
+        connectors = [
+            endpoint
+            for endpoint in self.registry.price_endpoints
+            if isinstance(request_module, type(None))
+            or request_module == endpoint.module
+        ]
         _LOGGER.debug(
             "Valid connectors for '%s' is: %s", self._region.region, connectors
         )
-        self.today = None
-        self.tomorrow = None
+
+        # The current prices are kept until new ones are received
+        result = await self._async_race_prices(connectors)
+        if result is None:
+            _LOGGER.debug(
+                "No prices received for %s, keeping the current prices",
+                self._region.region,
+            )
+            return
+
         self.today_calculated = False
         self.tomorrow_calculated = False
+        self.connector_currency = result.module.DEFAULT_CURRENCY
+        self.fetched["prices"] = result.prices.fetched
+        self.today = result.today
+        self.api_today = result.today
+        self.tomorrow = result.tomorrow or None
+        if result.tomorrow:
+            self.api_tomorrow = result.tomorrow
 
+        _LOGGER.debug(
+            "%s got values from %s (namespace='%s')",
+            self._region.region,
+            result.endpoint.module,
+            result.endpoint.namespace,
+        )
+        self._source = result.module.SOURCE_NAME
+        self.winner = result.endpoint.module
+        self.metrics.count(f"prices_from_{result.endpoint.module}")
+
+        if (not self.tomorrow or not self.api_tomorrow) or (
+            self.tomorrow is None or self.api_tomorrow is None
+        ):
+            # The price scheduler polls again until tomorrow is complete
+            _LOGGER.debug("No data found for tomorrow")
+            self._tomorrow_valid = False
+            self.tomorrow = None
+            self.api_tomorrow = None
+        else:
+            self._tomorrow_valid = True
+
+        # The forecast may have been fetched before tomorrows prices were known
+        self._filter_predictions()
+
+    async def _async_fetch_prices(self, endpoint) -> PriceResult | None:
+        """Fetch the spot prices of endpoint, None if nothing was received."""
+        module = self.registry.module(endpoint)
+        api = self._price_connector(module)
         try:
-            for endpoint in connectors:
-                module = await self.hass.async_add_executor_job(
-                    import_module, endpoint.namespace, __name__.removesuffix(".api")
-                )
-                api = module.Connector(
-                    self._region, self._client, self._tz, self._config, self._version
-                )
-                self.connector_currency = module.DEFAULT_CURRENCY
-                if (
-                    isinstance(request_module, type(None))
-                    or request_module == endpoint.module
-                ):
-                    await api.async_get_spotprices()
+            prices = await self._price_store.async_get_spotprices(
+                self._price_store_key(endpoint.module), api
+            )
+        except (ServerDisconnectedError, ClientConnectorError) as err:
+            _LOGGER.warning("Couldn't get data from %s: %s", endpoint.module, err)
+            return None
 
-                    if api.status != 200:
-                        self.retry_update(endpoint.module)
-                        continue
-                    else:
-                        self.clear_retry(endpoint.module)
+        if prices.status != 200:
+            return None
 
-                    if len(api.result) == 0:
-                        _LOGGER.debug("No data received from %s", endpoint.module)
-                        continue
+        if len(prices.result) == 0:
+            _LOGGER.debug("No data received from %s", endpoint.module)
+            return None
 
-                    if api.today and not self.today:
-                        self.today = api.today
-                        self.api_today = api.today
-                        _LOGGER.debug(
-                            "%s got values from %s (namespace='%s')",
-                            self._region.region,
-                            endpoint.module,
-                            endpoint.namespace,
-                        )
-                        self._source = module.SOURCE_NAME
+        self._cache.set(
+            self._cache_key("prices", endpoint.module),
+            prices.result,
+            prices.fetched,
+        )
 
-                    if api.tomorrow and not self.tomorrow:
-                        self.today = api.today
-                        self.api_today = api.today
-                        self.tomorrow = api.tomorrow
-                        self.api_tomorrow = api.tomorrow
+        # Parsed once per day, region and resolution, so usually a lookup
+        with self.metrics.timer("prepare_data"):
+            today = prices.today(self._hourly)
+            tomorrow = prices.tomorrow(self._hourly)
 
-                        _LOGGER.debug(
-                            "%s got values from %s (namespace='%s')",
-                            self._region.region,
-                            endpoint.module,
-                            endpoint.namespace,
-                        )
+        if not today:
+            return None
 
-                        self._source = module.SOURCE_NAME
-                    break
+        return PriceResult(endpoint, module, prices, today, tomorrow)
 
-            if (
-                isinstance(request_module, type(None))
-                or request_module == endpoint.module
-            ):
-                if (not self.tomorrow or not self.api_tomorrow) or (
-                    self.tomorrow is None or self.api_tomorrow is None
-                ):
-                    _LOGGER.debug("No data found for tomorrow")
-                    self._tomorrow_valid = False
-                    self.tomorrow = None
-                    self.api_tomorrow = None
-
-                    midnight = datetime.datetime.strptime("23:59:59", "%H:%M:%S")
-                    refresh = datetime.datetime.strptime(
-                        self.next_data_refresh, "%H:%M:%S"
-                    )
-                    now_local = dt_util.now(self._tz)
+    async def _async_race_prices(self, connectors: list) -> PriceResult | None:
+        """Fetch the spot prices, racing the connectors of the region.
 
-                    _LOGGER.debug(
-                        "Now: %s:%s:%s (local time)",
-                        f"{now_local.hour:02d}",
-                        f"{now_local.minute:02d}",
-                        f"{now_local.second:02d}",
-                    )
-                    _LOGGER.debug(
-                        "Refresh: %s:%s:%s (local time)",
-                        f"{refresh.hour:02d}",
-                        f"{refresh.minute:02d}",
-                        f"{refresh.second:02d}",
+        The connectors are started in order of priority, each after the
+        previous one failed or has been running for HEDGE_DELAY. The first
+        complete result wins and the remaining requests are cancelled, where
+        tomorrow is only needed once it is due to be published. Without a
+        complete result, the result of the connector with the highest priority
+        is used.
+        """
+        before_publication = dt_util.now().strftime("%H:%M:%S") < self.next_data_refresh
+        waiting = list(connectors)
+        running: dict[asyncio.Task, int] = {}
+        results: dict[int, PriceResult] = {}
+        winner = None
+
+        try:
+            while winner is None and (waiting or running):
+                if waiting and (not running or self.hedge_delay is not None):
+                    endpoint = waiting.pop(0)
+                    task = self.hass.async_create_task(
+                        self._async_fetch_prices(endpoint)
                     )
-                    if (
-                        f"{midnight.hour}:{midnight.minute}:{midnight.second}"
-                        > f"{now_local.hour:02d}:{now_local.minute:02d}:{now_local.second:02d}"
-                        and f"{refresh.hour:02d}:{refresh.minute:02d}:{refresh.second:02d}"
-                        <= f"{now_local.hour:02d}:{now_local.minute:02d}:{now_local.second:02d}"
-                    ):
-                        self.retry_update(endpoint.module)
-                    else:
-                        _LOGGER.debug(
-                            "Not forcing refresh, as we are past midnight and haven't reached next update time"  # pylint: disable=line-too-long
+                    running[task] = connectors.index(endpoint)
+
+                done, _ = await asyncio.wait(
+                    running,
+                    timeout=self.hedge_delay if waiting else None,
+                    return_when=asyncio.FIRST_COMPLETED,
+                )
+                for task in done:
+                    priority = running.pop(task)
+                    try:
+                        result = task.result()
+                    except Exception:  # pylint: disable=broad-except
+                        _LOGGER.exception(
+                            "Unexpected error getting prices from %s",
+                            connectors[priority].module,
                         )
-                else:
-                    # _LOGGER.debug(
-                    #     "Tomorrow:\n%s",
-                    #     json.dumps(self.tomorrow, indent=2, default=str),
-                    # )
-                    self._tomorrow_valid = True
+                        continue
+
+                    if result is None:
+                        continue
+
+                    results[priority] = result
+                    complete = result.tomorrow or before_publication
+                    if complete and (winner is None or priority < winner[0]):
+                        winner = (priority, result)
+        finally:
+            for task in running:
+                task.cancel()
+
+        if winner is not None:
+            if running:
+                _LOGGER.debug(
+                    "%s got prices from %s first, cancelled %s other request(s)",
+                    self._region.region,
+                    winner[1].endpoint.module,
+                    len(running),
+                )
+            return winner[1]
 
-        except ServerDisconnectedError:
-            _LOGGER.warning("Err.")
-            self.retry_update(endpoint.module)
+        return results[min(results)] if results else None
 
     async def update_carnot(self, dt=None, request_module=None) -> None:  # type: ignore pylint: disable=unused-argument,invalid-name
         """Update Carnot data if enabled."""
         if self.forecast:
-            self.predictions_calculated = False
-            forecast_endpoint = await self.forecasts.get_endpoint(self._region.region)
-            forecast_module = await self.hass.async_add_executor_job(
-                import_module,
-                forecast_endpoint[0].namespace,
-                __name__.removesuffix(".api"),
-            )
-            carnot = forecast_module.Connector(
-                self._region, self._client, self._tz, self._version
+            forecast_endpoint = self.registry.forecast_endpoints[0]
+            carnot = self.registry.connector(
+                "forecast",
+                forecast_endpoint,
+                lambda module: module.Connector(
+                    self._region, self._client, self._tz, self._version
+                ),
             )
-            self.predictions_currency = forecast_module.DEFAULT_CURRENCY
+            self.predictions_currency = self.registry.module(
+                forecast_endpoint
+            ).DEFAULT_CURRENCY
             try:
-                self.predictions = await carnot.async_get_forecast(
-                    self._carnot_apikey, self._carnot_user
-                )
+                with self.metrics.timer("forecast_update"):
+                    predictions = await carnot.async_get_forecast(
+                        self._carnot_apikey, self._carnot_user
+                    )
             except ClientConnectorError:
                 _LOGGER.warning("Error fetching data from Carnot")
+                # Keep the last forecast, not the calculated predictions
+                predictions = self._carnot_predictions
 
-            if not isinstance(self.predictions, type(None)):
-                self.predictions[:] = (
-                    value
-                    for value in self.predictions
-                    if value.time.day
-                    >= (datetime.datetime.now() + datetime.timedelta(days=1)).day
-                    or value.time.month
-                    > (datetime.datetime.now() + datetime.timedelta(days=1)).month
-                    or value.time.year > datetime.datetime.now().year
-                )
+            self._carnot_predictions = predictions
+            self._filter_predictions()
 
-                if self._tomorrow_valid:
-                    # Remove tomorrows predictions, as we have the actual values
-                    self.predictions[:] = (
-                        value
-                        for value in self.predictions
-                        if value.time.day
-                        != (datetime.datetime.now() + datetime.timedelta(days=1)).day
-                    )
+    def _filter_predictions(self) -> None:
+        """Set the predictions to the Carnot forecast not covered by known prices.
+
+        The predictions are a new list, so the calculated predictions of the
+        sensor are never filtered and calculated again.
+        """
+        if self._carnot_predictions is None:
+            self.predictions = None
+            return
+
+        self.predictions_calculated = False
+        self.predictions = ForecastHandler.filter_predictions(
+            self._carnot_predictions, self._tomorrow_valid
+        )
+        self.api_predictions = self.predictions
+
+    async def async_refresh(
+        self, source: str, update, timeout: int, signal: str
+    ) -> None:
+        """Update a source, telling the sensors unless it timed out."""
+        try:
+            async with asyncio.timeout(timeout):
+                await update()
+        except TimeoutError:
+            _LOGGER.warning("Updating %s timed out after %s seconds", source, timeout)
+            self.metrics.count(f"timeout_{source}")
+            return
+
+        if not self.is_unloading:
+            async_dispatcher_send(self.hass, signal.format(self._entry_id))
+
+    async def async_refresh_prices(self) -> None:
+        """Update the spot prices and tell the sensors."""
+        await self.async_refresh("prices", self.update, PRICE_TIMEOUT, UPDATE_EDS)
+
+    async def async_refresh_forecast(self) -> None:
+        """Update the Carnot forecast and tell the sensors."""
+        await self.async_refresh(
+            "forecast", self.update_carnot, FORECAST_TIMEOUT, UPDATE_EDS_FORECAST
+        )
+
+    async def async_refresh_co2(self) -> None:
+        """Update the CO2 emissions and tell the sensors."""
+        await self.async_refresh("co2", self.updateco2, CO2_TIMEOUT, UPDATE_EDS_CO2)
+
+    async def async_poll_co2(self, dt=None) -> None:  # type: ignore pylint: disable=unused-argument,invalid-name
+        """Update the CO2 emissions, and again every CO2_UPDATE."""
+        _LOGGER.debug("Getting latest CO2 dataset")
+        await self.async_refresh_co2()
+        if self.is_unloading:
+            return
+
+        self._schedule_co2(dt_util.now() + CO2_UPDATE)
+
+    async def async_refresh_cached(self) -> None:
+        """Refresh datasets restored from the cache, if they are stale."""
+        if self.tariff and self.is_stale("tariffs"):
+            self.refresh_tariffs()
+
+        updates = [self._async_refresh_cached_prices()]
+        if self.is_stale("co2"):
+            updates.append(self.async_poll_co2())
+        elif not self.is_unloading:
+            self._schedule_co2(self.fetched["co2"] + CO2_UPDATE)
+
+        if self.forecast:
+            updates.append(self.async_refresh_forecast())
+
+        await asyncio.gather(*updates)
+
+    async def _async_refresh_cached_prices(self) -> None:
+        """Refresh the prices restored from the cache if stale, then poll."""
+        if self.is_stale("prices"):
+            await self.async_refresh_prices()
+
+        self.scheduler.schedule()
+
+    def _schedule_co2(self, when: datetime) -> None:
+        """Schedule the next CO2 update at when."""
+        self.co2_update_listener = async_call_later(
+            self.hass, when - dt_util.now(), self.async_poll_co2
+        )
+        self.co2_refresh = dt_util.as_local(when).strftime("%H:%M:%S")
+        _LOGGER.debug("Next CO2 data refresh '%s'", self.co2_refresh)
+
+    def refresh_tariffs(self) -> None:
+        """Refresh the tariffs in the background, unless already refreshing.
+
+        Spot prices are published without waiting for the tariffs, which are
+        sent to the sensors once they arrive.
+        """
+        if not self.tariff or self.is_unloading:
+            return
+
+        if self.tariff_refresh is not None and not self.tariff_refresh.done():
+            return
+
+        # An invalid charge owner fails the setup instead of the background task
+        self._valid_tariff_connector()
+        self.tariff_refresh = self._config.async_create_background_task(
+            self.hass,
+            self._async_refresh_tariffs(),
+            f"{DOMAIN}_tariffs_{self._entry_id}",
+        )
 
-                self.api_predictions = self.predictions
+    async def _async_refresh_tariffs(self) -> None:
+        """Get the tariffs and tell the sensors."""
+        await self.async_get_tariffs()
+        if not self.is_unloading:
+            async_dispatcher_send(self.hass, UPDATE_EDS_TARIFFS.format(self._entry_id))
 
     async def async_get_tariffs(self, dt=None, request_module=None) -> None:  # type: ignore pylint: disable=unused-argument,invalid-name
-        """Get tariff data."""
+        """Get tariff data, waiting for any retries of the tariff store."""
 
         if self.tariff:
-            tariff_endpoint = await self.tariffs.get_endpoint(self._region.region)
-            tariff_module = await self.hass.async_add_executor_job(
-                import_module,
-                tariff_endpoint[0].namespace,
-                __name__.removesuffix(".api"),
-            )
+            tariff = self._valid_tariff_connector()
+            self.tariff_connector = tariff
 
-            tariff = tariff_module.Connector(
-                self.hass,
-                self._client,
-                self._config.options.get(CONF_TARIFF_CHARGE_OWNER),
-            )
+            with self.metrics.timer("tariff_update"):
+                self.tariff_data = await self._tariff_store.async_refresh(
+                    self._tariff_key
+                )
+            if self.tariff_data is None:
+                self.tariff_data = {
+                    "additional_tariffs": {},
+                    "tariffs": {},
+                    "status": 503,
+                }
+            self.tariff_version += 1
 
-            self.tariff_connector = tariff
+            if (
+                self.tariff_data["status"] == 200
+                and self.tariff_data["tariffs"]
+                and self.tariff_data["additional_tariffs"]
+            ):
+                now = dt_util.now(self._tz)
+                self.fetched["tariffs"] = now
+                self._cache.set(
+                    self._tariff_cache_key(self.registry.tariff_endpoints[0].module),
+                    tariff.raw,
+                    now,
+                )
 
-            try:
-                self.tariff_data = await tariff.async_get_tariffs()
-                if self.tariff_data is None:
-                    self.tariff_data = {
-                        "additional_tariffs": {},
-                        "tariffs": {},
-                        "status": 503,
-                    }
-
-                if (
-                    self.tariff_data["status"] != 200
-                    or not self.tariff_data["tariffs"]
-                    or not self.tariff_data["additional_tariffs"]
-                ):
-                    if self.tariff_data["status"] in [400, 411]:
-                        _LOGGER.warning(
-                            "Tariff endpoint returned %s, skipping retry for now",
-                            self.tariff_data["status"],
-                        )
-                        self.clear_retry(tariff_endpoint[0].module + "_tariff")
-                    else:
-                        self.retry_update(
-                            tariff_endpoint[0].module + "_tariff",
-                            self.async_get_tariffs,
-                        )
-                else:
-                    self.clear_retry(tariff_endpoint[0].module + "_tariff")
-            except UnknownChargeOwnerError:
-                raise ConfigEntryNotReady(
-                    "Selected chargeowner, %s, is invalid - please reconfigure."
-                    % self._config.options.get(CONF_TARIFF_CHARGE_OWNER)
-                ) from None
+    @property
+    def tariff_refresh_state(self) -> dict | None:
+        """Return the state of the tariff refresh, None without tariffs."""
+        if self._tariff_key is None:
+            return None
+
+        return {
+            "running": self.tariff_refresh is not None
+            and not self.tariff_refresh.done(),
+            **self._tariff_store.refresh_state(self._tariff_key),
+        }
 
     @property
     def tomorrow_valid(self) -> bool:
@@ -389,13 +674,112 @@ class APIConnector:
     @property
     def next_data_refresh(self) -> str:
         """When is next data update?."""
+        if self.scheduler is not None:
+            return self.scheduler.publication.strftime("%H:%M:%S")
+
         return f"13:{self._rand_min:02d}:{self._rand_sec:02d}"
 
+    @property
+    def publication(self) -> time:
+        """Return the local time tomorrows prices are expected at."""
+        return time(13, self._rand_min, self._rand_sec)
+
+    def has_complete_prices(self, now: datetime) -> bool:
+        """Check if the prices expected to be published at now are known."""
+        if not self.today:
+            return False
+
+        return self._tomorrow_valid or (
+            dt_util.as_local(now).strftime("%H:%M:%S") < self.next_data_refresh
+        )
+
     @property
     def entry_id(self) -> str:
         """Return entry_id."""
         return self._entry_id
 
+    def get_price_slots(self, include_forecast: bool = True) -> PriceSlots:
+        """Return the known prices as slots, rebuilt only when a dataset changed."""
+        datasets = [self.today, self.tomorrow if self._tomorrow_valid else None]
+        if include_forecast and self.forecast:
+            datasets.append(self.predictions)
+
+        slots = slots_for(self._price_slots.get(include_forecast), datasets)
+        self._price_slots[include_forecast] = slots
+        return slots
+
+    def _price_connector(self, module):
+        """Return a new spot price connector, the price store keeps its state."""
+        return module.Connector(
+            self._region, self._client, self._tz, self._config, self._version
+        )
+
+    def _co2_connector(self, endpoint):
+        """Return the long lived CO2 connector of endpoint."""
+        return self.registry.connector("co2", endpoint, self._price_connector)
+
+    def _tariff_connector(self, endpoint):
+        """Return the tariff connector of endpoint.
+
+        The connector is shared by all entries with the same charge owner, and
+        is released again by release_tariffs.
+        """
+        if self._tariff_key is None:
+            module = self.registry.module(endpoint)
+            chargeowner = self._config.options.get(CONF_TARIFF_CHARGE_OWNER)
+            key = (endpoint.module,) + module.tariff_key(chargeowner)
+            self._tariff_shared = self._tariff_store.acquire(
+                key, lambda: module.Connector(self.hass, self._client, chargeowner)
+            )
+            self._tariff_key = key
+
+        return self._tariff_shared
+
+    def _valid_tariff_connector(self):
+        """Return the tariff connector, failing the setup for an unknown owner."""
+        try:
+            return self._tariff_connector(self.registry.tariff_endpoints[0])
+        except UnknownChargeOwnerError:
+            raise ConfigEntryNotReady(
+                f"Selected chargeowner, {self._config.options.get(CONF_TARIFF_CHARGE_OWNER)}, "
+                "is invalid - please reconfigure."
+            ) from None
+
+    def release_tariffs(self) -> None:
+        """Stop refreshing and release the tariffs shared with other entries."""
+        if self.tariff_refresh is not None:
+            self.tariff_refresh.cancel()
+            self.tariff_refresh = None
+
+        if self._tariff_key is not None:
+            self._tariff_store.release(self._tariff_key)
+            self._tariff_key = None
+            self._tariff_shared = None
+
+    def _cache_key(self, dataset: str, module: str) -> str:
+        """Return the key identifying a dataset in the persistent cache."""
+        return f"{dataset}_{module}_{self._region.region}"
+
+    def _tariff_cache_key(self, module: str) -> str:
+        """Return the key identifying the tariffs in the persistent cache."""
+        return f"tariffs_{module}_{self._config.options.get(CONF_TARIFF_CHARGE_OWNER)}"
+
+    @property
+    def _hourly(self) -> bool:
+        """Return True if this entry uses hourly averaged prices."""
+        return self._config.options.get(CONF_RESOLUTION, True)
+
+    def _price_store_key(self, module: str) -> tuple:
+        """Return the key identifying this entry's spot prices in the price store.
+
+        Entries of both resolutions share the same fetch.
+        """
+        return (
+            module,
+            self._region.region,
+            self._config.options.get(CONF_FIXED_PRICE_VALUE),
+        )
+
     def retry_update(self, module: str, update_function=None) -> None:
         """Retry update on error."""
         if self.is_unloading:
@@ -423,6 +807,7 @@ class APIConnector:
             }
         }
         self.retry_count.update(retry_info)
+        self.metrics.count(f"retry_{module}")
         self.next_retry_delay = self.retry_count[module]["next_delay"]
         if update_function is None:
             update_function = self.update
@@ -433,9 +818,7 @@ class APIConnector:
             self.next_retry_delay,
         )
 
-        now = datetime.datetime.now(datetime.timezone.utc) + datetime.timedelta(
-            minutes=self.next_retry_delay
-        )
+        now = datetime.now(UTC) + timedelta(minutes=self.next_retry_delay)
         _LOGGER.debug(
             "Next retry: %s:%s:%s (UTC)",
             f"{now.hour:02d}",
@@ -444,7 +827,7 @@ class APIConnector:
         )
         self.retry_unsubscribers[module] = async_call_later(
             self.hass,
-            datetime.timedelta(minutes=self.next_retry_delay),
+            timedelta(minutes=self.next_retry_delay),
             partial(update_function, request_module=module),
         )
 
@@ -1,16 +1,12 @@
-"""Dynamically load all available connectors."""
+"""Load all available connectors."""
 
 from __future__ import annotations
 
-import importlib
-from asyncio import get_running_loop
 from collections import namedtuple
-from genericpath import isdir
 from logging import getLogger
-from os import listdir
-from posixpath import dirname
 
 from ..const import CURRENCY_LIST, REGIONS
+from ..utils.providers import async_get_provider_manifest
 
 _LOGGER = getLogger(__name__)
 
@@ -25,32 +21,26 @@ class Connectors:
         self._connectors = []
 
     async def load_connectors(self) -> None:
-        """Load available connectors."""
-        loop = get_running_loop()
-        modules = await loop.run_in_executor(None, listdir, f"{dirname(__file__)}")
-        for module in sorted(modules):
-            mod_path = f"{dirname(__file__)}/{module}"
-            if isdir(mod_path) and not module.endswith("__pycache__"):
-                Connector = namedtuple(
-                    "Connector", "module namespace regions co2regions"
-                )
-                _LOGGER.debug("Adding module %s in path %s", module, mod_path)
-                api_ns = f".{module}"
-
-                mod = await self.hass.async_add_executor_job(
-                    importlib.import_module, api_ns, __name__
-                )
-                con = Connector(
-                    module, f".connectors{api_ns}", mod.REGIONS, mod.CO2REGIONS
-                )
-
-                if hasattr(mod, "EXTRA_REGIONS"):
-                    REGIONS.update(mod.EXTRA_REGIONS)
-
-                if hasattr(mod, "EXTRA_CURRENCIES"):
-                    CURRENCY_LIST.update(mod.EXTRA_CURRENCIES)
-
-                self._connectors.append(con)
+        """Load available connectors from the provider manifest."""
+        manifest = await async_get_provider_manifest(self.hass)
+        self._connectors = []
+        for module, provider in manifest["connectors"].items():
+            Connector = namedtuple("Connector", "module namespace regions co2regions")
+            _LOGGER.debug("Adding module %s", module)
+            con = Connector(
+                module,
+                f".connectors.{module}",
+                provider["regions"],
+                provider.get("co2regions", []),
+            )
+
+            if "extra_regions" in provider:
+                REGIONS.update(provider["extra_regions"])
+
+            if "extra_currencies" in provider:
+                CURRENCY_LIST.update(provider["extra_currencies"])
+
+            self._connectors.append(con)
 
     @property
     def connectors(self) -> list:
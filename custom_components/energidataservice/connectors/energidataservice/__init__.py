@@ -4,13 +4,15 @@ from __future__ import annotations
 
 import json
 import os
-from datetime import datetime, timedelta
+from datetime import date, datetime, timedelta
 from logging import getLogger
 
 import homeassistant.util.dt as dt_util
 from async_retrying_ng import RetryError, retry
 
 from ...const import CO2INTERVAL, CONF_RESOLUTION, INTERVAL
+from ...utils.jsonstream import async_iter_records
+from ...utils.series import RecordSeries, parsed
 from .regions import CO2REGIONS, REGIONS
 
 _LOGGER = getLogger(__name__)
@@ -23,57 +25,19 @@ DEFAULT_CURRENCY = "EUR"
 
 __all__ = ["REGIONS", "Connector", "DEFAULT_CURRENCY", "CO2REGIONS"]
 
+# Positions in the (Minutes5UTC, CO2Emission) rows kept of the CO2EmisProg records
+CO2_TIME = 0
+CO2_EMISSION = 1
 
-def prepare_data(
-    indata, date, tz, resolution: bool = False
-) -> list:  # pylint: disable=invalid-name
-    """Get prices in 15 minutes resolution."""
-    local_tz = dt_util.get_default_time_zone()
-    reslist = []
-
-    if resolution == True:
-        for i in range(0, len(indata), 4):
-            group = indata[i : i + 4]
-            if len(group) < 4:
-                continue  # Skip incomplete groups although it shouldn't happen
-            tmpdate = (
-                datetime.fromisoformat(group[0]["TimeUTC"])
-                .replace(tzinfo=dt_util.UTC)
-                .astimezone(local_tz)
-            )
-            if date in tmpdate.strftime("%Y-%m-%d"):
-                avg_price = sum(float(item["DayAheadPriceEUR"]) for item in group) / 4
-                tmp = INTERVAL(avg_price, tmpdate)
-                reslist.append(tmp)
-    else:
-        for dataset in indata:
-            tmpdate = (
-                datetime.fromisoformat(dataset["TimeUTC"])
-                .replace(tzinfo=dt_util.UTC)
-                .astimezone(local_tz)
-            )
-            tmp = INTERVAL(dataset["DayAheadPriceEUR"], tmpdate)
-            if date in tmp.time.strftime("%Y-%m-%d"):
-                reslist.append(tmp)
-
-    return reslist
-
-
-def prepare_co2_data(indata, date, tz) -> list:  # pylint: disable=invalid-name
-    """Prepare the CO2 data and return a list."""
-    local_tz = dt_util.get_default_time_zone()
-    reslist = []
-    for dataset in indata:
-        tmpdate = (
-            datetime.fromisoformat(dataset["Minutes5UTC"])
-            .replace(tzinfo=dt_util.UTC)
-            .astimezone(local_tz)
-        )
-        tmp = CO2INTERVAL(dataset["CO2Emission"], tmpdate)
-        if date in tmp.time.strftime("%Y-%m-%d"):
-            reslist.append(tmp)
 
-    return reslist
+def prepare_data(series: RecordSeries, day: date, resolution: bool = False) -> list:
+    """Get prices of the day in 15 minutes, or averaged hourly, resolution."""
+    return series.rows(day, INTERVAL, resolution)
+
+
+def prepare_co2_data(series: RecordSeries, day: date) -> list:
+    """Prepare the CO2 data of the day and return a list."""
+    return series.rows(day, CO2INTERVAL)
 
 
 class Connector:
@@ -87,15 +51,44 @@ class Connector:
         self.regionhandler = regionhandler
         self.client = client
         self.result = {}
-        self._co2_result = {}
+        self._co2_result = []
+        self._series = None
+        self._co2_series = None
         self._tz = tz
         self.status = 418
         self._version = version
+        self._validators = None
+
+    def resume(self, previous: Connector) -> None:
+        """Continue from the records and validators of a previous fetch."""
+        if previous.status == 200 and previous.result:
+            self.result = previous.result
+            self._validators = previous._validators  # pylint: disable=protected-access
 
     async def async_get_spotprices(self) -> None:
-        """Fetch latest spotprices, excl. VAT and tariff."""
+        """Fetch latest spotprices, excl. VAT and tariff.
+
+        If records of the current window are already held, only the records
+        after the latest of them are requested and merged into the dataset.
+        """
         headers = self._header(self._version)
-        url = self._prepare_url(BASE_URL + "DayAheadPrices")
+        window_start = (datetime.utcnow() - timedelta(days=1)).strftime("%Y-%m-%d")
+        held = [
+            record for record in self.result or [] if record["TimeUTC"] >= window_start
+        ]
+        if held and self.result[0]["TimeUTC"][:10] <= window_start:
+            latest = held[-1]["TimeUTC"]
+            url = self._prepare_url(BASE_URL + "DayAheadPrices", since=latest)
+        else:
+            held, latest = [], None
+            url = self._prepare_url(BASE_URL + "DayAheadPrices")
+
+        if self._validators and self._validators[0] == url:
+            if self._validators[1]:
+                headers["If-None-Match"] = self._validators[1]
+            if self._validators[2]:
+                headers["If-Modified-Since"] = self._validators[2]
+
         _LOGGER.debug(
             "Request body for %s via Energi Data Service API URL: %s",
             self.regionhandler.region,
@@ -114,9 +107,31 @@ class Connector:
             self.result = {}
         elif resp.status == 429:
             self.result = {}
+        elif resp.status == 304:
+            _LOGGER.debug("No new spot prices for %s", self.regionhandler.region)
+            self.status = 200
+            self.result = self._merge(held, [])
         elif resp.status == 200:
             res = await resp.json()
-            self.result = res["records"]
+            resp_headers = getattr(resp, "headers", None) or {}
+            self._validators = (
+                url,
+                resp_headers.get("ETag"),
+                resp_headers.get("Last-Modified"),
+            )
+            if latest is None:
+                self.result = res["records"]
+            else:
+                _LOGGER.debug(
+                    "Got %s new records for %s after %s",
+                    len(res["records"]),
+                    self.regionhandler.region,
+                    latest,
+                )
+                self.result = self._merge(
+                    held,
+                    [record for record in res["records"] if record["TimeUTC"] > latest],
+                )
 
             # _LOGGER.debug(
             #     "Response for %s:\n%s",
@@ -128,6 +143,13 @@ class Connector:
         else:
             _LOGGER.error("API returned error %s", str(resp.status))
 
+    def _merge(self, held: list, new: list) -> list:
+        """Return the held records extended by new, reusing result if unchanged."""
+        if not new and len(held) == len(self.result):
+            return self.result
+
+        return held + new
+
     async def async_get_co2emissions(self) -> None:
         """Fetch CO2 emissions."""
 
@@ -153,8 +175,11 @@ class Connector:
             elif resp.status == 429:
                 self.result = {}
             elif resp.status == 200:
-                res = await resp.json()
-                self._co2_result = res["records"]
+                # Only the time and emission of each record is kept, as they are read
+                self._co2_result = [
+                    (record["Minutes5UTC"], record["CO2Emission"])
+                    async for record in async_iter_records(resp.content)
+                ]
 
                 # _LOGGER.debug(
                 #     "Response for %s CO2:\n%s",
@@ -180,10 +205,20 @@ class Connector:
 
         return data
 
-    def _prepare_url(self, url: str, co2: bool = False) -> str:
-        """Prepare and format the URL for the API request."""
+    def _prepare_url(
+        self, url: str, co2: bool = False, since: str | None = None
+    ) -> str:
+        """Prepare and format the URL for the API request.
+
+        since limits the spot prices to the records from that TimeUTC and on.
+        """
         if not co2:
-            start_date = (datetime.utcnow() - timedelta(days=1)).strftime("%Y-%m-%d")
+            if since is not None:
+                start_date = since[:16]
+            else:
+                start_date = (datetime.utcnow() - timedelta(days=1)).strftime(
+                    "%Y-%m-%d"
+                )
             end_date = (datetime.utcnow() + timedelta(days=2)).strftime("%Y-%m-%d")
             start = f"start={str(start_date)}"
             end = f"end={str(end_date)}"
@@ -206,23 +241,34 @@ class Connector:
             return f"{url}?{start}&{sort}&{objfilter}"
 
     @property
-    def today(self) -> list:
-        """Return raw dataset for today."""
-        date = datetime.now().strftime("%Y-%m-%d")
+    def series(self) -> RecordSeries:
+        """Return the spot prices, parsed once per fetch."""
+        self._series = parsed(self._series, self.result, "TimeUTC", "DayAheadPriceEUR")
+        return self._series
+
+    def prices(self, offset: int, hourly: bool) -> list:
+        """Return the prices of the day offset days from today.
+
+        Both resolutions are served from the same fetch.
+        """
         return prepare_data(
-            self.result, date, self._tz, self.config.options.get(CONF_RESOLUTION, True)
+            self.series, dt_util.now().date() + timedelta(days=offset), hourly
         )
 
+    @property
+    def today(self) -> list:
+        """Return raw dataset for today."""
+        return self.prices(0, self.config.options.get(CONF_RESOLUTION, True))
+
     @property
     def tomorrow(self) -> list:
         """Return raw dataset for today."""
-        date = (datetime.now() + timedelta(days=1)).strftime("%Y-%m-%d")
-        return prepare_data(
-            self.result, date, self._tz, self.config.options.get(CONF_RESOLUTION, True)
-        )
+        return self.prices(1, self.config.options.get(CONF_RESOLUTION, True))
 
     @property
     def co2data(self) -> list:
         """Return raw CO2 dataset."""
-        date = datetime.now().strftime("%Y-%m-%d")
-        return prepare_co2_data(self._co2_result, date, self._tz)
+        self._co2_series = parsed(
+            self._co2_series, self._co2_result, CO2_TIME, CO2_EMISSION
+        )
+        return prepare_co2_data(self._co2_series, dt_util.now().date())
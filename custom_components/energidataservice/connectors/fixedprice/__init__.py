@@ -68,14 +68,19 @@ class Connector:
         _LOGGER.debug("Returning the fixed value of '%s'", self.value)
         return self.value
 
+    def prices(
+        self, offset: int, hourly: bool
+    ) -> list:  # pylint: disable=unused-argument
+        """Return the prices of the day offset days from today, always hourly."""
+        date = (datetime.now() + timedelta(days=offset)).strftime("%Y-%m-%d")
+        return prepare_data(self.value, date, self.tz)
+
     @property
     def today(self) -> list:
         """Return raw dataset for today."""
-        date = datetime.now().strftime("%Y-%m-%d")
-        return prepare_data(self.value, date, self.tz)
+        return self.prices(0, True)
 
     @property
     def tomorrow(self) -> list:
         """Return raw dataset for today."""
-        date = (datetime.now() + timedelta(days=1)).strftime("%Y-%m-%d")
-        return prepare_data(self.value, date, self.tz)
+        return self.prices(1, True)
@@ -4,12 +4,13 @@ from __future__ import annotations
 
 import asyncio
 import logging
-from datetime import datetime, timedelta
+from datetime import date, datetime, timedelta
 
 import homeassistant.util.dt as dt_util
 import pytz
 
 from ...const import CONF_RESOLUTION, INTERVAL
+from ...utils.series import RecordSeries, parsed
 from .mapping import map_region
 from .regions import REGIONS
 
@@ -31,35 +32,9 @@ CO2REGIONS = []
 __all__ = ["REGIONS", "Connector", "DEFAULT_CURRENCY", "CO2REGIONS"]
 
 
-def prepare_data(
-    indata, date, tz, resolution: bool = False
-) -> list:  # pylint: disable=invalid-name
-    """Get today prices."""
-    local_tz = dt_util.get_default_time_zone()
-    reslist = []
-
-    if resolution == True:
-        for i in range(0, len(indata), 4):
-            group = indata[i : i + 4]
-            if len(group) < 4:
-                continue  # Skip incomplete groups although it shouldn't happen
-            tmpdate = (
-                datetime.fromisoformat(group[0]["HourUTC"])
-                .replace(tzinfo=dt_util.UTC)
-                .astimezone(local_tz)
-            )
-            if date in tmpdate.strftime("%Y-%m-%d"):
-                avg_price = sum(float(item["SpotPriceEUR"]) for item in group) / 4
-                tmp = INTERVAL(avg_price, tmpdate)
-                reslist.append(tmp)
-    else:
-        for dataset in indata:
-            tmpdate = datetime.fromisoformat(dataset["HourUTC"]).astimezone(local_tz)
-            tmp = INTERVAL(dataset["SpotPriceEUR"], tmpdate)
-            if date in tmp.time.strftime("%Y-%m-%d"):
-                reslist.append(tmp)
-
-    return reslist
+def prepare_data(series: RecordSeries, day: date, resolution: bool = False) -> list:
+    """Get prices of the day in 15 minutes, or averaged hourly, resolution."""
+    return series.rows(day, INTERVAL, resolution)
 
 
 class Connector:
@@ -73,6 +48,7 @@ class Connector:
         self.regionhandler = map_region(regionhandler)
         self.client = client
         self.result = {}
+        self._series = None
         self._tz = tz
         self.status = 200
         self._version = version
@@ -169,22 +145,31 @@ class Connector:
         except ValueError:
             return None
 
+    @property
+    def series(self) -> RecordSeries:
+        """Return the spot prices, parsed once per fetch."""
+        self._series = parsed(self._series, self.result, "HourUTC", "SpotPriceEUR")
+        return self._series
+
+    def prices(self, offset: int, hourly: bool) -> list | None:
+        """Return the prices of the day offset days from today.
+
+        Both resolutions are served from the same fetch.
+        """
+        data = prepare_data(
+            self.series, dt_util.now().date() + timedelta(days=offset), hourly
+        )
+        if offset and len(data) <= 20:
+            return None
+
+        return data
+
     @property
     def today(self) -> list:
         """Return raw dataset for today."""
-        date = datetime.now().strftime("%Y-%m-%d")
-        return prepare_data(
-            self.result, date, self._tz, self.config.options.get(CONF_RESOLUTION, True)
-        )
+        return self.prices(0, self.config.options.get(CONF_RESOLUTION, True))
 
     @property
     def tomorrow(self) -> list:
         """Return raw dataset for today."""
-        date = (datetime.now() + timedelta(days=1)).strftime("%Y-%m-%d")
-        data = prepare_data(
-            self.result, date, self._tz, self.config.options.get(CONF_RESOLUTION, True)
-        )
-        if len(data) > 20:
-            return data
-        else:
-            return None
+        return self.prices(1, self.config.options.get(CONF_RESOLUTION, True))
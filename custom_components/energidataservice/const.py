@@ -30,6 +30,9 @@ ATTR_TODAY_MEAN = "today_mean"
 ATTR_TODAY_REMAINING_MIN = "today_remaining_min"
 ATTR_TODAY_REMAINING_MAX = "today_remaining_max"
 ATTR_TODAY_REMAINING_MEAN = "today_remaining_mean"
+ATTR_TODAY_STDDEV = "today_stddev"
+ATTR_TODAY_PERCENTILE_10 = "today_percentile_10"
+ATTR_TODAY_PERCENTILE_90 = "today_percentile_90"
 ATTR_TOMORROW_MIN = "tomorrow_min"
 ATTR_TOMORROW_MAX = "tomorrow_max"
 ATTR_TOMORROW_MEAN = "tomorrow_mean"
@@ -40,6 +43,16 @@ ATTR_NET_OPERATOR = "net_operator"
 ATTR_TARIFFS = "tariffs"
 ATTR_RESOLUTION_60MIN = True
 ATTR_RESOLUTION_15MIN = False
+ATTR_CONFIG_ENTRY = "config_entry"
+ATTR_DURATION = "duration"
+ATTR_EARLIEST_START = "earliest_start"
+ATTR_LATEST_END = "latest_end"
+ATTR_INCLUDE_FORECAST = "include_forecast"
+ATTR_FIND_LAST = "find_last"
+ATTR_PERIOD_END = "end"
+ATTR_PERIOD_MEAN = "mean"
+ATTR_METRIC_COUNT = "count"
+ATTR_METRIC_MAX = "max"
 
 CARNOT_URL = "https://www.carnot.dk"
 
@@ -59,6 +72,9 @@ CONF_FIXED_PRICE_VALUE = "fixed_value"
 CONF_FIXED_PRICE_VAT = "fixed_vat"
 CONF_TARIFF_CHARGE_OWNER = "tariff_charge_owner"
 CONF_RESOLUTION = "resolution"
+CONF_COMPACT_ATTRIBUTES = "compact_attributes"
+CONF_FORECAST_HORIZON = "forecast_horizon"
+CONF_MIN_WRITE_INTERVAL = "min_write_interval"
 
 DATA = "data"
 DEFAULT_NAME = "Energidataservice"
@@ -72,12 +88,30 @@ DOMAIN = "energidataservice"
 
 GITHUB_URL = "https://github.com/mtrab/energidataservice"
 
+DATA_CACHE = "data_cache"
+PRICE_STORE = "price_store"
+PRICE_SCHEDULERS = "price_schedulers"
+PROVIDER_MANIFEST = "provider_manifest"
+TARIFF_STORE = "tariff_store"
+
 INTERVAL = namedtuple("Interval", "price time")
 CO2INTERVAL = namedtuple("CO2Interval", "value time")
 
 UNIQUE_ID = "unique_id"
 UPDATE_EDS = "eds_update_{}"
 UPDATE_EDS_5MIN = "eds_5m_update_{}"
+UPDATE_EDS_PRICES = "eds_prices_update_{}"
+UPDATE_EDS_TARIFFS = "eds_tariffs_update_{}"
+UPDATE_EDS_FORECAST = "eds_forecast_update_{}"
+UPDATE_EDS_CO2 = "eds_co2_update_{}"
+
+SERVICE_FIND_CHEAPEST_PERIOD = "find_cheapest_period"
+
+# Durations, in hours, of the optional cheapest period sensors
+CHEAPEST_PERIOD_HOURS = (1, 2, 3)
+
+# Metrics shown by the optional diagnostic sensors
+METRIC_SENSORS = ("calculate", "dispatch_update", "prepare_data", "tariff_update")
 
 # Multiplier mappings
 UNIT_TO_MULTIPLIER = {"MWh": 0, "kWh": 1000, "Wh": 1000000}
@@ -10,6 +10,7 @@ from homeassistant.const import CONF_API_KEY, CONF_EMAIL, CONF_UNIQUE_ID
 from homeassistant.core import HomeAssistant
 
 from .const import DOMAIN
+from .utils.tariffstore import async_get_tariff_store
 
 TO_REDACT = {
     CONF_UNIQUE_ID,
@@ -35,7 +36,15 @@ async def async_get_config_entry_diagnostics(
         "predictions": api.predictions,
         "api_predictions": api.api_predictions,
         "tariff_data": api.tariff_data,
+        "tariff_store": async_get_tariff_store(hass).diagnostics,
+        "tariff_refresh": api.tariff_refresh_state,
         "co2dataset": api.co2,
+        "cost_template": (
+            api.cost_template.diagnostics if api.cost_template is not None else None
+        ),
+        "metrics": api.metrics.diagnostics,
+        "retry_count": api.retry_count,
+        "scheduler": (api.scheduler.diagnostics if api.scheduler is not None else None),
         "next_update": api.next_data_refresh,
         "data_source": api._source,
         "home_assistant_tz": hass.config.time_zone,
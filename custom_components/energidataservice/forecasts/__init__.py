@@ -1,16 +1,12 @@
-"""Dynamically load all available forecast providers."""
+"""Load all available forecast providers."""
 
 from __future__ import annotations
 
-import importlib
-from asyncio import get_running_loop
 from collections import namedtuple
-from genericpath import isdir
 from logging import getLogger
-from os import listdir
-from posixpath import dirname
 
 from ..const import CURRENCY_LIST, REGIONS
+from ..utils.providers import async_get_provider_manifest
 
 _LOGGER = getLogger(__name__)
 
@@ -25,32 +21,21 @@ class Forecast:
         self._forecasts = []
 
     async def load_modules(self) -> None:
-        """Load available modules."""
-        loop = get_running_loop()
-        modules = await loop.run_in_executor(None, listdir, f"{dirname(__file__)}")
-        for module in sorted(modules):
-            mod_path = f"{dirname(__file__)}/{module}"
-            if (
-                isdir(mod_path)
-                and not module.endswith("__pycache__")
-                and not mod_path.endswith(".disabled")
-            ):
-                Endpoint = namedtuple("Endpoint", "module namespace regions")
-                _LOGGER.debug("Adding module %s", module)
-                api_ns = f".{module}"
-
-                mod = await self.hass.async_add_executor_job(
-                    importlib.import_module, api_ns, __name__
-                )
-                con = Endpoint(module, f".forecasts{api_ns}", mod.REGIONS)
-
-                if hasattr(mod, "EXTRA_REGIONS"):
-                    REGIONS.update(mod.EXTRA_REGIONS)
-
-                if hasattr(mod, "EXTRA_CURRENCIES"):
-                    CURRENCY_LIST.update(mod.EXTRA_CURRENCIES)
-
-                self._forecasts.append(con)
+        """Load available modules from the provider manifest."""
+        manifest = await async_get_provider_manifest(self.hass)
+        self._forecasts = []
+        for module, provider in manifest["forecasts"].items():
+            Endpoint = namedtuple("Endpoint", "module namespace regions")
+            _LOGGER.debug("Adding module %s", module)
+            con = Endpoint(module, f".forecasts.{module}", provider["regions"])
+
+            if "extra_regions" in provider:
+                REGIONS.update(provider["extra_regions"])
+
+            if "extra_currencies" in provider:
+                CURRENCY_LIST.update(provider["extra_currencies"])
+
+            self._forecasts.append(con)
 
     @property
     def forecast_endpoints(self) -> list:
@@ -61,7 +46,8 @@ class Forecast:
         """Get endpoint(s) of a specific zone."""
         endpoints = []
 
-        await self.load_modules()
+        if not self._forecasts:
+            await self.load_modules()
 
         for endpoint in self._forecasts:
             if region in endpoint.regions:
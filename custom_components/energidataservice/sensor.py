@@ -3,7 +3,7 @@
 from __future__ import annotations
 
 import logging
-from collections import namedtuple
+from collections.abc import Callable
 from datetime import datetime, timedelta
 
 import homeassistant.helpers.config_validation as cv
@@ -19,19 +19,27 @@ from homeassistant.const import CONF_API_KEY, CONF_EMAIL, CONF_NAME
 from homeassistant.core import HomeAssistant, callback
 from homeassistant.helpers import device_registry as dr
 from homeassistant.helpers import entity_registry as er
-from homeassistant.helpers.dispatcher import async_dispatcher_connect
+from homeassistant.helpers.dispatcher import (
+    async_dispatcher_connect,
+    async_dispatcher_send,
+)
+from homeassistant.helpers.entity import EntityCategory
+from homeassistant.helpers.event import async_call_later
 from homeassistant.helpers.template import Template
 from homeassistant.util import dt as dt_utils
 from homeassistant.util import slugify as util_slugify
-from jinja2 import pass_context
 
 from .const import (
     ATTR_ATTRIBUTION,
     ATTR_CURRENCY,
     ATTR_CURRENT_PRICE,
     ATTR_FORECAST,
+    ATTR_METRIC_COUNT,
+    ATTR_METRIC_MAX,
     ATTR_NET_OPERATOR,
     ATTR_NEXT_DATA_UPDATE,
+    ATTR_PERIOD_END,
+    ATTR_PERIOD_MEAN,
     ATTR_RAW_TODAY,
     ATTR_RAW_TOMORROW,
     ATTR_REGION,
@@ -41,9 +49,12 @@ from .const import (
     ATTR_TODAY_MAX,
     ATTR_TODAY_MEAN,
     ATTR_TODAY_MIN,
+    ATTR_TODAY_PERCENTILE_10,
+    ATTR_TODAY_PERCENTILE_90,
     ATTR_TODAY_REMAINING_MAX,
     ATTR_TODAY_REMAINING_MEAN,
     ATTR_TODAY_REMAINING_MIN,
+    ATTR_TODAY_STDDEV,
     ATTR_TOMORROW,
     ATTR_TOMORROW_MAX,
     ATTR_TOMORROW_MEAN,
@@ -51,29 +62,42 @@ from .const import (
     ATTR_TOMORROW_VALID,
     ATTR_UNIT,
     ATTR_USE_CENT,
-    CENT_MULTIPLIER,
+    CHEAPEST_PERIOD_HOURS,
     CONF_AREA,
+    CONF_COMPACT_ATTRIBUTES,
     CONF_COUNTRY,
     CONF_CURRENCY_IN_CENT,
     CONF_DECIMALS,
     CONF_ENABLE_FORECAST,
     CONF_ENABLE_TARIFFS,
     CONF_FIXED_PRICE_VAT,
+    CONF_FORECAST_HORIZON,
+    CONF_MIN_WRITE_INTERVAL,
     CONF_PRICETYPE,
-    CONF_RESOLUTION,
     CONF_TARIFF_CHARGE_OWNER,
     CONF_TEMPLATE,
     CONF_VAT,
     DEFAULT_TEMPLATE,
     DOMAIN,
-    UNIT_TO_MULTIPLIER,
+    METRIC_SENSORS,
     UPDATE_EDS,
     UPDATE_EDS_5MIN,
+    UPDATE_EDS_CO2,
+    UPDATE_EDS_FORECAST,
+    UPDATE_EDS_PRICES,
+    UPDATE_EDS_TARIFFS,
 )
+from .utils.costtemplate import CostTemplate
+from .utils.pricecalc import PriceCalculator
 from .utils.regionhandler import RegionHandler
+from .utils.series import TimeSeries, indexed
+from .utils.statistics import PriceStatistics, statistics_for
 
 _LOGGER = logging.getLogger(__name__)
 
+# Number of calculated datasets kept for reuse (today, tomorrow, predictions + 1)
+CALCULATION_CACHE_SIZE = 4
+
 
 def show_with_vat(dataset: dict, vat: float, decimals: int = 3) -> dict:
     """Add vat to the dataset."""
@@ -104,18 +128,6 @@ async def async_setup_entry(hass, config_entry: ConfigEntry, async_add_devices):
     return True
 
 
-def mean(data: list) -> float:
-    """Calculate mean value of list."""
-    val = 0
-    num = 0
-
-    for i in data:
-        val += i.price
-        num += 1
-
-    return val / num
-
-
 def _setup(hass, config: ConfigEntry, add_devices):
     """Do the platform setup."""
     area = config.options.get(CONF_AREA) or config.data.get(CONF_AREA)
@@ -185,6 +197,36 @@ def _setup(hass, config: ConfigEntry, add_devices):
         sens = EnergidataserviceCO2Sensor(config, hass, region, co2_sensor)
         add_devices([sens])
 
+    cheapest_sensors = []
+    for hours in CHEAPEST_PERIOD_HOURS:
+        cheapest_sensor = SensorEntityDescription(
+            key=f"EnergiDataService_cheapest_{hours}h",
+            device_class=SensorDeviceClass.TIMESTAMP,
+            icon="mdi:clock-check-outline",
+            name=f"{config.data.get(CONF_NAME)} cheapest {hours}h",
+        )
+        cheapest_sensors.append(
+            EnergidataserviceCheapestPeriodSensor(
+                config, hass, region, cheapest_sensor, timedelta(hours=hours)
+            )
+        )
+    add_devices(cheapest_sensors)
+
+    metric_sensors = []
+    for metric in METRIC_SENSORS:
+        metric_sensor = SensorEntityDescription(
+            key=f"EnergiDataService_metric_{metric}",
+            entity_category=EntityCategory.DIAGNOSTIC,
+            icon="mdi:timer-outline",
+            name=f"{config.data.get(CONF_NAME)} {metric.replace('_', ' ')} time",
+            native_unit_of_measurement="ms",
+            state_class=SensorStateClass.MEASUREMENT,
+        )
+        metric_sensors.append(
+            EnergidataserviceMetricSensor(config, hass, region, metric_sensor, metric)
+        )
+    add_devices(metric_sensors)
+
 
 @callback
 def _async_migrate_unique_id(hass: HomeAssistant, entity: str, new_id: str) -> None:
@@ -224,7 +266,67 @@ def _async_migrate_unique_id(hass: HomeAssistant, entity: str, new_id: str) -> N
         _LOGGER.debug("- Check didn't find anything")
 
 
-class EnergidataserviceCO2Sensor(SensorEntity):
+class ChangeTrackingSensor(SensorEntity):
+    """Sensor writing its state only when the value or the attributes changed.
+
+    Attributes are set through _set_attributes, which counts a new version
+    whenever they differ from the current ones. A write is skipped if neither
+    the native value nor that version changed since the last write, and is
+    postponed if it comes sooner than the minimum write interval after it.
+    """
+
+    _min_write_interval = timedelta(0)
+    _attributes_version = 0
+    _written: tuple | None = None
+    _last_write: datetime | None = None
+    _pending_write: Callable[[], None] | None = None
+
+    def _set_attributes(self, attributes: dict) -> None:
+        """Set the extra state attributes, counting a version if they changed."""
+        if attributes != getattr(self, "_attr_extra_state_attributes", None):
+            self._attr_extra_state_attributes = attributes
+            self._attributes_version += 1
+
+    @callback
+    def async_write_if_changed(self) -> None:
+        """Write the state if it changed, at most once per minimum interval."""
+        if self._pending_write is not None or not self._changed():
+            return
+
+        now = dt_utils.utcnow()
+        if self._last_write is not None:
+            delay = self._last_write + self._min_write_interval - now
+            if delay > timedelta(0):
+                self._pending_write = async_call_later(
+                    self.hass, delay, self._async_postponed_write
+                )
+                return
+
+        self._written = (self._attr_native_value, self._attributes_version)
+        self._last_write = now
+        self.async_write_ha_state()
+
+    async def async_will_remove_from_hass(self) -> None:
+        """Cancel a postponed write."""
+        await super().async_will_remove_from_hass()
+        if self._pending_write is not None:
+            self._pending_write()
+            self._pending_write = None
+
+    @callback
+    def _async_postponed_write(
+        self, now: datetime
+    ) -> None:  # pylint: disable=unused-argument
+        """Write the state postponed by the minimum interval."""
+        self._pending_write = None
+        self.async_write_if_changed()
+
+    def _changed(self) -> bool:
+        """Check if the value or the attributes changed since the last write."""
+        return self._written != (self._attr_native_value, self._attributes_version)
+
+
+class EnergidataserviceCO2Sensor(ChangeTrackingSensor):
     """Representation of Energi Data Service CO2 data."""
 
     def __init__(
@@ -259,6 +361,12 @@ class EnergidataserviceCO2Sensor(SensorEntity):
 
         self._attr_native_value = None
         self._attr_native_unit_of_measurement = "g/kWh"
+        self._series: TimeSeries | None = None
+        # Holds the emissions attribute as (CO2 dataset, emissions)
+        self._emissions: tuple | None = None
+        self._min_write_interval = timedelta(
+            seconds=config.options.get(CONF_MIN_WRITE_INTERVAL) or 0
+        )
 
     @property
     def unique_id(self):
@@ -292,47 +400,195 @@ class EnergidataserviceCO2Sensor(SensorEntity):
 
     async def update_data(self) -> None:
         """Update data for the sensor."""
-        current_state_time = datetime.fromisoformat(
-            dt_utils.now().replace(microsecond=0).replace(second=0).isoformat()
-        )
         if self._api.co2:
-            possible_dataset = []
-            for dataset in self._api.co2:
-                if dataset.time <= current_state_time:
-                    possible_dataset = dataset
-                else:
-                    self._attr_native_value = possible_dataset.value
-                    _LOGGER.debug(
-                        "Current CO2 value updated to %f for %s using dataset time %s",
-                        self._attr_native_value,
-                        self.region.region,
-                        possible_dataset.time,
-                    )
-                    break
-
-            self._attr_extra_state_attributes = {"next_refresh": self._api.co2_refresh}
-
-            value_dict = {}
-            for i in self._api.co2:
-                value_dict.update({i.time.strftime("%H:%M"): i.value})
-
-            self._attr_extra_state_attributes.update({"emissions": value_dict})
+            self._series = indexed(self._series, self._api.co2)
+            dataset = self._series.at(dt_utils.now())
+            if dataset is not None:
+                self._attr_native_value = dataset.value
+                _LOGGER.debug(
+                    "Current CO2 value updated to %f for %s using dataset time %s",
+                    self._attr_native_value,
+                    self.region.region,
+                    dataset.time,
+                )
 
-        self.async_write_ha_state()
+            if self._emissions is None or self._emissions[0] is not self._api.co2:
+                self._emissions = (
+                    self._api.co2,
+                    {i.time.strftime("%H:%M"): i.value for i in self._api.co2},
+                )
+
+            self._set_attributes(
+                {"next_refresh": self._api.co2_refresh, "emissions": self._emissions[1]}
+            )
+
+        self.async_write_if_changed()
 
     async def async_added_to_hass(self):
         """Connect to dispatcher listening for entity data notifications."""
         await super().async_added_to_hass()
         _LOGGER.debug("Added sensor '%s' CO2", self._entity_id)
         await self.update_data()
+        for signal in (UPDATE_EDS_5MIN, UPDATE_EDS_CO2):
+            self.async_on_remove(
+                async_dispatcher_connect(
+                    self._hass,
+                    signal.format(self._entry_id),
+                    self._async_dispatched_update,
+                )
+            )
+
+    async def _async_dispatched_update(self) -> None:
+        """Update the sensor on a dispatcher signal, recording the time spent."""
+        with self._api.metrics.timer("dispatch_update_5min"):
+            await self.update_data()
+
+
+class EnergidataserviceCheapestPeriodSensor(ChangeTrackingSensor):
+    """Start of the cheapest upcoming period of a fixed duration."""
+
+    _attr_entity_registry_enabled_default = False
+
+    def __init__(
+        self,
+        config: ConfigEntry,
+        hass: HomeAssistant,
+        region: RegionHandler,
+        description: SensorEntityDescription,
+        duration: timedelta,
+    ) -> None:
+        """Initialize Energidataservice cheapest period sensor."""
+        self.entity_description = description
+        self.region = region
+
+        self._attr_name = self.entity_description.name
+        self._entry_id = config.entry_id
+        self._api = hass.data[DOMAIN][config.entry_id]
+        self._hass = hass
+        self._duration = duration
+        self._min_write_interval = timedelta(
+            seconds=config.options.get(CONF_MIN_WRITE_INTERVAL) or 0
+        )
+
+        self._attr_unique_id = util_slugify(
+            f"{self.entity_description.key}_{self._entry_id}"
+        )
+        self._attr_native_value = None
+
+    @property
+    def should_poll(self):
+        """No need to poll. Coordinator notifies entity of updates."""
+        return False
+
+    @property
+    def device_info(self):
+        """Return the device info."""
+        return {
+            "identifiers": {(DOMAIN, self._api.master_uuid)},
+            "model": f"Region code: {self.region.region}",
+            "manufacturer": "Energi Data Service",
+        }
+
+    async def update_data(self) -> None:
+        """Update data for the sensor."""
+        period = self._api.get_price_slots().cheapest_window(
+            self._duration, dt_utils.now()
+        )
+        if period is None:
+            self._attr_native_value = None
+            self._set_attributes({})
+        else:
+            self._attr_native_value = period.start
+            self._set_attributes(
+                {
+                    ATTR_PERIOD_END: period.end,
+                    ATTR_PERIOD_MEAN: period.price,
+                }
+            )
+
+        self.async_write_if_changed()
+
+    async def async_added_to_hass(self):
+        """Connect to dispatcher listening for calculated prices."""
+        await super().async_added_to_hass()
+        await self.update_data()
+        self.async_on_remove(
+            async_dispatcher_connect(
+                self._hass, UPDATE_EDS_PRICES.format(self._entry_id), self.update_data
+            )
+        )
+
+
+class EnergidataserviceMetricSensor(SensorEntity):
+    """Latest timing of an update or calculation stage."""
+
+    _attr_entity_registry_enabled_default = False
+
+    def __init__(
+        self,
+        config: ConfigEntry,
+        hass: HomeAssistant,
+        region: RegionHandler,
+        description: SensorEntityDescription,
+        metric: str,
+    ) -> None:
+        """Initialize Energidataservice metric sensor."""
+        self.entity_description = description
+        self.region = region
+
+        self._attr_name = self.entity_description.name
+        self._entry_id = config.entry_id
+        self._api = hass.data[DOMAIN][config.entry_id]
+        self._hass = hass
+        self._metric = metric
+
+        self._attr_unique_id = util_slugify(
+            f"{self.entity_description.key}_{self._entry_id}"
+        )
+        self._attr_native_value = None
+
+    @property
+    def should_poll(self):
+        """No need to poll. Coordinator notifies entity of updates."""
+        return False
+
+    @property
+    def device_info(self):
+        """Return the device info."""
+        return {
+            "identifiers": {(DOMAIN, self._api.master_uuid)},
+            "model": f"Region code: {self.region.region}",
+            "manufacturer": "Energi Data Service",
+        }
+
+    async def update_data(self) -> None:
+        """Update data for the sensor."""
+        summary = self._api.metrics.summary(self._metric)
+        if summary is None:
+            self._attr_native_value = None
+            self._attr_extra_state_attributes = {}
+        else:
+            self._attr_native_value = summary["last"]
+            self._attr_extra_state_attributes = {
+                ATTR_PERIOD_MEAN: summary["mean"],
+                ATTR_METRIC_MAX: summary["max"],
+                ATTR_METRIC_COUNT: summary["count"],
+            }
+
+        self.async_write_ha_state()
+
+    async def async_added_to_hass(self):
+        """Connect to dispatcher listening for calculated prices."""
+        await super().async_added_to_hass()
+        await self.update_data()
         self.async_on_remove(
             async_dispatcher_connect(
-                self._hass, UPDATE_EDS_5MIN.format(self._entry_id), self.update_data
+                self._hass, UPDATE_EDS_PRICES.format(self._entry_id), self.update_data
             )
         )
 
 
-class EnergidataserviceSensor(SensorEntity):
+class EnergidataserviceSensor(ChangeTrackingSensor):
     """Representation of Energi Data Service data."""
 
     _unrecorded_attributes = frozenset(
@@ -362,6 +618,11 @@ class EnergidataserviceSensor(SensorEntity):
         self._cent = config.options.get(CONF_CURRENCY_IN_CENT) or False
         self._forecast = config.options.get(CONF_ENABLE_FORECAST) or False
         self._tariff = config.options.get(CONF_ENABLE_TARIFFS) or False
+        self._compact = config.options.get(CONF_COMPACT_ATTRIBUTES) or False
+        self._horizon = timedelta(hours=config.options.get(CONF_FORECAST_HORIZON) or 0)
+        self._min_write_interval = timedelta(
+            seconds=config.options.get(CONF_MIN_WRITE_INTERVAL) or 0
+        )
         self._carnot_user = config.options.get(CONF_EMAIL) or None
         self._carnot_apikey = config.options.get(CONF_API_KEY) or None
         self._area = region.description
@@ -430,6 +691,25 @@ class EnergidataserviceSensor(SensorEntity):
         self._today_remaining_mean = None
         self._tomorrow_mean = None
 
+        # Holds the spread of the prices of today
+        self._today_stddev = None
+        self._today_percentile_10 = None
+        self._today_percentile_90 = None
+
+        # Holds calculated datasets as (API dataset, fingerprint, calculated)
+        self._calculated = []
+        self._today_series: TimeSeries | None = None
+        self._tomorrow_series: TimeSeries | None = None
+        self._predictions_series: TimeSeries | None = None
+
+        # Holds attribute values as (source, parameters, value), reused between writes
+        self._attributes: dict[str, tuple] = {}
+
+        # Holds aggregates of the calculated datasets
+        self._today_stats: PriceStatistics | None = None
+        self._tomorrow_stats: PriceStatistics | None = None
+        self._predictions_stats: PriceStatistics | None = None
+
         # Check incase the sensor was setup using config flow.
         # This blow up if the template isnt valid.
         if not isinstance(self._cost_template, Template):
@@ -441,6 +721,17 @@ class EnergidataserviceSensor(SensorEntity):
             if self._cost_template.template in ("", None):
                 self._cost_template = cv.template(DEFAULT_TEMPLATE)
 
+        self._api.cost_template = CostTemplate(self._cost_template)
+        self._calculator = PriceCalculator(
+            self._api,
+            self.region,
+            self._currency,
+            self._price_type,
+            self._vat,
+            self._cent,
+            self._api.cost_template,
+        )
+
     async def validate_data(self) -> None:
         """Validate sensor data."""
         _LOGGER.debug("Validating sensor %s", self.name)
@@ -449,79 +740,54 @@ class EnergidataserviceSensor(SensorEntity):
         if not self._api.today:
             _LOGGER.debug("No sensor data found - calling update")
             await self._api.update()
-            if self._api.today is not None and not self._api.today_calculated:
-                _LOGGER.debug("API currency: %s", self._api.connector_currency)
-                _LOGGER.debug("SELF currency: %s", self._currency)
-                await self._hass.async_add_executor_job(
-                    self._format_list,
-                    self._api.today,
-                    False,
-                    False,
-                    self._api.connector_currency or self._currency,
-                )
+
+        # Calculate todays prices in local currency, unless the inputs are unchanged
+        if self._api.today is not None:
+            _LOGGER.debug("API currency: %s", self._api.connector_currency)
+            _LOGGER.debug("SELF currency: %s", self._currency)
+            self._api.today = await self._async_localize(
+                self._api.api_today,
+                self._api.connector_currency or self._currency,
+                "TODAY",
+            )
+            self._api.today_calculated = True
 
         # Do we have valid data for tomorrow? If we do, calculate prices in local currency
         # If not, set attributes to None
         if self.tomorrow_valid:
-            if not self._api.tomorrow_calculated:
-                await self._hass.async_add_executor_job(
-                    self._format_list,
-                    self._api.tomorrow,
-                    True,
-                    False,
-                    self._api.connector_currency or self._currency,
-                )
-            self._tomorrow_raw = self._add_raw(
-                self._api.tomorrow, self._attr_suggested_display_precision
+            self._api.tomorrow = await self._async_localize(
+                self._api.api_tomorrow,
+                self._api.connector_currency or self._currency,
+                "TOMORROW",
+            )
+            self._api.tomorrow_calculated = True
+            self._tomorrow_stats = statistics_for(
+                self._tomorrow_stats, self._api.tomorrow
+            )
+            self._tomorrow_series = indexed(self._tomorrow_series, self._api.tomorrow)
+            self._tomorrow_raw = self._raw_attribute(
+                ATTR_RAW_TOMORROW,
+                self._tomorrow_series,
+                self._tomorrow_stats,
+                self.tomorrow,
             )
         else:
             self._api.tomorrow = None
             self._tomorrow_raw = None
             self._api.tomorrow_calculated = False
 
-        # Check if the data have been reset to API values rather than the calculated values
-        if self._api.today == self._api.api_today and not isinstance(
-            self._api.today, type(None)
-        ):
-            self._api.today_calculated = False
-
-        if self._api.tomorrow == self._api.api_tomorrow and not isinstance(
-            self._api.tomorrow, type(None)
-        ):
-            self._api.tomorrow_calculated = False
-
-        if self._api.predictions == self._api.api_predictions and not isinstance(
-            self._api.predictions, type(None)
-        ):
-            self._api.predictions_calculated = False
-
-        # If we haven't already calculated todays prices in local currency, do so now
-        if not self._api.today_calculated and not isinstance(
-            self._api.today, type(None)
-        ):
-            await self._hass.async_add_executor_job(
-                self._format_list,
-                self._api.today,
-                False,
-                False,
-                self._api.connector_currency or self._currency,
-            )
-
         # If predictions is enabled but no data exists, fetch dataset
         if self._api.forecast and isinstance(self._api.predictions, type(None)):
             await self._api.update_carnot()
 
-        # If predictions is enabled but not calculated, do so now
-        if not self._api.predictions_calculated and not isinstance(
-            self._api.predictions, type(None)
-        ):
-            await self._hass.async_add_executor_job(
-                self._format_list,
-                self._api.predictions,
-                False,
-                True,
+        # Calculate predictions, unless the inputs are unchanged
+        if not isinstance(self._api.predictions, type(None)):
+            self._api.predictions = await self._async_localize(
+                self._api.api_predictions,
                 self._api.predictions_currency or self._currency,
+                "PREDICTIONS",
             )
+            self._api.predictions_calculated = True
         else:
             _LOGGER.debug(
                 "Predictions: %s (%s)",
@@ -531,56 +797,53 @@ class EnergidataserviceSensor(SensorEntity):
 
         # Update attributes
         if self._api.today:
-            self._today_raw = self._add_raw(
-                self._api.today, self._attr_suggested_display_precision
+            decimals = self._attr_suggested_display_precision
+            self._today_stats = statistics_for(self._today_stats, self._api.today)
+            self._today_series = indexed(self._today_series, self._api.today)
+            self._today_raw = self._raw_attribute(
+                ATTR_RAW_TODAY, self._today_series, self._today_stats, self.today
             )
 
-            self._today_min = self._get_specific(
-                "min", self._api.today, self._attr_suggested_display_precision
+            self._today_min = self._get_specific(self._today_stats.min(), decimals)
+            self._today_max = self._get_specific(self._today_stats.max(), decimals)
+            self._today_mean = self._round(self._today_stats.mean(), decimals)
+            self._today_stddev = self._round(self._today_stats.stddev(), decimals)
+            self._today_percentile_10 = self._round(
+                self._today_stats.percentile(10), decimals
             )
-            self._today_max = self._get_specific(
-                "max",
-                self._api.today,
-                self._attr_suggested_display_precision,
-            )
-            self._today_mean = self._get_specific(
-                "mean",
-                self._api.today,
-                self._attr_suggested_display_precision,
+            self._today_percentile_90 = self._round(
+                self._today_stats.percentile(90), decimals
             )
 
-            remaining_today = self._filter_remaining_today(self._api.today)
+            remaining = self._today_series.index_from(dt_utils.now())
 
             self._today_remaining_min = self._get_specific(
-                "min",
-                remaining_today,
-                self._attr_suggested_display_precision,
+                self._today_stats.min(remaining), decimals
             )
             self._today_remaining_max = self._get_specific(
-                "max",
-                remaining_today,
-                self._attr_suggested_display_precision,
+                self._today_stats.max(remaining), decimals
             )
-            self._today_remaining_mean = self._get_specific(
-                "mean",
-                remaining_today,
-                self._attr_suggested_display_precision,
+            self._today_remaining_mean = self._round(
+                self._today_stats.mean(remaining), decimals
             )
 
-            self._tomorrow_min = self._get_specific(
-                "min",
-                self._api.tomorrow,
-                self._attr_suggested_display_precision,
-            )
-            self._tomorrow_max = self._get_specific(
-                "max",
-                self._api.tomorrow,
-                self._attr_suggested_display_precision,
-            )
+            if self._api.tomorrow:
+                self._tomorrow_min = self._get_specific(
+                    self._tomorrow_stats.min(), decimals
+                )
+                self._tomorrow_max = self._get_specific(
+                    self._tomorrow_stats.max(), decimals
+                )
+            else:
+                self._tomorrow_min = None
+                self._tomorrow_max = None
         else:
             self._today_min = None
             self._today_max = None
             self._today_mean = None
+            self._today_stddev = None
+            self._today_percentile_10 = None
+            self._today_percentile_90 = None
             self._today_remaining_min = None
             self._today_remaining_max = None
             self._today_remaining_mean = None
@@ -588,11 +851,9 @@ class EnergidataserviceSensor(SensorEntity):
             self._tomorrow_max = None
 
         # If we have valid data for tomorrow, then find the mean value
-        if self.tomorrow_valid:
-            self._tomorrow_mean = self._get_specific(
-                "mean",
-                self._api.tomorrow,
-                self._attr_suggested_display_precision,
+        if self.tomorrow_valid and self._api.tomorrow:
+            self._tomorrow_mean = self._round(
+                self._tomorrow_stats.mean(), self._attr_suggested_display_precision
             )
         else:
             self._tomorrow_mean = None
@@ -600,42 +861,23 @@ class EnergidataserviceSensor(SensorEntity):
         # Updates price for this hour.
         self._get_current_price()
 
-        self.async_write_ha_state()
+        self.async_write_if_changed()
+        async_dispatcher_send(self._hass, UPDATE_EDS_PRICES.format(self._entry_id))
 
     def _get_current_price(self) -> None:
         """Get price for current hour."""
-        current_state_time = datetime.fromisoformat(
-            dt_utils.now()
-            .replace(microsecond=0)
-            .replace(second=0)
-            .replace(minute=0)
-            .isoformat()
-        )
         if self._api.today:
-            for dataset in self._api.today:
-                if not dataset.time.hour == dt_utils.now().hour:
-                    continue
-
-                if (
-                    dataset.time.hour == dt_utils.now().hour
-                    and len(self._api.today) == 24
-                ) or (
-                    dataset.time.minute <= dt_utils.now().minute
-                    and (
-                        (dataset.time + timedelta(minutes=15)).minute
-                        > dt_utils.now().minute
-                        or (dataset.time + timedelta(minutes=15)).minute == 0
-                    )
-                ):
-                    self._attr_native_value = dataset.price
-                    _LOGGER.debug(
-                        "Current price updated to %f for %s",
-                        self._attr_native_value,
-                        self.region.region,
-                    )
-                    break
+            self._today_series = indexed(self._today_series, self._api.today)
+            dataset = self._today_series.at(dt_utils.now())
+            if dataset is not None:
+                self._attr_native_value = dataset.price
+                _LOGGER.debug(
+                    "Current price updated to %f for %s",
+                    self._attr_native_value,
+                    self.region.region,
+                )
 
-            self._attr_extra_state_attributes = {
+            attributes = {
                 ATTR_CURRENT_PRICE: self.state,
                 ATTR_UNIT: self.unit,
                 ATTR_CURRENCY: self._currency,
@@ -650,6 +892,9 @@ class EnergidataserviceSensor(SensorEntity):
                 ATTR_TODAY_MIN: self._today_min,
                 ATTR_TODAY_MAX: self._today_max,
                 ATTR_TODAY_MEAN: self._today_mean,
+                ATTR_TODAY_STDDEV: self._today_stddev,
+                ATTR_TODAY_PERCENTILE_10: self._today_percentile_10,
+                ATTR_TODAY_PERCENTILE_90: self._today_percentile_90,
                 ATTR_TODAY_REMAINING_MIN: self._today_remaining_min,
                 ATTR_TODAY_REMAINING_MAX: self._today_remaining_max,
                 ATTR_TODAY_REMAINING_MEAN: self._today_remaining_mean,
@@ -661,29 +906,38 @@ class EnergidataserviceSensor(SensorEntity):
             }
 
             if not isinstance(self.predictions, type(None)):
-                self._attr_extra_state_attributes.update(
+                attributes.update(
                     {
-                        ATTR_FORECAST: self._add_raw(
-                            self.predictions, self._attr_suggested_display_precision
-                        ),
+                        ATTR_FORECAST: self._forecast_attribute(),
                         ATTR_ATTRIBUTION: f"Data sourced from {self._api.source} "
                         "and forecast from Carnot",
                     }
                 )
 
             if not isinstance(self._api.tariff_data, type(None)):
-                self._attr_extra_state_attributes.update(
+                attributes.update(
                     {
                         ATTR_NET_OPERATOR: self._config.options.get(
                             CONF_TARIFF_CHARGE_OWNER
                         ),
-                        ATTR_TARIFFS: show_with_vat(
+                        ATTR_TARIFFS: self._reuse(
+                            ATTR_TARIFFS,
                             self._api.tariff_data,
-                            self._vat,
-                            self._attr_suggested_display_precision,
+                            (
+                                self._api.tariff_version,
+                                self._vat,
+                                self._attr_suggested_display_precision,
+                            ),
+                            lambda: show_with_vat(
+                                self._api.tariff_data,
+                                self._vat,
+                                self._attr_suggested_display_precision,
+                            ),
                         ),
                     }
                 )
+
+            self._set_attributes(attributes)
         else:
             self._attr_native_value = None
             _LOGGER.debug("No data found for %s", self.region.region)
@@ -693,11 +947,20 @@ class EnergidataserviceSensor(SensorEntity):
         await super().async_added_to_hass()
         _LOGGER.debug("Added sensor '%s'", self._entity_id)
         await self.validate_data()
-        self.async_on_remove(
-            async_dispatcher_connect(
-                self._hass, UPDATE_EDS.format(self._entry_id), self.validate_data
+        # Prices, tariffs and the forecast are each sent as they arrive
+        for signal in (UPDATE_EDS, UPDATE_EDS_TARIFFS, UPDATE_EDS_FORECAST):
+            self.async_on_remove(
+                async_dispatcher_connect(
+                    self._hass,
+                    signal.format(self._entry_id),
+                    self._async_dispatched_update,
+                )
             )
-        )
+
+    async def _async_dispatched_update(self) -> None:
+        """Update the sensor on a dispatcher signal, recording the time spent."""
+        with self._api.metrics.timer("dispatch_update"):
+            await self.validate_data()
 
     @property
     def unique_id(self):
@@ -736,15 +999,10 @@ class EnergidataserviceSensor(SensorEntity):
         Returns:
             list: sorted list where today[0] is the price of hour 00.00 - 01.00.
         """
-        return (
-            [
-                round(i.price, self._attr_suggested_display_precision)
-                for i in self._api.today
-                if i
-            ]
-            if not isinstance(self._api.today, type(None))
-            else None
-        )
+        if isinstance(self._api.today, type(None)):
+            return None
+
+        return self._rounded(ATTR_TODAY, self._api.today)
 
     @property
     def tomorrow(self) -> list:
@@ -754,11 +1012,7 @@ class EnergidataserviceSensor(SensorEntity):
             list: sorted where tomorrow[0] is the price of hour 00.00 - 01.00 etc.
         """
         if self._api.tomorrow_valid:
-            return [
-                round(i.price, self._attr_suggested_display_precision)
-                for i in self._api.tomorrow
-                if i
-            ]
+            return self._rounded(ATTR_TOMORROW, self._api.tomorrow)
         else:
             return None
 
@@ -768,35 +1022,70 @@ class EnergidataserviceSensor(SensorEntity):
         if self._forecast:
             return self._api.predictions
 
-    def _filter_remaining_today(self, data) -> list:
-        """Return only current and upcoming entries for today."""
-        if not data:
-            return []
+    def _forecast_attribute(self) -> list | dict:
+        """Return the predictions within the forecast horizon.
 
-        now = dt_utils.now()
-        is_hourly = self._config.options.get(
-            CONF_RESOLUTION,
-            self._config.data.get(CONF_RESOLUTION, True),
+        The horizon counts from the first predicted hour, as the predictions
+        start where the known prices end. The predictions are a list of
+        hour/price dicts, or a start/step/prices dict in compact mode.
+        """
+        predictions = self.predictions
+        self._predictions_series = indexed(self._predictions_series, predictions)
+        end = len(predictions)
+        if self._horizon and predictions:
+            end = self._predictions_series.index_from(
+                predictions[0].time + self._horizon
+            )
+
+        if self._compact:
+            prices = self._rounded(ATTR_FORECAST, predictions)
+            compact = self._reuse(
+                "compact_forecast",
+                prices,
+                end,
+                lambda: self._predictions_series.compact(prices[:end]),
+            )
+            if compact is not None:
+                return compact
+
+        self._predictions_stats = statistics_for(self._predictions_stats, predictions)
+        raw = self._predictions_stats.raw(self._attr_suggested_display_precision)
+        if end == len(raw):
+            return raw
+
+        return self._reuse("raw_forecast", raw, end, lambda: raw[:end])
+
+    def _raw_attribute(
+        self, name: str, series: TimeSeries, stats: PriceStatistics, prices: list
+    ) -> list | dict:
+        """Return a dataset as hour/price dicts, or start/step/prices if compact."""
+        if self._compact:
+            compact = self._reuse(name, prices, None, lambda: series.compact(prices))
+            if compact is not None:
+                return compact
+
+        return stats.raw(self._attr_suggested_display_precision)
+
+    def _rounded(self, name: str, data: list) -> list:
+        """Return the rounded prices of a dataset."""
+        decimals = self._attr_suggested_display_precision
+        return self._reuse(
+            name, data, decimals, lambda: [round(i.price, decimals) for i in data if i]
         )
-        interval_length = timedelta(hours=1) if is_hourly else timedelta(minutes=15)
 
-        return [
-            entry
-            for entry in data
-            if (dt_utils.as_local(entry.time) + interval_length) > now
-        ]
+    def _reuse(self, name: str, source, params, build):
+        """Return the attribute value built from source and params.
 
-    @staticmethod
-    def _add_raw(data, decimals: int) -> list:
-        lst = []
-        for i in data:
-            ret = {
-                "hour": i.time,
-                "price": round(i.price, decimals),
-            }
-            lst.append(ret)
+        The value is only built again once source is replaced or params change,
+        so unchanged attributes are the very same objects between state writes.
+        """
+        cached = self._attributes.get(name)
+        if cached is not None and cached[0] is source and cached[1] == params:
+            return cached[2]
 
-        return lst
+        value = build()
+        self._attributes[name] = (source, params, value)
+        return value
 
     @property
     def raw_today(self):
@@ -843,185 +1132,72 @@ class EnergidataserviceSensor(SensorEntity):
         """Return mean value for tomorrow."""
         return self._tomorrow_mean
 
-    def _calculate(
-        self,
-        value=None,
-        fake_dt=datetime,
-        default_currency: str = "EUR",
-    ) -> float:
-        """Do price calculations."""
-        if value is None:
-            value = self._attr_native_value
-
-        def faker():
-            def inner(*_, **__):
-                return fake_dt or dt_utils.now()
-
-            return pass_context(inner)
-
-        # Convert currency from EUR
-        if self._currency != default_currency:
-            value = self.region.currency.convert(
-                value, to_currency=self._currency, from_currency=default_currency
-            )
-
-        tariff_value = 0
-        owner_tariff = 0
-        elafgift = 0
-        if (
-            self._api.tariff_data is not None
-            and fake_dt is not None
-            and len(self._api.tariff_data["tariffs"]) > 0
-        ):
-            try:
-                system_tariff: dict = (
-                    self._api.tariff_connector.get_dated_system_tariff(fake_dt)
-                )
-                chargeowner_tariff: dict = self._api.tariff_connector.get_dated_tariff(
-                    fake_dt
-                )
+    async def _async_localize(
+        self, data: list | None, default_currency: str, calc_for: str
+    ) -> list | None:
+        """Return data with prices localized, reusing earlier calculations.
 
-                if system_tariff:
-                    for tariff, additional_tariff in system_tariff.items():
-                        tariff_value += float(additional_tariff)
-                        if tariff == "elafgift":
-                            elafgift = float(additional_tariff)
+        A calculation is reused as long as it was made from the very same API
+        dataset with an identical fingerprint of the other inputs. Templates
+        using states or other outside data are calculated every time.
+        """
+        if data is None:
+            return None
 
-                owner_tariff = float(
-                    chargeowner_tariff[str(fake_dt.hour)] if chargeowner_tariff else 0
-                )
-                tariff_value += owner_tariff
-            except KeyError:
-                _LOGGER.warning(
-                    "Error adding tariffs for %s, no valid tariffs was found!", fake_dt
-                )
-                raise
-        elif (
-            self._api.tariff_data is not None
-            and fake_dt is not None
-            and len(self._api.tariff_data["tariffs"]) == 0
-        ):
-            _LOGGER.warning(
-                "Error adding tariffs for %s, empty tariff dataset was found!", fake_dt
+        if not self._api.cost_template.cacheable:
+            return await self._hass.async_add_executor_job(
+                self._format_list, data, default_currency, calc_for
             )
 
-        price = value / UNIT_TO_MULTIPLIER[self._price_type]
-
-        template_value = self._cost_template.async_render(
-            now=faker(),
-            current_tariff=tariff_value,
-            current_price=price,
-            el_afgift=elafgift,
-            chargeowner_tariff=owner_tariff,
+        fingerprint = (
+            self._api.tariff_version,
+            self._cost_template.template,
+            self._vat,
+            self._calculator.get_rate(default_currency),
         )
-
-        if not isinstance(template_value, int | float | type(None)):
-            try:
-                template_value = float(template_value)
-            except (TypeError, ValueError):
-                _LOGGER.exception(
-                    "Failed to convert %s %s to float",
-                    template_value,
-                    type(template_value),
+        for source, source_fingerprint, calculated in self._calculated:
+            if source is data and source_fingerprint == fingerprint:
+                _LOGGER.debug(
+                    "Inputs for %s in %s unchanged, reusing calculated prices",
+                    calc_for,
+                    self.region.region,
                 )
-                raise
-
-        if isinstance(template_value, type(None)):
-            template_value = 0
+                return calculated
 
-        try:
-            price += template_value + tariff_value
-        except Exception:
-            _LOGGER.debug(
-                "Price %s template value %s type %s dt %s tariff_value %s ",
-                price,
-                template_value,
-                type(template_value),
-                fake_dt,
-                tariff_value,
-            )
-            raise
-
-        # Add vat if selected
-        price = price * (float(1 + self._vat))
-
-        if self._cent:
-            price = price * CENT_MULTIPLIER
+        calculated = await self._hass.async_add_executor_job(
+            self._format_list, data, default_currency, calc_for
+        )
+        self._calculated = self._calculated[-(CALCULATION_CACHE_SIZE - 1) :] + [
+            (data, fingerprint, calculated)
+        ]
 
-        return price
+        return calculated
 
     def _format_list(
-        self, data, tomorrow=False, predictions=False, default_currency: str = "EUR"
-    ) -> None:
+        self, data: list, default_currency: str = "EUR", calc_for: str = "TODAY"
+    ) -> list:
         """Format data as list with prices localized."""
-        formatted_pricelist = []
-
-        if tomorrow:
-            pass
-
-        if predictions:
-            pass
-
-        _start = datetime.now().timestamp()
-        Interval = namedtuple("Interval", "price time")
-        for i in data:
-            price = self._calculate(
-                i.price,
-                fake_dt=dt_utils.as_local(i.time),
-                default_currency=default_currency,
-            )
-            formatted_pricelist.append(Interval(price, i.time))
-
-        _stop = datetime.now().timestamp()
-        _ttf = round(_stop - _start, 2)
-
-        if tomorrow:
-            _calc_for = "TOMORROW"
-            self._api.tomorrow_calculated = True
-            self._api.tomorrow = formatted_pricelist
-        elif predictions:
-            _calc_for = "PREDICTIONS"
-            self._api.predictions_calculated = True
-            self._api.predictions = formatted_pricelist
-        else:
-            _calc_for = "TODAY"
-            self._api.today_calculated = True
-            self._api.today = formatted_pricelist
+        with self._api.metrics.timer("calculate", dataset=calc_for):
+            formatted_pricelist = self._calculator.calculate(data, default_currency)
 
         _LOGGER.debug(
-            "Calculation for %s in %s took %s seconds",
-            _calc_for,
+            "Calculation for %s in %s took %.1f ms",
+            calc_for,
             self.region.region,
-            _ttf,
+            self._api.metrics.last("calculate").value,
         )
 
+        return formatted_pricelist
+
     @staticmethod
-    def _get_specific(datatype: str, data: list, decimals: int):
-        """Get specific values - ie. min, max, mean values."""
-
-        if datatype in ["MIN", "Min", "min"]:
-            if data:
-                res = min(data, key=lambda k: k.price)
-                ret = {
-                    "hour": res.time,
-                    "price": round(res.price, decimals),
-                }
+    def _get_specific(row, decimals: int) -> dict | None:
+        """Return a min or max row as an hour/price dict."""
+        if row is None:
+            return None
 
-                return ret
-            else:
-                return None
-        elif datatype in ["MAX", "Max", "max"]:
-            if data:
-                res = max(data, key=lambda k: k.price)
-                ret = {"hour": res.time, "price": round(res.price, decimals)}
+        return {"hour": row.time, "price": round(row.price, decimals)}
 
-                return ret
-            else:
-                return None
-        elif datatype in ["MEAN", "Mean", "mean"]:
-            if data:
-                return round(mean(data), decimals)
-            else:
-                return None
-        else:
-            return None
+    @staticmethod
+    def _round(value: float | None, decimals: int) -> float | None:
+        """Round value, if any."""
+        return None if value is None else round(value, decimals)
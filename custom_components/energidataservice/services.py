@@ -0,0 +1,127 @@
+"""Services for Energi Data Service."""
+
+from __future__ import annotations
+
+from datetime import datetime, timedelta
+from logging import getLogger
+
+import homeassistant.helpers.config_validation as cv
+import homeassistant.util.dt as dt_util
+import voluptuous as vol
+from homeassistant.core import (
+    HomeAssistant,
+    ServiceCall,
+    ServiceResponse,
+    SupportsResponse,
+)
+from homeassistant.exceptions import ServiceValidationError
+
+from .api import APIConnector
+from .const import (
+    ATTR_CONFIG_ENTRY,
+    ATTR_DURATION,
+    ATTR_EARLIEST_START,
+    ATTR_FIND_LAST,
+    ATTR_INCLUDE_FORECAST,
+    ATTR_LATEST_END,
+    DOMAIN,
+    SERVICE_FIND_CHEAPEST_PERIOD,
+)
+from .utils.periods import Period
+
+_LOGGER = getLogger(__name__)
+
+FIND_CHEAPEST_PERIOD_SCHEMA = vol.Schema(
+    {
+        vol.Optional(ATTR_CONFIG_ENTRY): cv.string,
+        vol.Optional(
+            ATTR_DURATION, default=timedelta(hours=1)
+        ): cv.positive_time_period,
+        vol.Optional(ATTR_EARLIEST_START): cv.datetime,
+        vol.Optional(ATTR_LATEST_END): cv.datetime,
+        vol.Optional(ATTR_INCLUDE_FORECAST, default=True): cv.boolean,
+        vol.Optional(ATTR_FIND_LAST, default=False): cv.boolean,
+    }
+)
+
+
+def _get_api(hass: HomeAssistant, entry_id: str | None) -> APIConnector:
+    """Return the API of the requested, or only, config entry."""
+    apis = {
+        key: value
+        for key, value in hass.data.get(DOMAIN, {}).items()
+        if isinstance(value, APIConnector)
+    }
+    if entry_id is None and len(apis) == 1:
+        return next(iter(apis.values()))
+
+    if entry_id not in apis:
+        raise ServiceValidationError(
+            f"A loaded {DOMAIN} config entry must be selected"
+            if entry_id is None
+            else f"Config entry {entry_id} is not a loaded {DOMAIN} entry"
+        )
+
+    return apis[entry_id]
+
+
+def _as_aware(value: datetime | None) -> datetime | None:
+    """Return value with the Home Assistant timezone if it has none."""
+    if value is None or value.tzinfo is not None:
+        return value
+
+    return value.replace(tzinfo=dt_util.get_default_time_zone())
+
+
+def _format_period(period: Period | None) -> dict | None:
+    """Return period as a service response dict."""
+    if period is None:
+        return None
+
+    return {
+        "start": period.start.isoformat(),
+        "end": period.end.isoformat(),
+        "price": period.price,
+    }
+
+
+async def async_find_cheapest_period(call: ServiceCall) -> ServiceResponse:
+    """Find the cheapest and most expensive periods in the known prices."""
+    api = _get_api(call.hass, call.data.get(ATTR_CONFIG_ENTRY))
+    duration = call.data[ATTR_DURATION]
+    earliest = _as_aware(call.data.get(ATTR_EARLIEST_START)) or dt_util.now()
+    latest = _as_aware(call.data.get(ATTR_LATEST_END))
+    find_last = call.data[ATTR_FIND_LAST]
+
+    slots = api.get_price_slots(call.data[ATTR_INCLUDE_FORECAST])
+    _LOGGER.debug(
+        "Finding periods of %s in %s slots of %s seconds",
+        duration,
+        len(slots),
+        slots.step,
+    )
+
+    return {
+        "resolution": int(slots.step // 60),
+        "cheapest": _format_period(
+            slots.cheapest_window(duration, earliest, latest, find_last)
+        ),
+        "most_expensive": _format_period(
+            slots.most_expensive_window(duration, earliest, latest, find_last)
+        ),
+        "cheapest_slots": [
+            _format_period(period)
+            for period in slots.cheapest_slots(duration, earliest, latest)
+        ],
+    }
+
+
+def async_setup_services(hass: HomeAssistant) -> None:
+    """Register the services."""
+    hass.services.async_register(
+        DOMAIN,
+        SERVICE_FIND_CHEAPEST_PERIOD,
+        async_find_cheapest_period,
+        schema=FIND_CHEAPEST_PERIOD_SCHEMA,
+        supports_response=SupportsResponse.ONLY,
+    )
@@ -1,14 +1,11 @@
-"""Dynamically load all available tariff providers."""
+"""Load all available tariff providers."""
 
 from __future__ import annotations
 
-import importlib
-from asyncio import get_running_loop
 from collections import namedtuple
-from genericpath import isdir
 from logging import getLogger
-from os import listdir
-from posixpath import dirname
+
+from ..utils.providers import async_get_provider_manifest
 
 _LOGGER = getLogger(__name__)
 
@@ -23,29 +20,20 @@ class Tariff:
         self._tariffs = []
 
     async def load_modules(self) -> None:
-        """Load available modules."""
-        loop = get_running_loop()
-        modules = await loop.run_in_executor(None, listdir, f"{dirname(__file__)}")
-        for module in sorted(modules):
-            mod_path = f"{dirname(__file__)}/{module}"
-            if (
-                isdir(mod_path)
-                and not module.endswith("__pycache__")
-                and not mod_path.endswith(".disabled")
-            ):
-                Endpoint = namedtuple(
-                    "Endpoint", "module namespace regions chargeowners"
-                )
-                _LOGGER.debug("Adding module %s", module)
-                api_ns = f".{module}"
-                mod = await self.hass.async_add_executor_job(
-                    importlib.import_module, api_ns, __name__
-                )
-                con = Endpoint(
-                    module, f".tariffs{api_ns}", mod.REGIONS, mod.CHARGEOWNERS
-                )
-
-                self._tariffs.append(con)
+        """Load available modules from the provider manifest."""
+        manifest = await async_get_provider_manifest(self.hass)
+        self._tariffs = []
+        for module, provider in manifest["tariffs"].items():
+            Endpoint = namedtuple("Endpoint", "module namespace regions chargeowners")
+            _LOGGER.debug("Adding module %s", module)
+            con = Endpoint(
+                module,
+                f".tariffs.{module}",
+                provider["regions"],
+                provider["chargeowners"],
+            )
+
+            self._tariffs.append(con)
 
     @property
     def tariff_endpoints(self) -> list:
@@ -56,12 +44,17 @@ class Tariff:
         """Get valid endpoint(s) of a specific zone."""
         endpoints = []
 
-        await self.load_modules()
+        if not self._tariffs:
+            await self.load_modules()
 
         _LOGGER.debug("Finding valid endpoints for region '%s'", region)
         for endpoint in self._tariffs:
             if region in endpoint.regions or region is None:
-                TariffEndpoint = namedtuple("Tariff", "module namespace")
-                endpoints.append(TariffEndpoint(endpoint.module, endpoint.namespace))
+                TariffEndpoint = namedtuple("Tariff", "module namespace chargeowners")
+                endpoints.append(
+                    TariffEndpoint(
+                        endpoint.module, endpoint.namespace, endpoint.chargeowners
+                    )
+                )
 
         return endpoints
@@ -2,14 +2,16 @@
 
 from __future__ import annotations
 
-from datetime import datetime
+from bisect import bisect_right
+from collections import namedtuple
+from datetime import datetime, timedelta
 from logging import getLogger
 
-from aiohttp import ClientSession
-from async_retrying_ng import RetryError, retry
+from aiohttp import ClientError, ClientResponseError, ClientSession
 from homeassistant.util import slugify as util_slugify
 
 from ...exceptions import UnknownChargeOwnerError
+from ...utils.jsonstream import async_iter_records
 from .chargeowners import CHARGEOWNERS
 from .regions import REGIONS
 
@@ -19,7 +21,120 @@ SOURCE_NAME = "Energi Data Service Tariffer"
 
 BASE_URL = "https://api.energidataservice.dk/dataset/DatahubPricelist"
 
-__all__ = ["Connector", "REGIONS", "CHARGEOWNERS"]
+__all__ = ["Connector", "REGIONS", "CHARGEOWNERS", "tariff_key"]
+
+HOURS = [str(hour) for hour in range(24)]
+PRICE_KEYS = [f"Price{hour + 1}" for hour in range(24)]
+
+# Only the rows valid from yesterday through the forecast are requested
+WINDOW_BEFORE = timedelta(days=1)
+WINDOW_AFTER = timedelta(days=9)
+
+# Rows are requested newest first, a page at a time
+PAGE_SIZE = 500
+MAX_PAGES = 10
+
+TARIFF_COLUMNS = ",".join(["ValidFrom", "ValidTo", "Note"] + PRICE_KEYS)
+SYSTEM_TARIFF_COLUMNS = "ValidFrom,ValidTo,Note,Price1"
+
+# The fields of a DatahubPricelist record used, with the dates of ValidFrom/ValidTo
+TariffRow = namedtuple("TariffRow", "valid_from valid_to note prices")
+
+
+def tariff_row(record: dict) -> TariffRow:
+    """Return the used fields of a DatahubPricelist record."""
+    valid_to = record.get("ValidTo")
+    return TariffRow(
+        record["ValidFrom"].split("T")[0],
+        valid_to.split("T")[0] if valid_to is not None else None,
+        record.get("Note"),
+        tuple(map(record.get, PRICE_KEYS)),
+    )
+
+
+def tariff_rows(dataset: list) -> list:
+    """Return rows restored from the cache, where they are stored as lists."""
+    return [
+        TariffRow(valid_from, valid_to, note, tuple(prices))
+        for valid_from, valid_to, note, prices in dataset
+    ]
+
+
+def tariff_key(chargeowner: str) -> tuple:
+    """Return the GLN and chargetype codes identifying the tariffs of chargeowner.
+
+    Entries with the same key share their tariffs.
+    """
+    try:
+        owner = CHARGEOWNERS[chargeowner]
+    except KeyError:
+        raise UnknownChargeOwnerError(chargeowner) from None
+
+    return (owner["gln"], tuple(owner["type"]), tuple(owner["chargetype"]))
+
+
+def sum_hourly_tariffs(entries: list) -> dict:
+    """Sum the hourly prices of all entries valid on the same date."""
+    tariff_data = {}
+    for entry in entries:
+        baseprice = entry.prices[0] or 0
+        for hour, val in zip(HOURS, entry.prices):
+            current_val = val if val is not None else baseprice
+            tariff_data[hour] = tariff_data.get(hour, 0) + current_val
+
+    return tariff_data
+
+
+def map_system_tariffs(entries: list) -> dict:
+    """Map system tariffs valid on the same date by their slugified note."""
+    return {util_slugify(entry.note): float(entry.prices[0]) for entry in entries}
+
+
+class ValidityIndex:
+    """Lookup table for DatahubPricelist rows by the date they are valid on.
+
+    The validity periods of all rows are split into consecutive segments in which
+    the same rows are valid. A lookup is a bisect on the segment start dates, and
+    the combined value of each segment is only calculated once.
+    """
+
+    def __init__(self, entries: list, combine) -> None:
+        """Build the index."""
+        self._combine = combine
+        self._starts = []
+        self._active = []
+        self._values = {}
+
+        starts_at = {}
+        ends_at = {}
+        for idx, entry in enumerate(entries):
+            valid_from = entry.valid_from
+            valid_to = entry.valid_to
+            if valid_to is not None and valid_to <= valid_from:
+                continue
+
+            starts_at.setdefault(valid_from, []).append(idx)
+            if valid_to is not None:
+                ends_at.setdefault(valid_to, []).append(idx)
+
+        active = set()
+        for boundary in sorted(starts_at.keys() | ends_at.keys()):
+            active.difference_update(ends_at.get(boundary, []))
+            active.update(starts_at.get(boundary, []))
+            self._starts.append(boundary)
+            # Keep the order of the API response, as that is the order we sum in
+            self._active.append(tuple(entries[idx] for idx in sorted(active)))
+
+    def get(self, check_date: str):
+        """Return the combined value of all rows valid on check_date."""
+        segment = bisect_right(self._starts, check_date) - 1
+        if segment < 0 or not self._active[segment]:
+            return None
+
+        if segment not in self._values:
+            self._values[segment] = self._combine(self._active[segment])
+
+        return self._values[segment]
 
 
 class Connector:
@@ -34,8 +149,10 @@ class Connector:
         self._chargeowner = chargeowner
         self._tariffs = {}
         self._additional_tariff = {}
-        self._all_tariffs = {}
-        self._all_additional_tariffs = {}
+        self._all_tariffs = []
+        self._all_additional_tariffs = []
+        self._tariff_index = ValidityIndex([], sum_hourly_tariffs)
+        self._system_tariff_index = ValidityIndex([], map_system_tariffs)
         self.status = 418
         self._version = version
 
@@ -52,6 +169,36 @@ class Connector:
 
         return tariffs
 
+    @property
+    def raw(self) -> dict:
+        """Return the raw datasets as fetched from the API."""
+        return {
+            "tariffs": self._all_tariffs,
+            "additional_tariffs": self._all_additional_tariffs,
+        }
+
+    @property
+    def system_dataset(self) -> tuple:
+        """Return the system tariff rows and their lookup table."""
+        return (self._all_additional_tariffs, self._system_tariff_index)
+
+    def use_system_dataset(self, dataset: tuple) -> None:
+        """Use system tariffs fetched by another connector."""
+        self._all_additional_tariffs, self._system_tariff_index = dataset
+        self._additional_tariff = dict(self.get_dated_system_tariff(datetime.utcnow()))
+
+    def restore(self, all_tariffs: list, all_additional_tariffs: list) -> dict:
+        """Populate the connector from previously fetched datasets."""
+        self._set_tariffs(tariff_rows(all_tariffs))
+        self._set_system_tariffs(tariff_rows(all_additional_tariffs))
+
+        check_date = datetime.utcnow()
+        self._tariffs = dict(self.get_dated_tariff(check_date))
+        self._additional_tariff = dict(self.get_dated_system_tariff(check_date))
+        self.status = 200
+
+        return self.tariffs
+
     @staticmethod
     def _header(version) -> dict:
         """Create default request header."""
@@ -61,23 +208,25 @@ class Connector:
         }
         return data
 
-    async def async_get_tariffs(self):
-        """Get tariff from Eloverblik API."""
-        await self.async_get_system_tariffs()
+    async def async_get_tariffs(self, system: bool = True):
+        """Get tariff from Eloverblik API.
+
+        If system is False, the system tariffs are left as they are, ie. when
+        they are shared by use_system_dataset.
+        """
+        if system:
+            await self.async_get_system_tariffs()
 
         try:
             chargeowner = CHARGEOWNERS[self._chargeowner]
 
-            limit = "limit=500"
             objfilter = 'filter=%7B"chargetypecode": {},"gln_number": ["{}"],"chargetype": {}%7D'.format(  # pylint: disable=consider-using-f-string
                 str(chargeowner["type"]).replace("'", '"'),
                 chargeowner["gln"],
                 str(chargeowner["chargetype"]).replace("'", '"'),
             )
-            sort = "sort=ValidFrom desc"
-
-            query = f"{objfilter}&{sort}&{limit}"
-            resp = await self.async_call_api(query)
+            query = f"{objfilter}&columns={TARIFF_COLUMNS}"
+            resp = await self.async_fetch_window(query)
 
             if len(resp) == 0:
                 _LOGGER.warning(
@@ -86,31 +235,9 @@ class Connector:
                 return self.tariffs
             else:
                 # We got data from the DataHub - update the dataset
+                self._set_tariffs(resp)
 
-                self._all_tariffs = resp
-
-            check_date = (datetime.utcnow()).strftime("%Y-%m-%d")
-
-            tariff_data = {}
-            for entry in self._all_tariffs:
-                if self.__entry_in_range(entry, check_date):
-                    _LOGGER.debug("Found possible dataset: %s", entry)
-                    baseprice = 0
-                    for key, val in entry.items():
-                        if key == "Price1":
-                            baseprice = val
-                        if "Price" in key:
-                            hour = str(int("".join(filter(str.isdigit, key))) - 1)
-
-                            current_val = val if val is not None else baseprice
-
-                            if len(tariff_data) == 24:
-                                current_val += tariff_data[hour]
-
-                            tariff_data.update({hour: current_val})
-
-                    if len(tariff_data) == 24:
-                        self._tariffs.update(tariff_data)
+            self._tariffs.update(self.get_dated_tariff(datetime.utcnow()))
 
             return self.tariffs
         except KeyError:
@@ -120,90 +247,108 @@ class Connector:
             #     self._chargeowner,
             # )
             raise UnknownChargeOwnerError(self._chargeowner) from None
-        except RetryError:
-            _LOGGER.error("Retry attempts exceeded for tariffs request.")
-            return self.tariffs
-
-    def get_dated_tariff(self, date: datetime) -> dict:
-        """Get tariff for this specific date."""
-        check_date = date.strftime("%Y-%m-%d")
 
-        tariff_data = {}
-        for entry in self._all_tariffs:
-            if self.__entry_in_range(entry, check_date):
-                baseprice = 0
-                for key, val in entry.items():
-                    if key == "Price1":
-                        baseprice = val
-                    if "Price" in key:
-                        hour = str(int("".join(filter(str.isdigit, key))) - 1)
+    def _set_tariffs(self, dataset: list) -> None:
+        """Store the charge owner tariffs and build the lookup table."""
+        self._all_tariffs = dataset
+        self._tariff_index = ValidityIndex(dataset, sum_hourly_tariffs)
 
-                        current_val = val if val is not None else baseprice
+    def _set_system_tariffs(self, dataset: list) -> None:
+        """Store the system tariffs and build the lookup table."""
+        self._all_additional_tariffs = dataset
+        self._system_tariff_index = ValidityIndex(dataset, map_system_tariffs)
 
-                        if len(tariff_data) == 24:
-                            current_val += tariff_data[hour]
+    def get_dated_tariff(self, date: datetime) -> dict:
+        """Get tariff for this specific date.
 
-                        tariff_data.update({hour: current_val})
-
-        if len(tariff_data) == 24:
-            return tariff_data
-        else:
-            return {}
+        The returned dict is shared between lookups and must not be modified.
+        """
+        return self._tariff_index.get(date.strftime("%Y-%m-%d")) or {}
 
     def get_dated_system_tariff(self, date: datetime) -> dict:
-        """Get system tariffs for this specific date."""
-        check_date = date.strftime("%Y-%m-%d")
-        tariff_data = {}
-        for entry in self._all_additional_tariffs:
-            if self.__entry_in_range(entry, check_date):
-                if entry["Note"] not in tariff_data:
-                    tariff_data.update(
-                        {util_slugify(entry["Note"]): float(entry["Price1"])}
-                    )
-
-        return tariff_data
+        """Get system tariffs for this specific date.
+
+        The returned dict is shared between lookups and must not be modified.
+        """
+        return self._system_tariff_index.get(date.strftime("%Y-%m-%d")) or {}
 
     async def async_get_system_tariffs(self) -> dict:
         """Get additional system tariffs defined by the Danish government."""
         search_filter = '{"Note":["Elafgift","Systemtarif","Transmissions nettarif"]}'
-        limit = 500
 
-        query = f"filter={search_filter}&limit={limit}"
+        query = f"filter={search_filter}&columns={SYSTEM_TARIFF_COLUMNS}"
 
-        try:
-            dataset = await self.async_call_api(query)
+        dataset = await self.async_fetch_window(query)
 
-            if len(dataset) == 0:
-                _LOGGER.warning(
-                    "Could not fetch tariff data from Energi Data Service DataHub!"
-                )
-                return {}
-            else:
-                self._all_additional_tariffs = dataset
-
-            check_date = (datetime.utcnow()).strftime("%Y-%m-%d")
-            tariff_data = {}
-            for entry in self._all_additional_tariffs:
-                if self.__entry_in_range(entry, check_date):
-                    if entry["Note"] not in tariff_data:
-                        tariff_data.update(
-                            {util_slugify(entry["Note"]): float(entry["Price1"])}
-                        )
-
-            self._additional_tariff = tariff_data
-        except RetryError:
-            _LOGGER.error("Retry attempts exceeded for retrieving system tariffs.")
-
-    @retry(attempts=10, delay=10, max_delay=3600, backoff=2)
-    async def async_call_api(self, query: str) -> dict:
-        """Make the API calls."""
+        if len(dataset) == 0:
+            _LOGGER.warning(
+                "Could not fetch tariff data from Energi Data Service DataHub!"
+            )
+            return {}
+        else:
+            self._set_system_tariffs(dataset)
+
+        self._additional_tariff = dict(self.get_dated_system_tariff(datetime.utcnow()))
+
+    async def async_fetch_window(self, query: str, now: datetime | None = None) -> list:
+        """Fetch the rows of query valid within the tariff window.
+
+        The API only filters on the start of the validity, so rows starting
+        before the end of the window are requested newest first, a page at a
+        time, keeping the rows valid in the window. Every page is read, as a
+        row without an end may be valid however long ago it started. Nothing is
+        returned if any page fails, so a partial window never replaces the
+        tariffs.
+
+        As ValidTo can't be filtered on, the whole history of the query up to
+        the end of the window is still transferred. Only the pruned columns and
+        the rows kept reduce the size of the response and the memory used.
+        """
+        now = now or datetime.utcnow()
+        start = (now - WINDOW_BEFORE).strftime("%Y-%m-%d")
+        end = (now + WINDOW_AFTER).strftime("%Y-%m-%d")
+
+        rows = []
+        for page in range(MAX_PAGES):
+            page_rows = await self.async_call_api(
+                f"{query}&end={end}&sort=ValidFrom desc"
+                f"&offset={page * PAGE_SIZE}&limit={PAGE_SIZE}"
+            )
+            if self.status != 200:
+                return []
+
+            rows.extend(
+                row for row in page_rows if row.valid_to is None or row.valid_to > start
+            )
+            if len(page_rows) < PAGE_SIZE:
+                break
+        else:
+            _LOGGER.warning(
+                "Tariff query returned more than %s rows, older rows were skipped",
+                MAX_PAGES * PAGE_SIZE,
+            )
+
+        _LOGGER.debug(
+            "Fetched %s tariff rows valid from %s to %s", len(rows), start, end
+        )
+        return rows
+
+    async def async_call_api(self, query: str) -> list:
+        """Make the API calls, returning the records as tariff rows.
+
+        Each call is a single attempt. Failures are reported by status, 503 if
+        the API couldn't be reached, and retried by the tariff store.
+        """
         try:
             headers = self._header(self._version)
             resp = await self.client.get(f"{BASE_URL}?{query}", headers=headers)
             self.status = resp.status
             if resp.status == 200:
-                res = await resp.json()
-                return res["records"]
+                # Rows are reduced as they are read, the response is never held whole
+                return [
+                    tariff_row(record)
+                    async for record in async_iter_records(resp.content)
+                ]
 
             if resp.status in (400, 403, 411, 429):
                 _LOGGER.warning(
@@ -211,17 +356,14 @@ class Connector:
                     resp.status,
                     query,
                 )
-                return {}
+                return []
 
             resp.raise_for_status()
             _LOGGER.error("API returned error %s", str(resp.status))
-            return {}
-        except Exception as exc:
-            _LOGGER.error("Error during API request: %s", exc)
-            raise
-
-    def __entry_in_range(self, entry, check_date) -> bool:
-        """Check if an entry is witin the date range."""
-        return (entry["ValidFrom"].split("T"))[0] <= check_date and (
-            entry["ValidTo"] is None or (entry["ValidTo"].split("T"))[0] > check_date
-        )
+            return []
+        except (ClientError, TimeoutError, ValueError) as exc:
+            _LOGGER.warning("Error during tariff API request: %s", exc)
+            if not isinstance(exc, ClientResponseError):
+                # Unreachable, or the response broke off
+                self.status = 503
+            return []
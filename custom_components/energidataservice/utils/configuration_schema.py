@@ -14,6 +14,7 @@ from ..const import (
     ATTR_RESOLUTION_15MIN,
     ATTR_RESOLUTION_60MIN,
     CONF_AREA,
+    CONF_COMPACT_ATTRIBUTES,
     CONF_COUNTRY,
     CONF_CURRENCY_IN_CENT,
     CONF_DECIMALS,
@@ -21,6 +22,8 @@ from ..const import (
     CONF_ENABLE_TARIFFS,
     CONF_FIXED_PRICE_VALUE,
     CONF_FIXED_PRICE_VAT,
+    CONF_FORECAST_HORIZON,
+    CONF_MIN_WRITE_INTERVAL,
     CONF_PRICETYPE,
     CONF_RESOLUTION,
     CONF_TARIFF_CHARGE_OWNER,
@@ -148,6 +151,9 @@ def energidataservice_config_option_info_schema(options: ConfigEntry = {}) -> di
                 if CONF_RESOLUTION in options
                 else ATTR_RESOLUTION_60MIN
             ),
+            CONF_COMPACT_ATTRIBUTES: options.get(CONF_COMPACT_ATTRIBUTES) or False,
+            CONF_FORECAST_HORIZON: options.get(CONF_FORECAST_HORIZON) or 0,
+            CONF_MIN_WRITE_INTERVAL: options.get(CONF_MIN_WRITE_INTERVAL) or 0,
         }
 
         schema = {
@@ -170,6 +176,17 @@ def energidataservice_config_option_info_schema(options: ConfigEntry = {}) -> di
                 CONF_PRICETYPE, default=info_options.get(CONF_PRICETYPE)
             ): vol.In(list(UNIT_TO_MULTIPLIER.keys())),
             vol.Optional(CONF_TEMPLATE, default=info_options.get(CONF_TEMPLATE)): str,
+            vol.Required(
+                CONF_COMPACT_ATTRIBUTES,
+                default=info_options.get(CONF_COMPACT_ATTRIBUTES),
+            ): bool,
+            vol.Optional(
+                CONF_FORECAST_HORIZON, default=info_options.get(CONF_FORECAST_HORIZON)
+            ): vol.All(vol.Coerce(int), vol.Range(min=0)),
+            vol.Optional(
+                CONF_MIN_WRITE_INTERVAL,
+                default=info_options.get(CONF_MIN_WRITE_INTERVAL),
+            ): vol.All(vol.Coerce(int), vol.Range(min=0)),
         }
 
     _LOGGER.debug("Schema: %s", schema)
@@ -0,0 +1,352 @@
+"""Analysis and batch rendering of the user defined cost template."""
+
+from __future__ import annotations
+
+import logging
+from collections import OrderedDict
+
+from homeassistant.helpers.template import Template
+from homeassistant.util import dt as dt_utils
+from jinja2 import Environment, TemplateError, meta, nodes, pass_context
+
+_LOGGER = logging.getLogger(__name__)
+
+# Variables passed to the cost template, in the order used for render keys
+TEMPLATE_VARIABLES = (
+    "current_price",
+    "current_tariff",
+    "el_afgift",
+    "chargeowner_tariff",
+)
+
+# Globals that doesn't depend on anything but their arguments
+PURE_GLOBALS = frozenset(
+    {"abs", "bool", "float", "int", "max", "min", "range", "round", "timedelta"}
+)
+
+# Filters and tests that doesn't depend on anything but their arguments. Home
+# Assistant also registers states, is_state, state_attr and friends as these.
+PURE_FILTERS = frozenset(
+    {
+        "abs",
+        "bool",
+        "default",
+        "d",
+        "float",
+        "int",
+        "lower",
+        "max",
+        "min",
+        "multiply",
+        "round",
+        "string",
+        "sum",
+        "upper",
+    }
+)
+PURE_TESTS = frozenset(
+    {
+        "defined",
+        "divisibleby",
+        "eq",
+        "even",
+        "false",
+        "ge",
+        "gt",
+        "in",
+        "le",
+        "lt",
+        "ne",
+        "none",
+        "number",
+        "odd",
+        "string",
+        "true",
+        "undefined",
+    }
+)
+
+RENDER_CACHE_SIZE = 1024
+
+_PARSER = Environment(extensions=["jinja2.ext.loopcontrols", "jinja2.ext.do"])
+
+
+def _faker(fake_dt):
+    """Return a now() replacement returning the datetime being calculated."""
+
+    def inner(*_, **__):
+        return fake_dt or dt_utils.now()
+
+    return pass_context(inner)
+
+
+def _linear(node) -> tuple | None:
+    """Return (constant, coefficients) if node is affine in the template variables."""
+    if isinstance(node, nodes.Const):
+        if isinstance(node.value, int | float) and not isinstance(node.value, bool):
+            return node.value, {}
+        return None
+
+    if isinstance(node, nodes.Name):
+        if node.name in TEMPLATE_VARIABLES:
+            return 0, {node.name: 1}
+        return None
+
+    if isinstance(node, nodes.Pos):
+        return _linear(node.node)
+
+    if isinstance(node, nodes.Neg):
+        res = _linear(node.node)
+        if res is None:
+            return None
+        return -res[0], {name: -coef for name, coef in res[1].items()}
+
+    # float() is the identity for the numbers we pass to the template
+    if isinstance(node, nodes.Filter) and node.name == "float" and node.node:
+        return _linear(node.node)
+
+    if (
+        isinstance(node, nodes.Call)
+        and isinstance(node.node, nodes.Name)
+        and node.node.name == "float"
+        and len(node.args) in (1, 2)
+        and not node.kwargs
+    ):
+        return _linear(node.args[0])
+
+    if isinstance(node, nodes.Add | nodes.Sub):
+        left = _linear(node.left)
+        right = _linear(node.right)
+        if left is None or right is None:
+            return None
+
+        sign = 1 if isinstance(node, nodes.Add) else -1
+        coefficients = dict(left[1])
+        for name, coef in right[1].items():
+            coefficients[name] = coefficients.get(name, 0) + sign * coef
+        return left[0] + sign * right[0], coefficients
+
+    if isinstance(node, nodes.Mul):
+        left = _linear(node.left)
+        right = _linear(node.right)
+        if left is None or right is None or (left[1] and right[1]):
+            return None
+
+        if left[1]:
+            left, right = right, left
+        factor = left[0]
+        return factor * right[0], {
+            name: factor * coef for name, coef in right[1].items()
+        }
+
+    if isinstance(node, nodes.Div):
+        left = _linear(node.left)
+        right = _linear(node.right)
+        if left is None or right is None or right[1] or right[0] == 0:
+            return None
+
+        divisor = right[0]
+        return left[0] / divisor, {
+            name: coef / divisor for name, coef in left[1].items()
+        }
+
+    return None
+
+
+class CostTemplate:
+    """A cost template along with what it depends on."""
+
+    def __init__(self, template: Template, cache_size: int = RENDER_CACHE_SIZE) -> None:
+        """Analyse the template."""
+        self.template = template
+        self._cache_size = cache_size
+        self._cache = OrderedDict()
+        self.hits = 0
+        self.misses = 0
+
+        # None if the template couldn't be analysed
+        self.variables: frozenset | None = None
+        self.filters: frozenset = frozenset()
+        self.tests: frozenset = frozenset()
+        self.uses_now = True
+        self.now_hour_only = False
+
+        # Set if the template is a pure affine function of the template variables
+        self.constant: float | None = None
+        self.coefficients: dict = {}
+
+        self._analyse()
+
+    def _analyse(self) -> None:
+        """Find the variables used and check if the template is affine."""
+        # Home Assistant's own filters and tests are unknown to the plain Jinja
+        # environment, so templates using them are rendered for every interval
+        try:
+            ast = _PARSER.parse(self.template.template)
+            variables = meta.find_undeclared_variables(ast)
+        except TemplateError:
+            _LOGGER.debug("Unable to analyse cost template, rendering every interval")
+            return
+
+        self.variables = frozenset(variables)
+        self.filters = frozenset(node.name for node in ast.find_all(nodes.Filter))
+        self.tests = frozenset(node.name for node in ast.find_all(nodes.Test))
+        self.uses_now = "now" in self.variables
+        if self.uses_now:
+            now_calls = [
+                name for name in ast.find_all(nodes.Name) if name.name == "now"
+            ]
+            now_hours = [
+                attr
+                for attr in ast.find_all(nodes.Getattr)
+                if attr.attr == "hour"
+                and isinstance(attr.node, nodes.Call)
+                and isinstance(attr.node.node, nodes.Name)
+                and attr.node.node.name == "now"
+            ]
+            self.now_hour_only = len(now_calls) == len(now_hours)
+
+        expressions = [
+            expr
+            for output in ast.body
+            if isinstance(output, nodes.Output)
+            for expr in output.nodes
+            if not (isinstance(expr, nodes.TemplateData) and not expr.data.strip())
+        ]
+        if len(ast.body) != 1 or len(expressions) != 1:
+            return
+
+        res = _linear(expressions[0])
+        if res is not None:
+            self.constant = res[0]
+            self.coefficients = {name: coef for name, coef in res[1].items() if coef}
+            _LOGGER.debug(
+                "Cost template is affine: %s + %s", self.constant, self.coefficients
+            )
+
+    @property
+    def cacheable(self) -> bool:
+        """Return True if rendered values can be reused between refreshes.
+
+        This is only the case when the output depends on nothing but the inputs
+        we pass, ie. no states or other outside data is used.
+        """
+        if self.variables is None:
+            return False
+
+        return not (
+            self.variables - set(TEMPLATE_VARIABLES) - {"now"} - PURE_GLOBALS
+            or self.filters - PURE_FILTERS
+            or self.tests - PURE_TESTS
+        )
+
+    @property
+    def cache_info(self) -> dict:
+        """Return render cache statistics."""
+        return {
+            "size": len(self._cache),
+            "max_size": self._cache_size,
+            "hits": self.hits,
+            "misses": self.misses,
+        }
+
+    @property
+    def diagnostics(self) -> dict:
+        """Return the analysis and render cache statistics."""
+        return {
+            "template": self.template.template,
+            "variables": sorted(self.variables) if self.variables else self.variables,
+            "affine": self.is_affine,
+            "cacheable": self.cacheable,
+            "render_cache": self.cache_info,
+        }
+
+    @property
+    def is_affine(self) -> bool:
+        """Return True if the template can be calculated without rendering."""
+        return self.constant is not None
+
+    def render_key(self, row: tuple) -> tuple:
+        """Return the inputs of row that the template output depends on."""
+        if self.variables is None:
+            return row
+
+        fake_dt, *values = row
+        key = tuple(
+            value
+            for name, value in zip(TEMPLATE_VARIABLES, values)
+            if name in self.variables
+        )
+        if self.uses_now:
+            key = (fake_dt.hour if self.now_hour_only else fake_dt,) + key
+
+        return key
+
+    def render(self, row: tuple) -> float:
+        """Render the template for a single row."""
+        fake_dt, price, tariff_value, elafgift, owner_tariff = row
+        template_value = self.template.async_render(
+            now=_faker(fake_dt),
+            current_tariff=tariff_value,
+            current_price=price,
+            el_afgift=elafgift,
+            chargeowner_tariff=owner_tariff,
+        )
+
+        if not isinstance(template_value, int | float | type(None)):
+            try:
+                template_value = float(template_value)
+            except (TypeError, ValueError):
+                _LOGGER.exception(
+                    "Failed to convert %s %s to float",
+                    template_value,
+                    type(template_value),
+                )
+                raise
+
+        if isinstance(template_value, type(None)):
+            template_value = 0
+
+        return template_value
+
+    def render_all(self, rows: list) -> list:
+        """Return the template value for each row.
+
+        Each row is a tuple of (time, current_price, current_tariff, el_afgift,
+        chargeowner_tariff).
+        """
+        if self.is_affine:
+            terms = [
+                (TEMPLATE_VARIABLES.index(name) + 1, coef)
+                for name, coef in self.coefficients.items()
+            ]
+            if not terms:
+                return [self.constant] * len(rows)
+
+            return [
+                self.constant + sum(coef * row[idx] for idx, coef in terms)
+                for row in rows
+            ]
+
+        # Templates using outside data can only reuse values within this batch
+        cache = self._cache if self.cacheable else OrderedDict()
+        misses = self.misses
+        values = []
+        for row in rows:
+            key = self.render_key(row)
+            if key in cache:
+                self.hits += 1
+                cache.move_to_end(key)
+            else:
+                self.misses += 1
+                cache[key] = self.render(row)
+                if len(cache) > self._cache_size:
+                    cache.popitem(last=False)
+            values.append(cache[key])
+
+        _LOGGER.debug(
+            "Rendered cost template %s times for %s rows",
+            self.misses - misses,
+            len(rows),
+        )
+        return values
@@ -0,0 +1,92 @@
+"""Persistent cache of the raw datasets fetched from the APIs."""
+
+from __future__ import annotations
+
+import asyncio
+from collections import namedtuple
+from datetime import datetime
+from logging import getLogger
+from typing import Any
+
+import homeassistant.util.dt as dt_util
+from homeassistant.core import HomeAssistant
+from homeassistant.helpers.storage import Store
+
+from ..const import DATA_CACHE, DOMAIN
+
+_LOGGER = getLogger(__name__)
+
+STORAGE_KEY = f"{DOMAIN}.cache"
+STORAGE_VERSION = 2
+SAVE_DELAY = 10
+
+CachedData = namedtuple("CachedData", "data fetched")
+
+
+class _CacheStore(Store):
+    """Store dropping the cached data when the storage version changes."""
+
+    async def _async_migrate_func(
+        self, old_major_version: int, old_minor_version: int, old_data: dict
+    ) -> dict:
+        """Discard data written by another version of the cache."""
+        _LOGGER.debug(
+            "Discarding cached data from storage version %s.%s",
+            old_major_version,
+            old_minor_version,
+        )
+        return {}
+
+
+class DataCache:
+    """Hass-wide cache of raw connector results with fetch timestamps."""
+
+    def __init__(self, hass: HomeAssistant) -> None:
+        """Initialize the cache."""
+        self.hass = hass
+        self._store = _CacheStore(hass, STORAGE_VERSION, STORAGE_KEY)
+        self._data: dict[str, dict] = {}
+        self._load_task: asyncio.Task | None = None
+
+    async def async_load(self) -> None:
+        """Load the cache from disk, only once per Home Assistant run."""
+        if self._load_task is None:
+            self._load_task = self.hass.async_create_task(self._async_load())
+
+        await self._load_task
+
+    async def _async_load(self) -> None:
+        """Read the stored data."""
+        try:
+            self._data = await self._store.async_load() or {}
+        except Exception as exc:  # pylint: disable=broad-except
+            _LOGGER.warning("Could not load cached datasets: %s", exc)
+            self._data = {}
+
+        _LOGGER.debug("Loaded %s cached datasets", len(self._data))
+
+    def get(self, key: str) -> CachedData | None:
+        """Return cached data and its fetch time, if any."""
+        item = self._data.get(key)
+        if item is None:
+            return None
+
+        return CachedData(item["data"], dt_util.parse_datetime(item["fetched"]))
+
+    def set(self, key: str, data: Any, fetched: datetime) -> None:
+        """Update a cached dataset and schedule writing it to disk."""
+        stamp = fetched.isoformat()
+        if key in self._data and self._data[key]["fetched"] == stamp:
+            return
+
+        self._data[key] = {"fetched": stamp, "data": data}
+        self._store.async_delay_save(lambda: self._data, SAVE_DELAY)
+
+
+def async_get_data_cache(hass: HomeAssistant) -> DataCache:
+    """Return the shared data cache, creating it if needed."""
+    domain_data = hass.data.setdefault(DOMAIN, {})
+    if DATA_CACHE not in domain_data:
+        domain_data[DATA_CACHE] = DataCache(hass)
+
+    return domain_data[DATA_CACHE]
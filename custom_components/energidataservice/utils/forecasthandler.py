@@ -3,6 +3,7 @@
 from __future__ import annotations
 
 import logging
+from datetime import datetime, timedelta
 
 from ..forecasts import Forecast
 
@@ -21,3 +22,30 @@ class ForecastHandler:
         _LOGGER.debug("Forecast connectors: %s", connectors)
 
         return connectors
+
+    @staticmethod
+    def filter_predictions(
+        predictions: list, tomorrow_valid: bool, now: datetime | None = None
+    ) -> list:
+        """Return the predictions from tomorrow and on.
+
+        Tomorrows predictions are left out as well if the actual prices are known.
+        """
+        now = now or datetime.now()
+        tomorrow = now + timedelta(days=1)
+
+        predictions = [
+            value
+            for value in predictions
+            if value.time.day >= tomorrow.day
+            or value.time.month > tomorrow.month
+            or value.time.year > now.year
+        ]
+
+        if tomorrow_valid:
+            # Remove tomorrows predictions, as we have the actual values
+            predictions = [
+                value for value in predictions if value.time.day != tomorrow.day
+            ]
+
+        return predictions
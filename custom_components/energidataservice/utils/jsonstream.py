@@ -0,0 +1,123 @@
+"""Incremental parsing of the records array of large API responses."""
+
+from __future__ import annotations
+
+import codecs
+import json
+from collections.abc import AsyncIterator
+
+CHUNK_SIZE = 16384
+WHITESPACE = " \t\n\r"
+NUMBER_CHARS = "0123456789+-.eE"
+
+_DECODER = json.JSONDecoder()
+
+
+class _Reader:
+    """Text buffer over a byte stream, decoding one JSON value at a time.
+
+    Only the part of the response that hasn't been decoded yet is buffered, so
+    memory use is bounded by the chunk size and the largest single value.
+    """
+
+    def __init__(self, content, chunk_size: int) -> None:
+        """Initialize the reader."""
+        self._content = content
+        self._chunk_size = chunk_size
+        self._decoder = codecs.getincrementaldecoder("utf-8")()
+        self.text = ""
+        self.pos = 0
+        self.eof = False
+
+    async def fill(self) -> bool:
+        """Append the next chunk to the buffer, returning False at the end."""
+        if self.eof:
+            return False
+
+        chunk = await self._content.read(self._chunk_size)
+        self.eof = not chunk
+        self.text = self.text[self.pos :] + self._decoder.decode(chunk, self.eof)
+        self.pos = 0
+        return True
+
+    async def peek(self) -> str:
+        """Skip whitespace and return the next character, or "" at the end."""
+        while True:
+            while self.pos < len(self.text) and self.text[self.pos] in WHITESPACE:
+                self.pos += 1
+
+            if self.pos < len(self.text):
+                return self.text[self.pos]
+
+            if not await self.fill():
+                return ""
+
+    async def expect(self, char: str) -> None:
+        """Consume char, which must be the next character."""
+        found = await self.peek()
+        if found != char:
+            raise ValueError(f"Expected '{char}' but found '{found}' in response")
+
+        self.pos += 1
+
+    async def value(self):
+        """Decode the next value, reading more chunks until it's complete."""
+        await self.peek()
+        while True:
+            try:
+                value, end = _DECODER.raw_decode(self.text, self.pos)
+                # A number at the end of the buffer may continue in the next chunk,
+                # also when only its fraction or exponent sign has been read
+                if self.eof or self.text[end:].lstrip(NUMBER_CHARS):
+                    self.pos = end
+                    return value
+            except json.JSONDecodeError:
+                if self.eof:
+                    raise
+
+            await self.fill()
+
+
+async def async_iter_records(
+    content, key: str = "records", chunk_size: int = CHUNK_SIZE
+) -> AsyncIterator:
+    """Yield the items of the key array of a JSON object as they are read.
+
+    content is anything with an async read(n), like aiohttp's response.content.
+    Other members of the object are decoded and discarded.
+    """
+    reader = _Reader(content, chunk_size)
+    await reader.expect("{")
+    while True:
+        char = await reader.peek()
+        if char == "}":
+            return
+
+        if char == ",":
+            reader.pos += 1
+            continue
+
+        if char == "":
+            raise ValueError("Response ended inside the object")
+
+        name = await reader.value()
+        await reader.expect(":")
+        if name != key:
+            await reader.value()
+            continue
+
+        await reader.expect("[")
+        while True:
+            char = await reader.peek()
+            if char == "]":
+                reader.pos += 1
+                break
+
+            if char == ",":
+                reader.pos += 1
+                continue
+
+            if char == "":
+                raise ValueError("Response ended inside the records")
+
+            yield await reader.value()
@@ -0,0 +1,143 @@
+"""Lightweight per entry metrics of the update and calculation stages."""
+
+from __future__ import annotations
+
+from collections import deque, namedtuple
+from contextlib import contextmanager
+from time import perf_counter, time
+from urllib.parse import urlsplit
+
+# Number of samples kept per metric
+METRICS_SIZE = 50
+
+Sample = namedtuple("Sample", "time value extra")
+
+
+class Metrics:
+    """Ring buffers of timings and sizes, keyed by metric name."""
+
+    def __init__(self, size: int = METRICS_SIZE) -> None:
+        """Initialize the buffers."""
+        self._size = size
+        self._samples: dict[str, deque] = {}
+        self.counters: dict[str, int] = {}
+
+    def record(self, name: str, value: float, **extra) -> None:
+        """Add a sample to the metric."""
+        samples = self._samples.get(name)
+        if samples is None:
+            samples = self._samples[name] = deque(maxlen=self._size)
+
+        samples.append(Sample(time(), value, extra))
+
+    def count(self, name: str, increment: int = 1) -> None:
+        """Increment a counter."""
+        self.counters[name] = self.counters.get(name, 0) + increment
+
+    @contextmanager
+    def timer(self, name: str, **extra):
+        """Record the time spent in the block in milliseconds.
+
+        Extra values to store with the sample can be added to the yielded dict.
+        """
+        start = perf_counter()
+        try:
+            yield extra
+        finally:
+            self.record(name, (perf_counter() - start) * 1000, **extra)
+
+    def last(self, name: str) -> Sample | None:
+        """Return the latest sample of the metric."""
+        samples = self._samples.get(name)
+        return samples[-1] if samples else None
+
+    def summary(self, name: str) -> dict | None:
+        """Return count, last, mean and max of the samples kept for the metric."""
+        samples = self._samples.get(name)
+        if not samples:
+            return None
+
+        values = [sample.value for sample in samples]
+        return {
+            "count": len(values),
+            "last": round(values[-1], 3),
+            "mean": round(sum(values) / len(values), 3),
+            "max": round(max(values), 3),
+        }
+
+    @property
+    def diagnostics(self) -> dict:
+        """Return summaries and samples of all metrics, and the counters."""
+        return {
+            "metrics": {
+                name: {
+                    **self.summary(name),
+                    "samples": [
+                        {"time": sample.time, "value": sample.value, **sample.extra}
+                        for sample in samples
+                    ],
+                }
+                for name, samples in self._samples.items()
+                if samples
+            },
+            "counters": dict(self.counters),
+        }
+
+
+def endpoint_name(url: str) -> str:
+    """Return the last part of the path in url, ie. the dataset requested."""
+    return urlsplit(url).path.rstrip("/").rsplit("/", 1)[-1] or "unknown"
+
+
+class CountingStream:
+    """Response body stream counting the bytes read through it."""
+
+    def __init__(self, stream, metrics: Metrics, name: str) -> None:
+        """Initialize the wrapper."""
+        self._stream = stream
+        self._metrics = metrics
+        self._name = name
+
+    def __getattr__(self, name: str):
+        """Pass everything else on to the stream."""
+        return getattr(self._stream, name)
+
+    async def read(self, n: int = -1) -> bytes:
+        """Read up to n bytes, adding them to the byte counter."""
+        chunk = await self._stream.read(n)
+        self._metrics.count(self._name, len(chunk))
+        return chunk
+
+
+class MetricsSession:
+    """Wrapper of an aiohttp session recording latency and size of requests."""
+
+    def __init__(self, session, metrics: Metrics) -> None:
+        """Initialize the wrapper."""
+        self._session = session
+        self._metrics = metrics
+
+    def __getattr__(self, name: str):
+        """Pass everything else on to the session."""
+        return getattr(self._session, name)
+
+    async def get(self, url: str, **kwargs):
+        """Make a GET request, counting the body bytes as they are read.
+
+        The body isn't read here, so it can still be streamed by the caller.
+        """
+        endpoint = endpoint_name(url)
+        with self._metrics.timer(f"http_{endpoint}") as extra:
+            try:
+                resp = await self._session.get(url, **kwargs)
+            except Exception:
+                self._metrics.count(f"http_{endpoint}_errors")
+                extra["status"] = None
+                raise
+
+            extra["status"] = resp.status
+            resp.content = CountingStream(
+                resp.content, self._metrics, f"http_{endpoint}_bytes"
+            )
+
+        return resp
@@ -0,0 +1,169 @@
+"""Cheapest and most expensive periods in price datasets."""
+
+from __future__ import annotations
+
+from array import array
+from bisect import bisect_left, bisect_right
+from collections import namedtuple
+from datetime import datetime, timedelta
+from heapq import nsmallest
+from math import ceil
+
+# A period of time and its mean price
+Period = namedtuple("Period", "start end price")
+
+
+def _tzinfo(datasets: list):
+    """Return the timezone of the first row found in datasets."""
+    for data in datasets:
+        if data:
+            return data[0].time.tzinfo
+
+    return None
+
+
+class PriceSlots:
+    """Price datasets merged into a single series of equally long slots.
+
+    Datasets of different resolution (ie. 15 minute prices followed by an hourly
+    forecast) are split into slots of the finest resolution found. Window sums
+    are looked up in constant time through prefix sums of the slot prices.
+    """
+
+    def __init__(self, datasets: list) -> None:
+        """Merge the datasets."""
+        self.sources = tuple(datasets)
+
+        # (start, length, price) of every row, using the resolution of its dataset
+        rows = []
+        for data in datasets:
+            if not data:
+                continue
+
+            stamps = [row.time.timestamp() for row in data]
+            lengths = [nxt - cur for cur, nxt in zip(stamps, stamps[1:]) if nxt > cur]
+            length = min(lengths) if lengths else 3600
+            rows.extend((stamp, length, row.price) for stamp, row in zip(stamps, data))
+        rows.sort(key=lambda row: row[0])
+
+        self.step = min((row[1] for row in rows), default=3600)
+        self._tz = _tzinfo(datasets)
+        self._stamps = array("d")
+        self._prices = array("d")
+        for start, length, price in rows:
+            if self._stamps and start < self._stamps[-1] + self.step:
+                # Overlapping rows, the first dataset wins
+                continue
+
+            for part in range(max(round(length / self.step), 1)):
+                self._stamps.append(start + part * self.step)
+                self._prices.append(price)
+
+        self._sums = array("d", [0.0])
+        for price in self._prices:
+            self._sums.append(self._sums[-1] + price)
+
+    def __len__(self) -> int:
+        """Return number of slots."""
+        return len(self._prices)
+
+    def _count(self, duration: timedelta) -> int:
+        """Return the number of slots needed to cover duration."""
+        return max(ceil(duration.total_seconds() / self.step), 1)
+
+    def _range(
+        self, earliest: datetime | None, latest: datetime | None, count: int
+    ) -> range:
+        """Return the first slot of every window within earliest and latest."""
+        first = 0
+        if earliest is not None:
+            first = bisect_left(self._stamps, earliest.timestamp())
+
+        last = len(self._prices) - count
+        if latest is not None:
+            last = min(
+                last,
+                bisect_right(self._stamps, latest.timestamp() - self.step * count) - 1,
+            )
+
+        return range(first, last + 1)
+
+    def _period(self, start: int, count: int) -> Period:
+        """Return the window of count slots from start."""
+        return Period(
+            datetime.fromtimestamp(self._stamps[start], self._tz),
+            datetime.fromtimestamp(
+                self._stamps[start + count - 1] + self.step, self._tz
+            ),
+            (self._sums[start + count] - self._sums[start]) / count,
+        )
+
+    def _window(
+        self,
+        duration: timedelta,
+        earliest: datetime | None,
+        latest: datetime | None,
+        sign: int,
+        find_last: bool,
+    ) -> Period | None:
+        """Return the contiguous window with the lowest sum of sign * price."""
+        count = self._count(duration)
+        span = self.step * (count - 1)
+        best = None
+        best_sum = None
+        for start in self._range(earliest, latest, count):
+            if self._stamps[start + count - 1] - self._stamps[start] != span:
+                # The window covers a gap in the data
+                continue
+
+            total = sign * (self._sums[start + count] - self._sums[start])
+            if best is None or total < best_sum or (find_last and total == best_sum):
+                best = start
+                best_sum = total
+
+        return None if best is None else self._period(best, count)
+
+    def cheapest_window(
+        self,
+        duration: timedelta,
+        earliest: datetime | None = None,
+        latest: datetime | None = None,
+        find_last: bool = False,
+    ) -> Period | None:
+        """Return the cheapest contiguous period of duration."""
+        return self._window(duration, earliest, latest, 1, find_last)
+
+    def most_expensive_window(
+        self,
+        duration: timedelta,
+        earliest: datetime | None = None,
+        latest: datetime | None = None,
+        find_last: bool = False,
+    ) -> Period | None:
+        """Return the most expensive contiguous period of duration."""
+        return self._window(duration, earliest, latest, -1, find_last)
+
+    def cheapest_slots(
+        self,
+        duration: timedelta,
+        earliest: datetime | None = None,
+        latest: datetime | None = None,
+    ) -> list[Period]:
+        """Return the cheapest slots covering duration in total, ordered by time."""
+        candidates = self._range(earliest, latest, 1)
+        chosen = nsmallest(
+            self._count(duration), candidates, key=lambda idx: self._prices[idx]
+        )
+        return [self._period(idx, 1) for idx in sorted(chosen)]
+
+
+def slots_for(slots: PriceSlots | None, datasets: list) -> PriceSlots:
+    """Return slots if they were built from datasets, otherwise build them."""
+    if (
+        slots is not None
+        and len(slots.sources) == len(datasets)
+        and all(old is new for old, new in zip(slots.sources, datasets))
+    ):
+        return slots
+
+    return PriceSlots(datasets)
@@ -0,0 +1,130 @@
+"""Batched price calculations."""
+
+from __future__ import annotations
+
+import logging
+from array import array
+
+from homeassistant.util import dt as dt_utils
+
+from ..const import CENT_MULTIPLIER, INTERVAL, UNIT_TO_MULTIPLIER
+from .costtemplate import CostTemplate
+from .regionhandler import RegionHandler
+
+_LOGGER = logging.getLogger(__name__)
+
+NO_TARIFF = (0, 0, 0)
+
+
+class PriceCalculator:
+    """Localize a whole dataset of spot prices at once."""
+
+    def __init__(
+        self,
+        api,
+        region: RegionHandler,
+        currency: str,
+        price_type: str,
+        vat: float,
+        cent: bool,
+        cost_template: CostTemplate,
+    ) -> None:
+        """Initialize the calculator."""
+        self._api = api
+        self._region = region
+        self._currency = currency
+        self._price_type = price_type
+        self._vat = vat
+        self._cent = cent
+        self._template = cost_template
+
+    def get_rate(self, default_currency: str) -> float:
+        """Return the conversion rate from default_currency."""
+        if self._currency == default_currency:
+            return 1.0
+
+        return self._region.currency.convert(
+            1.0, to_currency=self._currency, from_currency=default_currency
+        )
+
+    def _get_tariffs(self, times: list) -> list:
+        """Return (current_tariff, el_afgift, chargeowner_tariff) for each time."""
+        tariff_data = self._api.tariff_data
+        if tariff_data is None:
+            return [NO_TARIFF] * len(times)
+
+        if len(tariff_data["tariffs"]) == 0:
+            _LOGGER.warning(
+                "Error adding tariffs for %s, empty tariff dataset was found!",
+                times[0] if times else None,
+            )
+            return [NO_TARIFF] * len(times)
+
+        connector = self._api.tariff_connector
+        calculated = {}
+        tariffs = []
+        for fake_dt in times:
+            key = (fake_dt.date(), fake_dt.hour)
+            if key not in calculated:
+                try:
+                    system_tariff = connector.get_dated_system_tariff(fake_dt)
+                    chargeowner_tariff = connector.get_dated_tariff(fake_dt)
+
+                    tariff_value = 0
+                    elafgift = 0
+                    for tariff, additional_tariff in system_tariff.items():
+                        tariff_value += float(additional_tariff)
+                        if tariff == "elafgift":
+                            elafgift = float(additional_tariff)
+
+                    owner_tariff = float(
+                        chargeowner_tariff[str(fake_dt.hour)]
+                        if chargeowner_tariff
+                        else 0
+                    )
+                    tariff_value += owner_tariff
+                except KeyError:
+                    _LOGGER.warning(
+                        "Error adding tariffs for %s, no valid tariffs was found!",
+                        fake_dt,
+                    )
+                    raise
+
+                calculated[key] = (tariff_value, elafgift, owner_tariff)
+
+            tariffs.append(calculated[key])
+
+        return tariffs
+
+    def calculate(self, data: list, default_currency: str = "EUR") -> list:
+        """Return data with prices localized, including tariffs, template and VAT."""
+        if not data:
+            return []
+
+        rate = self.get_rate(default_currency)
+        multiplier = UNIT_TO_MULTIPLIER[self._price_type]
+        prices = array("d", ((float(i.price) * rate) / multiplier for i in data))
+
+        times = [dt_utils.as_local(i.time) for i in data]
+        with self._api.metrics.timer("tariff_lookup"):
+            tariffs = self._get_tariffs(times)
+
+        misses = self._template.misses
+        with self._api.metrics.timer("template", rows=len(data)) as extra:
+            template_values = self._template.render_all(
+                [
+                    (fake_dt, price, *tariff)
+                    for fake_dt, price, tariff in zip(times, prices, tariffs)
+                ]
+            )
+            extra["renders"] = self._template.misses - misses
+        self._api.metrics.count("template_renders", extra["renders"])
+
+        vat = float(1 + self._vat)
+        cent = CENT_MULTIPLIER if self._cent else 1
+        return [
+            INTERVAL((price + (template_value + tariff[0])) * vat * cent, i.time)
+            for i, price, tariff, template_value in zip(
+                data, prices, tariffs, template_values
+            )
+        ]
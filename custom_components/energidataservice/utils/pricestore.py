@@ -0,0 +1,147 @@
+"""Shared store for spot prices, used by all config entries."""
+
+from __future__ import annotations
+
+import asyncio
+from datetime import datetime, timedelta
+from logging import getLogger
+
+import homeassistant.util.dt as dt_util
+from homeassistant.core import HomeAssistant
+
+from ..const import DOMAIN, PRICE_STORE
+
+_LOGGER = getLogger(__name__)
+
+# Minimum time between two fetches of an incomplete dataset (ie. no tomorrow)
+REFETCH_INTERVAL = timedelta(minutes=1)
+
+
+class RegionPrices:
+    """Result of a single spot price fetch, shared between config entries."""
+
+    def __init__(self, connector, fetched: datetime) -> None:
+        """Initialize the dataset."""
+        self.connector = connector
+        self.fetched = fetched
+        self._date = None
+        self._parsed = {}
+
+    def _get_parsed(self, offset: int, hourly: bool) -> list | None:
+        """Parse the dataset once per day and resolution, returning the result."""
+        date = dt_util.now().strftime("%Y-%m-%d")
+        if date != self._date:
+            self._date = date
+            self._parsed = {}
+
+        key = (offset, hourly)
+        if key not in self._parsed:
+            self._parsed[key] = self.connector.prices(offset, hourly)
+
+        return self._parsed[key]
+
+    @property
+    def status(self) -> int:
+        """Return the HTTP status of the fetch."""
+        return self.connector.status
+
+    @property
+    def result(self):
+        """Return the raw result from the connector."""
+        return self.connector.result
+
+    def today(self, hourly: bool) -> list | None:
+        """Return parsed dataset for today."""
+        return self._get_parsed(0, hourly)
+
+    def tomorrow(self, hourly: bool) -> list | None:
+        """Return parsed dataset for tomorrow."""
+        return self._get_parsed(1, hourly)
+
+
+class PriceStore:
+    """Region keyed store deduplicating spot price requests across entries."""
+
+    def __init__(self, hass: HomeAssistant) -> None:
+        """Initialize the store."""
+        self.hass = hass
+        self._prices: dict[tuple, RegionPrices] = {}
+        self._pending: dict[tuple, asyncio.Task] = {}
+        self._waiters: dict[tuple, int] = {}
+
+    def _is_valid(self, prices: RegionPrices | None) -> bool:
+        """Check if a stored dataset can be handed out without refetching."""
+        if prices is None:
+            return False
+
+        now = dt_util.now()
+        if dt_util.as_local(prices.fetched).date() != now.date():
+            return False
+
+        # Entries of either resolution share the dataset, so check the records
+        if prices.tomorrow(False):
+            return True
+
+        return now - prices.fetched < REFETCH_INTERVAL
+
+    async def async_get_spotprices(self, key: tuple, connector) -> RegionPrices:
+        """Return spot prices for key, fetching with connector if needed."""
+        prices = self._prices.get(key)
+        if self._is_valid(prices):
+            _LOGGER.debug("Using stored spot prices for %s", key)
+            return prices
+
+        task = self._pending.get(key)
+        if task is None:
+            task = self.hass.async_create_task(self._async_fetch(key, connector))
+            self._pending[key] = task
+        else:
+            _LOGGER.debug("Waiting for pending spot price request for %s", key)
+
+        self._waiters[key] = self._waiters.get(key, 0) + 1
+        try:
+            return await asyncio.shield(task)
+        finally:
+            self._waiters[key] -= 1
+            if not self._waiters[key]:
+                del self._waiters[key]
+                # Nobody is waiting for the request anymore, ie. it lost a race
+                if not task.done():
+                    task.cancel()
+
+    def seed(self, key: tuple, connector, fetched: datetime) -> RegionPrices:
+        """Store an already populated connector, unless newer data exists."""
+        prices = self._prices.get(key)
+        if prices is None or prices.fetched < fetched:
+            prices = RegionPrices(connector, fetched)
+            self._prices[key] = prices
+
+        return prices
+
+    async def _async_fetch(self, key: tuple, connector) -> RegionPrices:
+        """Fetch spot prices and store the result if it was valid.
+
+        Connectors able to fetch incrementally continue from the stored dataset.
+        """
+        try:
+            previous = self._prices.get(key)
+            if previous is not None and hasattr(connector, "resume"):
+                connector.resume(previous.connector)
+
+            await connector.async_get_spotprices()
+            prices = RegionPrices(connector, dt_util.now())
+            if prices.status == 200 and len(prices.result) > 0:
+                self._prices[key] = prices
+
+            return prices
+        finally:
+            self._pending.pop(key, None)
+
+
+def async_get_price_store(hass: HomeAssistant) -> PriceStore:
+    """Return the shared price store, creating it if needed."""
+    domain_data = hass.data.setdefault(DOMAIN, {})
+    if PRICE_STORE not in domain_data:
+        domain_data[PRICE_STORE] = PriceStore(hass)
+
+    return domain_data[PRICE_STORE]
@@ -0,0 +1,106 @@
+"""Static manifest of the price, forecast and tariff providers.
+
+The manifest lists the regions, CO2 regions, extra regions and currencies and
+chargeowners of every provider, so providers are only imported once an entry
+needs them. It is generated when releasing, and can be regenerated from the
+repository root with:
+
+    python -m custom_components.energidataservice.utils.providers
+"""
+
+from __future__ import annotations
+
+import json
+from importlib import import_module
+from logging import getLogger
+from os import listdir
+from pathlib import Path
+
+from homeassistant.core import HomeAssistant
+
+from ..const import DOMAIN, PROVIDER_MANIFEST
+
+_LOGGER = getLogger(__name__)
+
+PACKAGE_DIR = Path(__file__).parent.parent
+PACKAGE = __package__.rsplit(".", 1)[0]
+MANIFEST_FILE = PACKAGE_DIR / "providers.json"
+
+# Provider packages, and the attributes recorded for each provider
+KINDS = {
+    "connectors": ("REGIONS", "CO2REGIONS", "EXTRA_REGIONS", "EXTRA_CURRENCIES"),
+    "forecasts": ("REGIONS", "EXTRA_REGIONS", "EXTRA_CURRENCIES"),
+    "tariffs": ("REGIONS", "CHARGEOWNERS"),
+}
+
+
+def _value(value):
+    """Return value in a JSON friendly form, sets as sorted lists."""
+    if isinstance(value, (set, frozenset)):
+        return sorted(value)
+
+    if isinstance(value, (list, tuple)):
+        return list(value)
+
+    if isinstance(value, dict) and all(
+        isinstance(item, dict) for item in value.values()
+    ):
+        # Chargeowners are looked up by name only
+        return list(value)
+
+    return value
+
+
+def build_manifest() -> dict:
+    """Import every provider and describe it."""
+    manifest = {}
+    for kind, attributes in KINDS.items():
+        providers = manifest[kind] = {}
+        for module in sorted(listdir(PACKAGE_DIR / kind)):
+            if (
+                not (PACKAGE_DIR / kind / module).is_dir()
+                or module.endswith("__pycache__")
+                or module.endswith(".disabled")
+            ):
+                continue
+
+            mod = import_module(f".{kind}.{module}", PACKAGE)
+            providers[module] = {
+                attribute.lower(): _value(getattr(mod, attribute))
+                for attribute in attributes
+                if hasattr(mod, attribute)
+            }
+
+    return manifest
+
+
+def load_manifest() -> dict:
+    """Read the manifest, building it if the file is missing (ie. a checkout)."""
+    try:
+        with open(MANIFEST_FILE, encoding="utf-8") as file:
+            return json.load(file)
+    except FileNotFoundError:
+        _LOGGER.debug("No provider manifest found, importing all providers")
+        return build_manifest()
+
+
+async def async_get_provider_manifest(hass: HomeAssistant) -> dict:
+    """Return the provider manifest, loading it once per Home Assistant instance."""
+    domain_data = hass.data.setdefault(DOMAIN, {})
+    if PROVIDER_MANIFEST not in domain_data:
+        domain_data[PROVIDER_MANIFEST] = await hass.async_add_executor_job(
+            load_manifest
+        )
+
+    return domain_data[PROVIDER_MANIFEST]
+
+
+def write_manifest() -> None:
+    """Write the manifest of the providers in this package."""
+    with open(MANIFEST_FILE, "w", encoding="utf-8") as file:
+        json.dump(build_manifest(), file, indent=2, sort_keys=True)
+        file.write("\n")
+
+
+if __name__ == "__main__":
+    write_manifest()
@@ -0,0 +1,69 @@
+"""Currency conversion rates, loaded lazily and cached per currency pair."""
+
+from __future__ import annotations
+
+import asyncio
+import logging
+
+from currency_converter import CurrencyConverter
+from homeassistant.core import HomeAssistant
+
+_LOGGER = logging.getLogger(__name__)
+
+
+class RateService:
+    """Conversion rates from the bundled ECB dataset.
+
+    Parsing the dataset is slow, so it's done on first use instead of at import,
+    preferably in the executor by async_load. The dataset isn't reloaded, so the
+    latest rate of each currency pair is looked up once and then applied as a
+    single multiplier.
+    """
+
+    def __init__(self) -> None:
+        """Initialize the service."""
+        self._converter: CurrencyConverter | None = None
+        self._rates: dict[tuple, float | None] = {}
+        self._lock = asyncio.Lock()
+
+    @property
+    def loaded(self) -> bool:
+        """Return True if the dataset has been parsed."""
+        return self._converter is not None
+
+    def load(self) -> None:
+        """Parse the dataset, blocking."""
+        if self._converter is None:
+            self._converter = CurrencyConverter()
+
+    async def async_load(self, hass: HomeAssistant) -> None:
+        """Parse the dataset in the executor, if not done yet."""
+        async with self._lock:
+            if self._converter is None:
+                await hass.async_add_executor_job(self.load)
+
+    def rate(self, from_currency: str, to_currency: str) -> float | None:
+        """Return the latest rate from from_currency to to_currency.
+
+        Returns None if either currency is unknown.
+        """
+        if from_currency == to_currency:
+            return 1.0
+
+        key = (from_currency, to_currency)
+        if key not in self._rates:
+            if self._converter is None:
+                _LOGGER.debug("Loading currency rates on first use")
+                self.load()
+
+            try:
+                self._rates[key] = self._converter.convert(
+                    1.0, from_currency, to_currency
+                )
+            except ValueError:
+                self._rates[key] = None
+
+        return self._rates[key]
+
+
+RATES = RateService()
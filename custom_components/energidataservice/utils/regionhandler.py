@@ -4,39 +4,34 @@ from __future__ import annotations
 
 import logging
 
-from currency_converter import CurrencyConverter
-
 from ..const import CURRENCY_LIST, REGIONS
+from .rates import RATES
 
 _LOGGER = logging.getLogger(__name__)
 
-_CONVERTER = CurrencyConverter()
-
 
 class Currency:
     """Define currency class."""
 
-    _converter: CurrencyConverter
-
     def __init__(self, currency: dict) -> None:
         """Initialize a new Currency object."""
         self._name = currency["name"]
         self._symbol = currency["symbol"]
         self._cent = currency["cent"]
-        self._converter = _CONVERTER
 
     def convert(
         self, value: float, to_currency: str, from_currency: str = "EUR"
     ) -> float:
         """Do the conversion."""
-        try:
-            return self._converter.convert(value, from_currency, to_currency)
-        except ValueError:
+        rate = RATES.rate(from_currency, to_currency)
+        if rate is None:
             _LOGGER.warning(
                 "Invalid currency for conversion, returning prices in %s", self._name
             )
             return value
 
+        return value * rate
+
     @property
     def name(self) -> str:
         """Return name of currency."""
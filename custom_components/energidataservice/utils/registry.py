@@ -0,0 +1,70 @@
+"""Provider modules and connectors of a region, resolved once per entry."""
+
+from __future__ import annotations
+
+import sys
+from collections.abc import Callable
+from importlib import import_module
+from importlib.util import resolve_name
+from logging import getLogger
+from types import ModuleType
+
+from homeassistant.core import HomeAssistant
+
+_LOGGER = getLogger(__name__)
+
+PACKAGE = __name__.rsplit(".", 2)[0]
+
+
+class ProviderRegistry:
+    """Endpoints, imported modules and long lived connectors of a region.
+
+    Everything is resolved in async_setup, so updates neither list the provider
+    directories nor import modules in the executor again.
+    """
+
+    def __init__(self, hass: HomeAssistant, region: str) -> None:
+        """Initialize the registry."""
+        self.hass = hass
+        self.region = region
+        self.price_endpoints: list = []
+        self.forecast_endpoints: list = []
+        self.tariff_endpoints: list = []
+        self._modules: dict[str, ModuleType] = {}
+        self._connectors: dict[tuple, object] = {}
+
+    async def async_setup(self, connectors, forecasts, tariffs) -> None:
+        """Resolve the endpoints of the region and import their modules."""
+        self.price_endpoints = connectors.get_connectors(self.region)
+        self.forecast_endpoints = await forecasts.get_endpoint(self.region)
+        self.tariff_endpoints = await tariffs.get_endpoint(self.region)
+
+        for endpoint in (
+            self.price_endpoints + self.forecast_endpoints + self.tariff_endpoints
+        ):
+            if endpoint.namespace in self._modules:
+                continue
+
+            # Only the first entry using a provider imports it in the executor
+            module = sys.modules.get(resolve_name(endpoint.namespace, PACKAGE))
+            if module is None:
+                module = await self.hass.async_add_executor_job(
+                    import_module, endpoint.namespace, PACKAGE
+                )
+            self._modules[endpoint.namespace] = module
+
+        _LOGGER.debug(
+            "Providers for %s: %s", self.region, ", ".join(self._modules) or "none"
+        )
+
+    def module(self, endpoint) -> ModuleType:
+        """Return the imported module of endpoint."""
+        return self._modules[endpoint.namespace]
+
+    def connector(self, kind: str, endpoint, factory: Callable[[ModuleType], object]):
+        """Return the connector of kind for endpoint, created by factory once."""
+        key = (kind, endpoint.namespace)
+        if key not in self._connectors:
+            self._connectors[key] = factory(self.module(endpoint))
+
+        return self._connectors[key]
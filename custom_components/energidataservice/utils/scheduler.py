@@ -0,0 +1,198 @@
+"""Publication aware polling for spot prices, shared by all entries of a region."""
+
+from __future__ import annotations
+
+import asyncio
+import random
+from collections.abc import Awaitable, Callable
+from datetime import datetime, time, timedelta
+from logging import getLogger
+
+import homeassistant.util.dt as dt_util
+from homeassistant.core import HomeAssistant
+from homeassistant.helpers.event import async_track_point_in_time
+
+from ..const import DOMAIN, PRICE_SCHEDULERS
+
+_LOGGER = getLogger(__name__)
+
+# Backoff between polls while the prices are missing
+POLL_BACKOFF = timedelta(minutes=2)
+MAX_POLL_BACKOFF = timedelta(minutes=30)
+
+
+class PriceScheduler:
+    """Single polling loop for the spot prices of a region.
+
+    The first poll of the day is at the expected publication of tomorrows
+    prices. While the prices of any subscriber are incomplete, polls are
+    repeated with a jittered exponential backoff. Once complete, the next poll
+    is the publication of the following day. Triggers arriving while a poll is
+    running wait for that poll instead of starting another.
+
+    The clock, the timer and the jitter can be replaced, which makes the
+    scheduler testable without Home Assistant running.
+    """
+
+    def __init__(
+        self,
+        hass: HomeAssistant,
+        region: str,
+        publication: time,
+        now: Callable[[], datetime] = dt_util.now,
+        track_point_in_time: Callable | None = None,
+        jitter: Callable[[], float] = random.random,
+    ) -> None:
+        """Initialize the scheduler."""
+        self.hass = hass
+        self.region = region
+        self.publication = publication
+        self.attempt = 0
+        self.next_poll: datetime | None = None
+        self._now = now
+        self._track = track_point_in_time or (
+            lambda action, when: async_track_point_in_time(hass, action, when)
+        )
+        self._jitter = jitter
+        self._subscribers: dict[str, tuple] = {}
+        self._unsub: Callable[[], None] | None = None
+        self._poll: asyncio.Task | None = None
+
+    def subscribe(
+        self,
+        key: str,
+        refresh: Callable[[], Awaitable],
+        is_complete: Callable[[datetime], bool],
+    ) -> Callable[[], None]:
+        """Add a refresh function and return a function removing it again."""
+        self._subscribers[key] = (refresh, is_complete)
+        self.schedule()
+
+        def unsubscribe() -> None:
+            self._subscribers.pop(key, None)
+            if not self._subscribers:
+                self.stop()
+                self.hass.data.get(DOMAIN, {}).get(PRICE_SCHEDULERS, {}).pop(
+                    self.region, None
+                )
+
+        return unsubscribe
+
+    def is_complete(self, now: datetime) -> bool:
+        """Check if every subscriber has the prices it needs at now."""
+        return all(is_complete(now) for _, is_complete in self._subscribers.values())
+
+    def publication_after(self, now: datetime) -> datetime:
+        """Return the first expected publication after now."""
+        publication = dt_util.start_of_local_day(now).replace(
+            hour=self.publication.hour,
+            minute=self.publication.minute,
+            second=self.publication.second,
+        )
+        if publication <= now:
+            publication = dt_util.start_of_local_day(
+                now.date() + timedelta(days=1)
+            ).replace(
+                hour=self.publication.hour,
+                minute=self.publication.minute,
+                second=self.publication.second,
+            )
+
+        return publication
+
+    def next_delay(self, now: datetime) -> timedelta:
+        """Return the time until the next poll.
+
+        The backoff only grows with polls that finished without complete
+        prices, so rescheduling alone never pushes the next poll further out.
+        """
+        if self.is_complete(now):
+            self.attempt = 0
+            return self.publication_after(now) - now
+
+        backoff = min(POLL_BACKOFF * 2**self.attempt, MAX_POLL_BACKOFF)
+        # Spread the polls of all installations between half and all of backoff
+        return backoff * (0.5 + self._jitter() / 2)
+
+    def schedule(self) -> None:
+        """(Re)schedule the next poll from the current state."""
+        self._cancel_timer()
+        if not self._subscribers:
+            return
+
+        now = self._now()
+        self.next_poll = now + self.next_delay(now)
+        _LOGGER.debug(
+            "Next spot price poll for %s at %s (attempt %s)",
+            self.region,
+            self.next_poll,
+            self.attempt,
+        )
+        self._unsub = self._track(self._handle_timer, self.next_poll)
+
+    async def async_trigger(self) -> None:
+        """Poll now, or wait for the poll in progress."""
+        if self._poll is None:
+            self._cancel_timer()
+            self._poll = self.hass.async_create_task(self._async_poll())
+
+        await asyncio.shield(self._poll)
+
+    def stop(self) -> None:
+        """Stop polling."""
+        self._cancel_timer()
+        if self._poll is not None:
+            self._poll.cancel()
+            self._poll = None
+
+    @property
+    def diagnostics(self) -> dict:
+        """Return the polling state."""
+        return {
+            "publication": self.publication.isoformat(),
+            "attempt": self.attempt,
+            "next_poll": self.next_poll.isoformat() if self.next_poll else None,
+            "polling": self._poll is not None,
+        }
+
+    async def _handle_timer(
+        self, now: datetime
+    ) -> None:  # pylint: disable=unused-argument
+        """Poll when the timer fires."""
+        self._unsub = None
+        await self.async_trigger()
+
+    async def _async_poll(self) -> None:
+        """Refresh all subscribers and schedule the next poll."""
+        try:
+            subscribers = list(self._subscribers.items())
+            results = await asyncio.gather(
+                *(refresh() for _, (refresh, _) in subscribers),
+                return_exceptions=True,
+            )
+            for (key, _), result in zip(subscribers, results):
+                if isinstance(result, Exception):
+                    _LOGGER.error("Polling spot prices for %s failed: %s", key, result)
+
+            self.attempt = 0 if self.is_complete(self._now()) else self.attempt + 1
+        finally:
+            self._poll = None
+            self.schedule()
+
+    def _cancel_timer(self) -> None:
+        """Cancel the scheduled poll."""
+        self.next_poll = None
+        if self._unsub is not None:
+            self._unsub()
+            self._unsub = None
+
+
+def async_get_price_scheduler(
+    hass: HomeAssistant, region: str, publication: time
+) -> PriceScheduler:
+    """Return the scheduler of region, creating it if needed."""
+    schedulers = hass.data.setdefault(DOMAIN, {}).setdefault(PRICE_SCHEDULERS, {})
+    if region not in schedulers:
+        schedulers[region] = PriceScheduler(hass, region, publication)
+
+    return schedulers[region]
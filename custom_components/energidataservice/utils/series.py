@@ -0,0 +1,190 @@
+"""Time indexed access to raw records and to price and CO2 datasets."""
+
+from __future__ import annotations
+
+from array import array
+from bisect import bisect_left, bisect_right
+from datetime import UTC, date, datetime, timedelta
+
+import homeassistant.util.dt as dt_util
+
+
+class TimeSeries:
+    """Dataset of rows with a time attribute, indexed by time.
+
+    Regular datasets are stored as a start time and a step, so the row covering a
+    given time is found arithmetically. Positions are calculated on UTC epoch
+    seconds, which keeps days with a DST change (23 or 25 hours) regular.
+    Irregular datasets fall back to a bisect on the start times.
+    """
+
+    def __init__(self, data: list) -> None:
+        """Index the dataset."""
+        self.data = data
+        self.start: float | None = None
+        self.step: float | None = None
+        self._stamps: array | None = None
+
+        if not data:
+            return
+
+        stamps = array("d", (row.time.timestamp() for row in data))
+        self.start = stamps[0]
+        if len(stamps) > 1:
+            step = stamps[1] - stamps[0]
+            if step > 0 and all(
+                stamps[idx] - stamps[idx - 1] == step for idx in range(2, len(stamps))
+            ):
+                self.step = step
+                return
+
+        self._stamps = stamps
+
+    def __len__(self) -> int:
+        """Return number of rows."""
+        return len(self.data)
+
+    def index_at(self, when: datetime) -> int | None:
+        """Return the index of the row covering when, or None if outside the dataset."""
+        if not self.data:
+            return None
+
+        stamp = when.timestamp()
+        if stamp < self.start:
+            return None
+
+        if self.step is not None:
+            idx = int((stamp - self.start) // self.step)
+            return idx if idx < len(self.data) else None
+
+        return bisect_right(self._stamps, stamp) - 1
+
+    def index_from(self, when: datetime) -> int:
+        """Return the index of the first row that hasn't ended at when."""
+        if not self.data or when.timestamp() < self.start:
+            return 0
+
+        idx = self.index_at(when)
+        return len(self.data) if idx is None else idx
+
+    def at(self, when: datetime):
+        """Return the row covering when, or None if outside the dataset."""
+        idx = self.index_at(when)
+        return self.data[idx] if idx is not None else None
+
+    def compact(self, prices: list) -> dict | None:
+        """Return prices of the rows as a start/step/prices dict.
+
+        Returns None for irregular datasets, which can't be described by a step.
+        """
+        if self.step is None:
+            return None
+
+        return {"start": self.data[0].time, "step": int(self.step), "prices": prices}
+
+
+def indexed(series: TimeSeries | None, data: list) -> TimeSeries:
+    """Return series if it already indexes data, otherwise index data."""
+    if series is not None and series.data is data:
+        return series
+
+    return TimeSeries(data)
+
+
+def parse_utc(value: str) -> float:
+    """Return epoch seconds of an ISO timestamp, naive timestamps being UTC."""
+    when = datetime.fromisoformat(value)
+    if when.tzinfo is None:
+        when = when.replace(tzinfo=UTC)
+    return when.timestamp()
+
+
+class RecordSeries:
+    """Raw API records parsed once into time sorted arrays.
+
+    Every record is parsed to UTC epoch seconds and a float value, so selecting
+    a day is a bisect on the local midnight boundaries instead of formatting and
+    comparing the date of every record. Rows of a day are built once and reused
+    until the records are replaced. Records are dicts, or tuples with the keys
+    being positions.
+    """
+
+    def __init__(
+        self, records: list, time_key: str | int, value_key: str | int
+    ) -> None:
+        """Parse the records."""
+        self.records = records
+        parsed = sorted(
+            (parse_utc(record[time_key]), float(record[value_key]))
+            for record in records or []
+            if record[time_key] and record[value_key] is not None
+        )
+        self.stamps = array("d", (stamp for stamp, _ in parsed))
+        self.values = array("d", (value for _, value in parsed))
+        self._rows: dict[tuple, list] = {}
+
+    def __len__(self) -> int:
+        """Return number of records."""
+        return len(self.stamps)
+
+    def span(self, day: date) -> tuple[int, int]:
+        """Return the slice of records starting on the local day."""
+        start = dt_util.start_of_local_day(day)
+        end = dt_util.start_of_local_day(day + timedelta(days=1))
+        return (
+            bisect_left(self.stamps, start.timestamp()),
+            bisect_left(self.stamps, end.timestamp()),
+        )
+
+    def rows(self, day: date, factory, hourly: bool = False) -> list:
+        """Return the records of the local day as factory(value, time) rows.
+
+        If hourly is set, the records of each whole hour are averaged, skipping
+        hours that aren't fully covered.
+        """
+        key = (day, factory, hourly)
+        if key not in self._rows:
+            low, high = self.span(day)
+            if hourly:
+                pairs = self._hourly(low, high)
+            else:
+                pairs = zip(self.stamps[low:high], self.values[low:high])
+
+            tz = dt_util.get_default_time_zone()
+            self._rows[key] = [
+                factory(value, datetime.fromtimestamp(stamp, tz))
+                for stamp, value in pairs
+            ]
+
+        return self._rows[key]
+
+    def _hourly(self, low: int, high: int) -> list:
+        """Return (start, average) of the whole hours in the slice."""
+        if high - low > 1:
+            per_hour = max(1, round(3600 / (self.stamps[low + 1] - self.stamps[low])))
+        else:
+            per_hour = 1
+
+        hours = []
+        idx = low
+        while idx < high:
+            hour = self.stamps[idx] - self.stamps[idx] % 3600
+            end = bisect_left(self.stamps, hour + 3600, idx, high)
+            if end - idx == per_hour:
+                hours.append((hour, sum(self.values[idx:end]) / per_hour))
+            idx = end
+
+        return hours
+
+
+def parsed(
+    series: RecordSeries | None,
+    records: list,
+    time_key: str | int,
+    value_key: str | int,
+) -> RecordSeries:
+    """Return series if it already holds records, otherwise parse records."""
+    if series is not None and series.records is records:
+        return series
+
+    return RecordSeries(records, time_key, value_key)
@@ -0,0 +1,107 @@
+"""Aggregates of price datasets, independent of Home Assistant."""
+
+from __future__ import annotations
+
+from array import array
+from math import sqrt
+
+
+class PriceStatistics:
+    """Aggregates of a price dataset, calculated in a single pass.
+
+    The dataset is walked backwards once, storing the index of the min and max
+    row and the running sums for every suffix. Aggregates for the whole dataset
+    or for the rows from a given index (ie. the remaining part of today) are
+    then looked up in constant time.
+    """
+
+    def __init__(self, data: list) -> None:
+        """Calculate the suffix aggregates of data."""
+        self.data = data
+        count = len(data)
+        self._min_idx = array("l", [0]) * count
+        self._max_idx = array("l", [0]) * count
+        self._sum = array("d", [0.0]) * (count + 1)
+        self._sum_sq = array("d", [0.0]) * (count + 1)
+        self._sorted: list | None = None
+        self._raw: dict[int, list] = {}
+
+        min_idx = max_idx = count - 1
+        for idx in range(count - 1, -1, -1):
+            price = data[idx].price
+            if price <= data[min_idx].price:
+                min_idx = idx
+            if price >= data[max_idx].price:
+                max_idx = idx
+
+            self._min_idx[idx] = min_idx
+            self._max_idx[idx] = max_idx
+            self._sum[idx] = self._sum[idx + 1] + price
+            self._sum_sq[idx] = self._sum_sq[idx + 1] + price * price
+
+    def __len__(self) -> int:
+        """Return number of rows."""
+        return len(self.data)
+
+    def min(self, start: int = 0):
+        """Return the first row with the lowest price from start, or None."""
+        if start >= len(self.data):
+            return None
+
+        return self.data[self._min_idx[start]]
+
+    def max(self, start: int = 0):
+        """Return the first row with the highest price from start, or None."""
+        if start >= len(self.data):
+            return None
+
+        return self.data[self._max_idx[start]]
+
+    def mean(self, start: int = 0) -> float | None:
+        """Return the mean price from start, or None."""
+        if start >= len(self.data):
+            return None
+
+        return self._sum[start] / (len(self.data) - start)
+
+    def stddev(self, start: int = 0) -> float | None:
+        """Return the population standard deviation of the prices from start."""
+        if start >= len(self.data):
+            return None
+
+        count = len(self.data) - start
+        mean = self._sum[start] / count
+        return sqrt(max(self._sum_sq[start] / count - mean * mean, 0.0))
+
+    def percentile(self, percent: float) -> float | None:
+        """Return the percentile (0-100) of all prices, interpolating linearly."""
+        if not self.data:
+            return None
+
+        if self._sorted is None:
+            self._sorted = sorted(row.price for row in self.data)
+
+        pos = (len(self._sorted) - 1) * min(max(percent, 0), 100) / 100
+        lower = int(pos)
+        upper = min(lower + 1, len(self._sorted) - 1)
+        return self._sorted[lower] + (self._sorted[upper] - self._sorted[lower]) * (
+            pos - lower
+        )
+
+    def raw(self, decimals: int) -> list:
+        """Return the dataset as a list of hour/price dicts, built once."""
+        if decimals not in self._raw:
+            self._raw[decimals] = [
+                {"hour": row.time, "price": round(row.price, decimals)}
+                for row in self.data
+            ]
+
+        return self._raw[decimals]
+
+
+def statistics_for(stats: PriceStatistics | None, data: list) -> PriceStatistics:
+    """Return stats if they were calculated for data, otherwise calculate them."""
+    if stats is not None and stats.data is data:
+        return stats
+
+    return PriceStatistics(data)
@@ -3,7 +3,6 @@
 from __future__ import annotations
 
 import logging
-from importlib import import_module
 
 from ..tariffs import Tariff
 
@@ -23,10 +22,6 @@ class TariffHandler:
         _LOGGER.debug("Tariff connectors: %s", connectors)
         for endpoint in connectors:
             _LOGGER.debug("Getting chargeowner from '%s'", endpoint.namespace)
-            module = await hass.async_add_executor_job(
-                import_module, f"..{endpoint.namespace}", __name__
-            )
-            for chargeowner in module.CHARGEOWNERS:
-                chargeowners.append(chargeowner)
+            chargeowners.extend(endpoint.chargeowners)
 
         return chargeowners if not sort else sorted(chargeowners, reverse=descending)
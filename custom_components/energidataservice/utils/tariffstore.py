@@ -0,0 +1,274 @@
+"""Shared store for tariffs, used by all config entries."""
+
+from __future__ import annotations
+
+import asyncio
+import random
+from collections.abc import Awaitable, Callable
+from datetime import datetime, timedelta
+from logging import getLogger
+
+import homeassistant.util.dt as dt_util
+from homeassistant.core import HomeAssistant
+
+from ..const import DOMAIN, TARIFF_STORE
+
+_LOGGER = getLogger(__name__)
+
+# Key of the system tariffs, which are the same for every entry
+SYSTEM_TARIFFS = ("system",)
+
+# Time allowed for each attempt, in seconds
+ATTEMPT_TIMEOUT = 60
+
+# Backoff of failed refreshes, in seconds, doubling up to the max delay
+RETRY_DELAY = 30
+MAX_RETRY_DELAY = 3600
+MAX_ATTEMPTS = 10
+
+# Statuses meaning the request itself is wrong, which retrying won't fix
+PERMANENT_STATUSES = (400, 411)
+
+
+class TariffStore:
+    """Tariff connectors shared by entries with the same charge owner.
+
+    Charge owner tariffs are keyed by the GLN and chargetype codes of the charge
+    owner, and the system tariffs are fetched once for all of them. Each dataset
+    is fetched at most once a day, with concurrent requests waiting for the one
+    in progress. Failed fetches are retried by a background refresh per key,
+    with a jittered exponential backoff and a bounded number of attempts.
+    Entries hold a reference to their key, and the tariffs and refresh of a key
+    are dropped when the last entry using it is unloaded.
+    """
+
+    def __init__(self, hass: HomeAssistant) -> None:
+        """Initialize the store."""
+        self.hass = hass
+        self._connectors: dict[tuple, object] = {}
+        self._refs: dict[tuple, int] = {}
+        self._fetched: dict[tuple, datetime] = {}
+        self._pending: dict[tuple, asyncio.Task] = {}
+        self._refreshing: dict[tuple, asyncio.Task] = {}
+        self._retries: dict[tuple, dict] = {}
+        self._system: tuple | None = None
+
+    def acquire(self, key: tuple, factory: Callable[[], object]):
+        """Return the connector of key, created by factory, and hold a reference."""
+        if key not in self._connectors:
+            self._connectors[key] = factory()
+
+        self._refs[key] = self._refs.get(key, 0) + 1
+        return self._connectors[key]
+
+    def release(self, key: tuple) -> None:
+        """Drop a reference, forgetting the tariffs of key if it was the last."""
+        self._refs[key] -= 1
+        if self._refs[key]:
+            return
+
+        del self._refs[key]
+        self._forget(key)
+        if not self._refs:
+            self._system = None
+            self._forget(SYSTEM_TARIFFS)
+
+    def seed(
+        self, key: tuple, fetched: datetime, restore: Callable[[], object]
+    ) -> bool:
+        """Restore the tariffs of key fetched at fetched, unless newer are held.
+
+        restore populates the connector of key, including its system tariffs,
+        which are shared if none are yet. Returns False if nothing was restored.
+        """
+        if key in self._fetched and self._fetched[key] >= fetched:
+            return False
+
+        restore()
+        self._fetched[key] = fetched
+        connector = self._connectors[key]
+        if self._system is None:
+            self._system = connector.system_dataset
+            self._fetched[SYSTEM_TARIFFS] = fetched
+        else:
+            connector.use_system_dataset(self._system)
+
+        return True
+
+    async def async_get_tariffs(self, key: tuple) -> dict:
+        """Return the tariffs of key, fetching them if not fetched today."""
+        connector = self._connectors[key]
+
+        await self._async_once(
+            SYSTEM_TARIFFS, lambda: self._async_fetch_system(connector)
+        )
+        if self._system is not None:
+            connector.use_system_dataset(self._system)
+
+        await self._async_once(key, lambda: self._async_fetch_tariffs(connector))
+        return connector.tariffs
+
+    async def async_refresh(self, key: tuple) -> dict:
+        """Return the tariffs of key, retrying until fetched or out of attempts.
+
+        The retries run in a task shared by all entries of key, so waiting
+        entries can be cancelled without stopping it.
+        """
+        task = self._refreshing.get(key)
+        if task is None:
+            task = self.hass.async_create_background_task(
+                self._async_refresh(key), f"tariff_refresh_{self.name(key)}"
+            )
+            self._refreshing[key] = task
+
+        return await asyncio.shield(task)
+
+    def refresh_state(self, key: tuple) -> dict:
+        """Return the fetch time and retry state of key."""
+        fetched = self._fetched.get(key)
+        return {
+            "fetched": fetched.isoformat() if fetched is not None else None,
+            "refreshing": key in self._refreshing,
+            "retry": self._retries.get(key),
+        }
+
+    @property
+    def diagnostics(self) -> dict:
+        """Return the shared keys, their references, fetch times and retries."""
+        return {
+            "references": {self.name(key): refs for key, refs in self._refs.items()},
+            "fetched": {
+                self.name(key): fetched.isoformat()
+                for key, fetched in self._fetched.items()
+            },
+            "retries": {self.name(key): state for key, state in self._retries.items()},
+        }
+
+    @staticmethod
+    def name(key: tuple) -> str:
+        """Return key as a string."""
+        return "/".join(map(str, key))
+
+    async def _async_refresh(self, key: tuple) -> dict:
+        """Fetch the tariffs of key, backing off between failed attempts."""
+        try:
+            for attempt in range(1, MAX_ATTEMPTS + 1):
+                try:
+                    async with asyncio.timeout(ATTEMPT_TIMEOUT):
+                        tariffs = await self.async_get_tariffs(key)
+                    status = tariffs["status"]
+                except TimeoutError:
+                    # A request still running is waited for by the next attempt
+                    tariffs = self._connectors[key].tariffs
+                    status = 504
+
+                if self._is_fresh(key) and self._is_fresh(SYSTEM_TARIFFS):
+                    self._retries.pop(key, None)
+                    return tariffs
+
+                if status in PERMANENT_STATUSES or attempt == MAX_ATTEMPTS:
+                    break
+
+                # Equal jitter keeps entries of other charge owners apart
+                delay = min(MAX_RETRY_DELAY, RETRY_DELAY * 2 ** (attempt - 1))
+                delay = delay / 2 + random.uniform(0, delay / 2)
+                self._retries[key] = {
+                    "attempt": attempt,
+                    "status": status,
+                    "next_attempt": (
+                        dt_util.now() + timedelta(seconds=delay)
+                    ).isoformat(),
+                }
+                _LOGGER.warning(
+                    "Couldn't get tariffs for %s (status %s), retrying in %.0f seconds",
+                    self.name(key),
+                    status,
+                    delay,
+                )
+                await asyncio.sleep(delay)
+
+            self._retries[key] = {
+                "attempt": attempt,
+                "status": status,
+                "next_attempt": None,
+            }
+            _LOGGER.error(
+                "Giving up on tariffs for %s after %s attempt(s), status %s",
+                self.name(key),
+                attempt,
+                status,
+            )
+            return {**tariffs, "status": status}
+        finally:
+            if self._refreshing.get(key) is asyncio.current_task():
+                del self._refreshing[key]
+
+    async def _async_once(
+        self, key: tuple, fetch: Callable[[], Awaitable[bool]]
+    ) -> None:
+        """Run fetch for key, unless it succeeded today or is already running."""
+        if self._is_fresh(key):
+            _LOGGER.debug("Using shared tariffs for %s", key)
+            return
+
+        task = self._pending.get(key)
+        if task is None:
+            task = self.hass.async_create_task(self._async_run(key, fetch))
+            self._pending[key] = task
+        else:
+            _LOGGER.debug("Waiting for pending tariff request for %s", key)
+
+        await asyncio.shield(task)
+
+    async def _async_run(
+        self, key: tuple, fetch: Callable[[], Awaitable[bool]]
+    ) -> None:
+        """Run fetch, recording the time if it succeeded."""
+        try:
+            if await fetch():
+                self._fetched[key] = dt_util.now()
+        finally:
+            self._pending.pop(key, None)
+
+    async def _async_fetch_system(self, connector) -> bool:
+        """Fetch the system tariffs with connector and share them."""
+        await connector.async_get_system_tariffs()
+        dataset = connector.system_dataset
+        if not dataset[0]:
+            return False
+
+        self._system = dataset
+        return True
+
+    @staticmethod
+    async def _async_fetch_tariffs(connector) -> bool:
+        """Fetch the charge owner tariffs with connector."""
+        tariffs = await connector.async_get_tariffs(system=False)
+        return connector.status == 200 and bool(tariffs["tariffs"])
+
+    def _is_fresh(self, key: tuple) -> bool:
+        """Return True if key was fetched today."""
+        fetched = self._fetched.get(key)
+        return (
+            fetched is not None
+            and dt_util.as_local(fetched).date() == dt_util.now().date()
+        )
+
+    def _forget(self, key: tuple) -> None:
+        """Drop the connector, fetch time, requests and refresh of key."""
+        self._connectors.pop(key, None)
+        self._fetched.pop(key, None)
+        self._retries.pop(key, None)
+        for tasks in (self._pending, self._refreshing):
+            task = tasks.pop(key, None)
+            if task is not None:
+                task.cancel()
+
+
+def async_get_tariff_store(hass: HomeAssistant) -> TariffStore:
+    """Return the shared tariff store, creating it if needed."""
+    domain_data = hass.data.setdefault(DOMAIN, {})
+    if TARIFF_STORE not in domain_data:
+        domain_data[TARIFF_STORE] = TariffStore(hass)
+
+    return domain_data[TARIFF_STORE]
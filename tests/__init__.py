@@ -0,0 +1 @@
+"""Tests for the Energi Data Service integration."""
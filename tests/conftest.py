@@ -0,0 +1,64 @@
+"""Shared fixtures for the tests."""
+
+from __future__ import annotations
+
+import asyncio
+from datetime import datetime
+from types import SimpleNamespace
+from zoneinfo import ZoneInfo
+
+import homeassistant.util.dt as dt_util
+import pytest
+
+TIME_ZONE = ZoneInfo("Europe/Copenhagen")
+
+
+@pytest.fixture(autouse=True)
+def time_zone():
+    """Run the tests in the Danish time zone."""
+    default = dt_util.DEFAULT_TIME_ZONE
+    dt_util.set_default_time_zone(TIME_ZONE)
+    yield TIME_ZONE
+    dt_util.set_default_time_zone(default)
+
+
+class FakeClock:
+    """Clock and timer, advanced by hand."""
+
+    def __init__(self, now: datetime) -> None:
+        """Initialize the clock."""
+        self.now = now
+        self.timers: list = []
+
+    def __call__(self) -> datetime:
+        """Return the current time."""
+        return self.now
+
+    def track(self, action, when: datetime):
+        """Schedule action at when, returning a function cancelling it."""
+        timer = [when, action]
+        self.timers.append(timer)
+        return lambda: self.timers.remove(timer)
+
+    async def advance_to_next(self) -> datetime:
+        """Move the clock to the next timer and run it."""
+        timer = min(self.timers, key=lambda timer: timer[0])
+        self.timers.remove(timer)
+        self.now = timer[0]
+        await timer[1](self.now)
+        await asyncio.sleep(0)
+        return self.now
+
+
+@pytest.fixture
+def fake_hass():
+    """Return the parts of Home Assistant used outside of a running core."""
+
+    def create_task(target, name=None):
+        return asyncio.get_running_loop().create_task(target)
+
+    return SimpleNamespace(
+        data={},
+        async_create_task=create_task,
+        async_create_background_task=create_task,
+    )
@@ -0,0 +1,76 @@
+"""Tests for the cost template analysis."""
+
+from __future__ import annotations
+
+from datetime import datetime
+
+import pytest
+import pytest_asyncio
+from homeassistant.core import HomeAssistant
+from homeassistant.helpers.template import Template
+
+from custom_components.energidataservice.utils.costtemplate import CostTemplate
+
+NOW = datetime(2026, 10, 18, 12)
+
+
+@pytest_asyncio.fixture
+async def hass(tmp_path):
+    """Return a Home Assistant instance to render templates with."""
+    hass = HomeAssistant(str(tmp_path))
+    yield hass
+    await hass.async_stop(force=True)
+
+
+@pytest.mark.asyncio
+async def test_home_assistant_filter(hass) -> None:
+    """A filter only Home Assistant knows is rendered for every interval."""
+    cost_template = CostTemplate(Template("{{ current_price | multiply(1.25) }}", hass))
+
+    assert cost_template.variables is None
+    assert not cost_template.is_affine
+    assert not cost_template.cacheable
+    rows = [(NOW, price, 0.5, 0.1, 0.2) for price in (1.0, 2.0, 1.0)]
+    assert cost_template.render_all(rows) == [1.25, 2.5, 1.25]
+    # Equal rows are still only rendered once within a batch
+    assert cost_template.misses == 2
+
+
+@pytest.mark.asyncio
+async def test_affine_template(hass) -> None:
+    """A sum of the template variables is calculated without rendering."""
+    cost_template = CostTemplate(
+        Template("{{ current_price * 0.25 + current_tariff | float }}", hass)
+    )
+
+    assert cost_template.is_affine
+    rows = [(NOW, 2.0, 0.5, 0.1, 0.2), (NOW, 4.0, 1.0, 0.1, 0.2)]
+    assert cost_template.render_all(rows) == [1.0, 2.0]
+    assert cost_template.misses == 0
+
+
+@pytest.mark.parametrize(
+    "template",
+    [
+        "{{ 0.1 if 'sun.sun' is is_state('above_horizon') else 0 }}",
+        "{{ 0.1 if ('sensor.tariff' | states | float(0)) > 1 else 0 }}",
+        "{{ current_price if now() | as_timestamp > 0 else 0 }}",
+        "{{ [current_price, 1, 2] | random }}",
+    ],
+)
+def test_outside_data_is_not_cacheable(template: str) -> None:
+    """Filters and tests that may look up states aren't reused between refreshes."""
+    assert not CostTemplate(Template(template, None)).cacheable
+
+
+@pytest.mark.parametrize(
+    "template",
+    [
+        "{{ current_price * 1.25 | round(2) }}",
+        "{{ 0.1 if now().hour is even and current_tariff is number else 0 }}",
+        "{{ [current_price, current_tariff] | max | float }}",
+    ],
+)
+def test_pure_templates_are_cacheable(template: str) -> None:
+    """Templates using only pure filters and tests are reused."""
+    assert CostTemplate(Template(template, None)).cacheable
@@ -0,0 +1,95 @@
+"""Tests for the incremental JSON records parser."""
+
+from __future__ import annotations
+
+import json
+
+import pytest
+
+from custom_components.energidataservice.utils.jsonstream import async_iter_records
+
+RESPONSE = {
+    "total": 123456,
+    "filters": {"PriceArea": ["DK1"], "nested": [[1, 2], {"records": [0]}]},
+    "records": [
+        {"HourDK": "2026-10-18T00:00:00", "SpotPriceDKK": 1234.567891, "n": 10},
+        {"HourDK": "2026-10-18T01:00:00", "SpotPriceDKK": -0.5e-3, "n": None},
+        {"Note": "Nettarif C time – Ærø Forsyning ✓", "ok": True, "off": False},
+        [],
+        12345678901234567890,
+        "",
+    ],
+    "limit": 3,
+}
+
+
+class Content:
+    """Byte stream returning chunks of at most the requested size."""
+
+    def __init__(self, data: bytes) -> None:
+        """Initialize the stream."""
+        self.data = data
+        self.pos = 0
+
+    async def read(self, size: int) -> bytes:
+        """Return the next chunk, or b"" at the end."""
+        chunk = self.data[self.pos : self.pos + size]
+        self.pos += len(chunk)
+        return chunk
+
+
+async def collect(data: bytes, chunk_size: int, key: str = "records") -> list:
+    """Return all records parsed from data."""
+    return [
+        record async for record in async_iter_records(Content(data), key, chunk_size)
+    ]
+
+
+@pytest.mark.asyncio
+@pytest.mark.parametrize("chunk_size", [1, 2, 3, 7, 64, 16384])
+@pytest.mark.parametrize("indent", [None, 2])
+async def test_records_across_chunk_boundaries(chunk_size: int, indent) -> None:
+    """Records are the same wherever the chunks split the response."""
+    data = json.dumps(RESPONSE, indent=indent, ensure_ascii=False).encode()
+
+    assert await collect(data, chunk_size) == RESPONSE["records"]
+
+
+@pytest.mark.asyncio
+@pytest.mark.parametrize("chunk_size", [1, 2, 4])
+async def test_numbers_at_the_end_of_a_chunk(chunk_size: int) -> None:
+    """A number split between chunks isn't decoded from its first digits."""
+    data = b'{"records":[1234,5678.25,-90,1e-7,2.5E+3]}'
+
+    assert await collect(data, chunk_size) == [1234, 5678.25, -90, 1e-7, 2.5e3]
+
+
+@pytest.mark.asyncio
+async def test_other_key() -> None:
+    """Only the items of the requested key are returned."""
+    data = json.dumps(RESPONSE).encode()
+
+    assert await collect(data, 5, "missing") == []
+
+
+@pytest.mark.asyncio
+async def test_empty_records() -> None:
+    """An empty array yields nothing."""
+    assert await collect(b'{"records": [ ], "total": 0}', 2) == []
+
+
+@pytest.mark.asyncio
+@pytest.mark.parametrize(
+    "data",
+    [
+        b"",
+        b"[]",
+        b'{"records": [1, 2',
+        b'{"records": [1], "total"',
+        b'{"records": [{"a"',
+    ],
+)
+async def test_invalid_responses(data: bytes) -> None:
+    """Truncated or unexpected responses raise ValueError."""
+    with pytest.raises(ValueError):
+        await collect(data, 3)
@@ -0,0 +1,60 @@
+"""Tests for the request metrics."""
+
+from __future__ import annotations
+
+import json
+
+import pytest
+import pytest_asyncio
+from aiohttp import ClientSession, web
+from aiohttp.test_utils import TestServer
+
+from custom_components.energidataservice.utils.jsonstream import async_iter_records
+from custom_components.energidataservice.utils.metrics import Metrics, MetricsSession
+
+RECORDS = [
+    {"HourUTC": f"2026-10-18T{hour:02d}:00:00", "CO2": hour} for hour in range(24)
+]
+BODY = json.dumps({"total": len(RECORDS), "records": RECORDS}).encode()
+
+
+@pytest_asyncio.fixture
+async def server():
+    """Serve the records from a real HTTP server."""
+
+    async def handler(_request):
+        return web.Response(body=BODY, content_type="application/json")
+
+    app = web.Application()
+    app.router.add_get("/dataset/CO2EmisProg", handler)
+    async with TestServer(app) as test_server:
+        yield test_server
+
+
+@pytest.mark.asyncio
+async def test_streamed_response_through_metrics_session(server) -> None:
+    """The body is left for the caller to stream, and its bytes are counted."""
+    metrics = Metrics()
+    async with ClientSession() as session:
+        client = MetricsSession(session, metrics)
+        resp = await client.get(str(server.make_url("/dataset/CO2EmisProg")))
+        records = [
+            record async for record in async_iter_records(resp.content, chunk_size=64)
+        ]
+
+    assert records == RECORDS
+    assert metrics.counters["http_CO2EmisProg_bytes"] == len(BODY)
+    assert metrics.last("http_CO2EmisProg").extra == {"status": 200}
+
+
+@pytest.mark.asyncio
+async def test_json_response_through_metrics_session(server) -> None:
+    """Decoding the whole body still works and counts the bytes once."""
+    metrics = Metrics()
+    async with ClientSession() as session:
+        client = MetricsSession(session, metrics)
+        resp = await client.get(str(server.make_url("/dataset/CO2EmisProg")))
+        assert (await resp.json())["records"] == RECORDS
+        assert (await resp.json())["total"] == len(RECORDS)
+
+    assert metrics.counters["http_CO2EmisProg_bytes"] == len(BODY)
@@ -0,0 +1,201 @@
+"""Tests for the batched price calculations."""
+
+from __future__ import annotations
+
+from datetime import datetime, timedelta
+from types import SimpleNamespace
+
+import homeassistant.util.dt as dt_util
+import pytest
+from jinja2 import Environment, pass_context
+
+from custom_components.energidataservice.const import (
+    CENT_MULTIPLIER,
+    DEFAULT_TEMPLATE,
+    INTERVAL,
+    UNIT_TO_MULTIPLIER,
+)
+from custom_components.energidataservice.tariffs.energidataservice import (
+    Connector,
+    TariffRow,
+)
+from custom_components.energidataservice.utils.costtemplate import CostTemplate
+from custom_components.energidataservice.utils.metrics import Metrics
+from custom_components.energidataservice.utils.pricecalc import PriceCalculator
+from custom_components.energidataservice.utils.regionhandler import RegionHandler
+
+TEMPLATES = [
+    DEFAULT_TEMPLATE,
+    "{{ current_tariff * 1.1 + 0.05 }}",
+    "{{ (current_price + el_afgift) / 4 - chargeowner_tariff }}",
+    "{% if now().hour >= 17 and now().hour < 21 %}{{ current_tariff * 1.1 + 0.05 }}"
+    "{% else %}{{ current_tariff + 0.05 }}{% endif %}",
+    "{{ 0.1 if now().weekday() == 6 and current_price > 0.5 else 0 }}",
+]
+
+
+class Template:
+    """Cost template rendered by plain Jinja instead of Home Assistant."""
+
+    _env = Environment()
+
+    def __init__(self, template: str) -> None:
+        """Compile the template."""
+        self.template = template
+        self._compiled = self._env.from_string(template)
+
+    def async_render(self, **kwargs):
+        """Render the template and return the result as a number, if possible."""
+        result = self._compiled.render(**kwargs)
+        try:
+            return float(result)
+        except ValueError:
+            return result
+
+
+def tariff_connector() -> Connector:
+    """Return a tariff connector with a tariff change within the data."""
+    connector = Connector(None, None, "Radius")
+    # pylint: disable=protected-access
+    connector._set_tariffs(
+        [
+            TariffRow("2026-01-01", "2026-10-25", "Nettarif", (0.1,) * 17 + (0.4,) * 7),
+            TariffRow(
+                "2026-10-25", None, "Nettarif", (0.2,) * 17 + (0.6,) * 4 + (None,) * 3
+            ),
+        ]
+    )
+    connector._set_system_tariffs(
+        [
+            TariffRow("2026-01-01", None, "Elafgift", (0.761,)),
+            TariffRow("2026-01-01", None, "Systemtarif", (0.072,)),
+            TariffRow("2026-01-01", None, "Transmissions nettarif", (0.058,)),
+        ]
+    )
+    return connector
+
+
+def prices() -> list:
+    """Return two days of quarter hourly prices across the end of summer time."""
+    start = datetime(2026, 10, 23, 22, tzinfo=dt_util.UTC)
+    return [
+        INTERVAL((idx % 37) * 13.7 - 50, start + timedelta(minutes=15 * idx))
+        for idx in range(4 * 49)
+    ]
+
+
+def calculate(api, calculator: dict, value, fake_dt, default_currency) -> float:
+    """Calculate a single price like the sensor did before batching."""
+
+    def faker():
+        def inner(*_, **__):
+            return fake_dt or dt_util.now()
+
+        return pass_context(inner)
+
+    if calculator["currency"] != default_currency:
+        value = calculator["region"].currency.convert(
+            value, to_currency=calculator["currency"], from_currency=default_currency
+        )
+
+    tariff_value = 0
+    owner_tariff = 0
+    elafgift = 0
+    if api.tariff_data is not None and len(api.tariff_data["tariffs"]) > 0:
+        system_tariff = api.tariff_connector.get_dated_system_tariff(fake_dt)
+        chargeowner_tariff = api.tariff_connector.get_dated_tariff(fake_dt)
+        if system_tariff:
+            for tariff, additional_tariff in system_tariff.items():
+                tariff_value += float(additional_tariff)
+                if tariff == "elafgift":
+                    elafgift = float(additional_tariff)
+
+        owner_tariff = float(
+            chargeowner_tariff[str(fake_dt.hour)] if chargeowner_tariff else 0
+        )
+        tariff_value += owner_tariff
+
+    price = value / UNIT_TO_MULTIPLIER[calculator["price_type"]]
+    template_value = calculator["template"].async_render(
+        now=faker(),
+        current_tariff=tariff_value,
+        current_price=price,
+        el_afgift=elafgift,
+        chargeowner_tariff=owner_tariff,
+    )
+    if not isinstance(template_value, int | float | type(None)):
+        template_value = float(template_value)
+    if template_value is None:
+        template_value = 0
+
+    price += template_value + tariff_value
+    price = price * float(1 + calculator["vat"])
+    if calculator["cent"]:
+        price = price * CENT_MULTIPLIER
+
+    return price
+
+
+@pytest.mark.parametrize("template", TEMPLATES)
+@pytest.mark.parametrize(
+    ("currency", "price_type", "vat", "cent"),
+    [("DKK", "kWh", 0.25, False), ("EUR", "Wh", 0, True), ("SEK", "kWh", 0.25, True)],
+)
+@pytest.mark.parametrize("tariffs", [True, False])
+def test_calculate_matches_single_prices(
+    template: str, currency: str, price_type: str, vat: float, cent: bool, tariffs
+) -> None:
+    """Every price in a batch is the same as when calculated one at a time."""
+    connector = tariff_connector()
+    api = SimpleNamespace(
+        tariff_data={"tariffs": connector.tariffs} if tariffs else None,
+        tariff_connector=connector,
+        metrics=Metrics(),
+    )
+    settings = {
+        "region": RegionHandler("DK1"),
+        "currency": currency,
+        "price_type": price_type,
+        "vat": vat,
+        "cent": cent,
+        "template": Template(template),
+    }
+    calculator = PriceCalculator(
+        api,
+        settings["region"],
+        currency,
+        price_type,
+        vat,
+        cent,
+        CostTemplate(settings["template"]),
+    )
+    data = prices()
+
+    # Twice, as the second batch is rendered from the cache
+    for _ in range(2):
+        result = calculator.calculate(data, "EUR")
+
+        assert [interval.time for interval in result] == [i.time for i in data]
+        assert [interval.price for interval in result] == pytest.approx(
+            [
+                calculate(api, settings, i.price, dt_util.as_local(i.time), "EUR")
+                for i in data
+            ],
+            rel=1e-12,
+            abs=1e-12,
+        )
+
+
+def test_calculate_empty() -> None:
+    """An empty dataset is returned without looking up anything."""
+    calculator = PriceCalculator(
+        None,
+        RegionHandler("DK1"),
+        "DKK",
+        "kWh",
+        0.25,
+        False,
+        CostTemplate(Template(DEFAULT_TEMPLATE)),
+    )
+
+    assert calculator.calculate([], "EUR") == []
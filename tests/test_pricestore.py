@@ -0,0 +1,51 @@
+"""Tests for the shared spot price store."""
+
+from __future__ import annotations
+
+from datetime import datetime
+from types import SimpleNamespace
+
+import homeassistant.util.dt as dt_util
+
+from custom_components.energidataservice.utils.pricestore import RegionPrices
+
+
+class Connector:
+    """Connector counting how often its dataset is parsed."""
+
+    def __init__(self) -> None:
+        """Initialize the connector."""
+        self.parsed = 0
+
+    def prices(self, offset: int, hourly: bool) -> list:
+        """Return a new parse of the dataset."""
+        self.parsed += 1
+        return [self.parsed, offset, hourly]
+
+
+def test_parsed_again_at_local_midnight(monkeypatch, time_zone) -> None:
+    """The memoized dataset follows the date in the configured time zone."""
+    clock = SimpleNamespace(now=datetime(2026, 10, 18, 23, 30, tzinfo=time_zone))
+    monkeypatch.setattr(dt_util, "now", lambda: clock.now)
+    connector = Connector()
+    prices = RegionPrices(connector, clock.now)
+
+    assert prices.today(True) == [1, 0, True]
+    assert prices.today(True) == [1, 0, True]
+
+    # Still the 18th in UTC, but the 19th locally
+    clock.now = datetime(2026, 10, 19, 0, 30, tzinfo=time_zone)
+    assert prices.today(True) == [2, 0, True]
+    assert connector.parsed == 2
+
+
+def test_resolutions_share_the_dataset() -> None:
+    """Each resolution is parsed once from the same fetch."""
+    connector = Connector()
+    prices = RegionPrices(connector, dt_util.now())
+
+    assert prices.today(True) == [1, 0, True]
+    assert prices.today(False) == [2, 0, False]
+    assert prices.tomorrow(True) == [3, 1, True]
+    assert prices.today(False) == [2, 0, False]
+    assert connector.parsed == 3
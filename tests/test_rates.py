@@ -0,0 +1,20 @@
+"""Tests for the currency conversion rates."""
+
+from __future__ import annotations
+
+from custom_components.energidataservice.utils.rates import RateService
+
+
+def test_rate_is_looked_up_once_per_pair() -> None:
+    """The latest rate is cached per currency pair, unknown currencies as None."""
+    rates = RateService()
+    assert rates.rate("EUR", "EUR") == 1.0
+    assert not rates.loaded
+
+    rate = rates.rate("EUR", "DKK")
+    assert rates.loaded
+    assert 7 < rate < 8
+    assert rates.rate("EUR", "DKK") == rate
+    assert rates.rate("EUR", "XXX") is None
+    # pylint: disable-next=protected-access
+    assert list(rates._rates) == [("EUR", "DKK"), ("EUR", "XXX")]
@@ -0,0 +1,111 @@
+"""Tests for the spot price scheduler."""
+
+from __future__ import annotations
+
+import asyncio
+from datetime import datetime, time
+
+import pytest
+
+from custom_components.energidataservice.utils.scheduler import (
+    MAX_POLL_BACKOFF,
+    POLL_BACKOFF,
+    PriceScheduler,
+)
+
+from .conftest import TIME_ZONE, FakeClock
+
+PUBLICATION = time(13, 10)
+
+
+def make_scheduler(hass, clock: FakeClock) -> PriceScheduler:
+    """Return a scheduler on the fake clock, always jittering to the full backoff."""
+    return PriceScheduler(
+        hass,
+        "DK1",
+        PUBLICATION,
+        now=clock,
+        track_point_in_time=clock.track,
+        jitter=lambda: 1.0,
+    )
+
+
+class Entry:
+    """Subscriber counting its refreshes, complete once prices are set."""
+
+    def __init__(self) -> None:
+        """Initialize the entry."""
+        self.complete = False
+        self.refreshes = 0
+
+    async def refresh(self) -> None:
+        """Count the refresh."""
+        self.refreshes += 1
+
+    def is_complete(self, now: datetime) -> bool:
+        """Return True if tomorrows prices are known."""
+        return self.complete
+
+
+@pytest.mark.asyncio
+async def test_subscribing_does_not_advance_backoff(fake_hass) -> None:
+    """Entries subscribing after the publication share the first poll."""
+    clock = FakeClock(datetime(2026, 10, 18, 14, 0, tzinfo=TIME_ZONE))
+    scheduler = make_scheduler(fake_hass, clock)
+
+    entries = [Entry() for _ in range(6)]
+    for idx, entry in enumerate(entries):
+        scheduler.subscribe(str(idx), entry.refresh, entry.is_complete)
+        scheduler.schedule()
+
+    assert scheduler.attempt == 0
+    assert scheduler.next_poll == clock.now + POLL_BACKOFF
+    assert len(clock.timers) == 1
+
+
+@pytest.mark.asyncio
+async def test_backoff_grows_with_failed_polls_and_resets(fake_hass) -> None:
+    """Failed polls back off exponentially, a complete poll waits for tomorrow."""
+    clock = FakeClock(datetime(2026, 10, 18, 14, 0, tzinfo=TIME_ZONE))
+    scheduler = make_scheduler(fake_hass, clock)
+    entry = Entry()
+    scheduler.subscribe("entry", entry.refresh, entry.is_complete)
+
+    delays = []
+    for _ in range(6):
+        before = clock.now
+        await clock.advance_to_next()
+        delays.append(clock.now - before)
+
+    assert delays == [
+        min(POLL_BACKOFF * 2**attempt, MAX_POLL_BACKOFF) for attempt in range(6)
+    ]
+    assert entry.refreshes == 6
+
+    entry.complete = True
+    await clock.advance_to_next()
+
+    assert scheduler.attempt == 0
+    assert scheduler.next_poll == datetime(2026, 10, 19, 13, 10, tzinfo=TIME_ZONE)
+
+
+@pytest.mark.asyncio
+async def test_concurrent_triggers_share_one_poll(fake_hass) -> None:
+    """Triggers arriving while a poll runs wait for that poll."""
+    clock = FakeClock(datetime(2026, 10, 18, 14, 0, tzinfo=TIME_ZONE))
+    scheduler = make_scheduler(fake_hass, clock)
+    release = asyncio.Event()
+    entry = Entry()
+
+    async def slow_refresh() -> None:
+        await release.wait()
+        await entry.refresh()
+
+    scheduler.subscribe("entry", slow_refresh, entry.is_complete)
+    triggers = [asyncio.ensure_future(scheduler.async_trigger()) for _ in range(3)]
+    await asyncio.sleep(0)
+    release.set()
+    await asyncio.gather(*triggers)
+
+    assert entry.refreshes == 1
+    assert scheduler.attempt == 1
@@ -0,0 +1,96 @@
+"""Tests for the price dataset aggregates."""
+
+from __future__ import annotations
+
+import statistics
+from datetime import datetime, timedelta
+
+import pytest
+
+from custom_components.energidataservice.const import INTERVAL
+from custom_components.energidataservice.utils.statistics import (
+    PriceStatistics,
+    statistics_for,
+)
+
+START = datetime(2026, 10, 18)
+PRICES = [3.0, 1.0, 4.0, 1.0, 5.0, 9.0, 2.0, 6.0, 5.0, 3.0, 9.0, 1.5]
+
+
+def dataset(prices: list) -> list:
+    """Return prices as hourly intervals."""
+    return [
+        INTERVAL(price, START + timedelta(hours=hour))
+        for hour, price in enumerate(prices)
+    ]
+
+
+def test_min_max_first_occurrence() -> None:
+    """The first of equal lowest or highest prices is returned."""
+    data = dataset(PRICES)
+    stats = PriceStatistics(data)
+
+    assert stats.min() is data[1]
+    assert stats.max() is data[5]
+    assert stats.mean() == pytest.approx(statistics.fmean(PRICES))
+
+
+@pytest.mark.parametrize("start", range(len(PRICES) + 1))
+def test_remaining_matches_slice(start: int) -> None:
+    """Aggregates from start are those of the remaining rows."""
+    data = dataset(PRICES)
+    stats = PriceStatistics(data)
+    remaining = data[start:]
+
+    if not remaining:
+        assert stats.min(start) is None
+        assert stats.max(start) is None
+        assert stats.mean(start) is None
+        assert stats.stddev(start) is None
+        return
+
+    lowest = min(row.price for row in remaining)
+    highest = max(row.price for row in remaining)
+    assert stats.min(start) is next(row for row in remaining if row.price == lowest)
+    assert stats.max(start) is next(row for row in remaining if row.price == highest)
+    assert stats.mean(start) == pytest.approx(
+        statistics.fmean(row.price for row in remaining)
+    )
+    assert stats.stddev(start) == pytest.approx(
+        statistics.pstdev(row.price for row in remaining), abs=1e-9
+    )
+
+
+@pytest.mark.parametrize("percent", [0, 10, 25, 50, 75, 90, 100])
+def test_percentiles(percent: int) -> None:
+    """Percentiles interpolate linearly between the sorted prices."""
+    stats = PriceStatistics(dataset(PRICES))
+    expected = statistics.quantiles(PRICES, n=100, method="inclusive")
+    if percent == 0:
+        assert stats.percentile(percent) == min(PRICES)
+    elif percent == 100:
+        assert stats.percentile(percent) == max(PRICES)
+    else:
+        assert stats.percentile(percent) == pytest.approx(expected[percent - 1])
+
+
+def test_empty_dataset() -> None:
+    """An empty dataset has no aggregates."""
+    stats = PriceStatistics([])
+
+    assert len(stats) == 0
+    assert stats.min() is None
+    assert stats.mean() is None
+    assert stats.percentile(50) is None
+    assert stats.raw(3) == []
+
+
+def test_statistics_reused_for_same_dataset() -> None:
+    """Aggregates are only recalculated for a new dataset."""
+    data = dataset(PRICES)
+    stats = statistics_for(None, data)
+
+    assert statistics_for(stats, data) is stats
+    assert statistics_for(stats, dataset(PRICES)) is not stats
+    assert stats.raw(1)[0] == {"hour": START, "price": 3.0}
+    assert stats.raw(1) is stats.raw(1)
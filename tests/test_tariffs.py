@@ -0,0 +1,168 @@
+"""Tests for the Energi Data Service tariff connector."""
+
+from __future__ import annotations
+
+import logging
+from datetime import date, datetime, timedelta
+from urllib.parse import parse_qs
+
+import pytest
+
+from custom_components.energidataservice.tariffs.energidataservice import (
+    MAX_PAGES,
+    PAGE_SIZE,
+    Connector,
+    TariffRow,
+    ValidityIndex,
+    sum_hourly_tariffs,
+)
+
+NOW = datetime(2026, 10, 18, 12, 0)
+
+
+def row(valid_from: str, valid_to: str | None, price: float = 1.0) -> TariffRow:
+    """Return a tariff row with the same price in every hour."""
+    return TariffRow(valid_from, valid_to, "Nettarif", (price,) * 24)
+
+
+class PagedApi:
+    """Serve rows newest first, a page per offset and limit like the API."""
+
+    def __init__(self, connector: Connector, rows: list, fail_page: int | None = None):
+        """Initialize the API."""
+        self.connector = connector
+        self.rows = sorted(rows, key=lambda row: row.valid_from, reverse=True)
+        self.fail_page = fail_page
+        self.pages = 0
+
+    async def __call__(self, query: str) -> list:
+        """Return the page of the query."""
+        params = parse_qs(query)
+        offset = int(params["offset"][0])
+        limit = int(params["limit"][0])
+        self.pages += 1
+        if self.fail_page == offset // limit:
+            self.connector.status = 503
+            return []
+
+        self.connector.status = 200
+        return self.rows[offset : offset + limit]
+
+
+def paged_connector(rows: list, fail_page: int | None = None) -> Connector:
+    """Return a connector serving rows from a paged API."""
+    connector = Connector(None, None, "Radius")
+    connector.async_call_api = PagedApi(connector, rows, fail_page)
+    return connector
+
+
+def history(count: int) -> list:
+    """Return count consecutive daily rows ending before the window."""
+    return [row(f"2020-01-{1 + idx % 28:02d}", "2020-02-01") for idx in range(count)]
+
+
+@pytest.mark.asyncio
+async def test_fetch_window_keeps_old_open_ended_rows() -> None:
+    """A row without an end behind a page of expired rows is still fetched."""
+    open_ended = row("2019-01-01", None, 2.0)
+    current = row("2026-10-01", "2026-11-01")
+    connector = paged_connector([current, open_ended] + history(PAGE_SIZE + 10))
+
+    rows = await connector.async_fetch_window("filter={}", NOW)
+
+    assert rows == [current, open_ended]
+    assert connector.async_call_api.pages == 2
+
+
+@pytest.mark.asyncio
+async def test_fetch_window_stops_at_short_page() -> None:
+    """Paging stops at the first page that isn't full."""
+    connector = paged_connector([row("2026-10-01", None)] + history(PAGE_SIZE - 1))
+
+    rows = await connector.async_fetch_window("filter={}", NOW)
+
+    assert len(rows) == 1
+    assert connector.async_call_api.pages == 2
+
+
+@pytest.mark.asyncio
+async def test_fetch_window_warns_when_truncated(caplog) -> None:
+    """Rows beyond MAX_PAGES are skipped with a warning."""
+    connector = paged_connector(history(MAX_PAGES * PAGE_SIZE + 1))
+
+    with caplog.at_level(logging.WARNING):
+        assert await connector.async_fetch_window("filter={}", NOW) == []
+
+    assert connector.async_call_api.pages == MAX_PAGES
+    assert "older rows were skipped" in caplog.text
+
+
+@pytest.mark.asyncio
+async def test_fetch_window_discards_partial_results() -> None:
+    """A failing page returns nothing rather than part of the window."""
+    connector = paged_connector(
+        [row("2026-10-01", None)] + history(PAGE_SIZE * 2), fail_page=1
+    )
+
+    assert await connector.async_fetch_window("filter={}", NOW) == []
+    assert connector.status == 503
+
+
+def linear_lookup(entries: list, check_date: str) -> dict | None:
+    """Sum the rows valid on check_date by scanning all of them."""
+    valid = [
+        entry
+        for entry in entries
+        if entry.valid_from <= check_date
+        and (entry.valid_to is None or check_date < entry.valid_to)
+    ]
+    return sum_hourly_tariffs(valid) if valid else None
+
+
+def test_validity_index_matches_linear_scan() -> None:
+    """Every date is looked up in the segment of the rows valid on it."""
+    entries = [
+        row("2026-01-01", "2026-04-01", 1.0),
+        row("2026-04-01", None, 2.0),
+        row("2026-03-15", "2026-03-20", 0.5),
+        row("2026-03-20", "2026-03-20", 9.0),
+        row("2026-06-01", "2026-07-01", 0.25),
+    ]
+    index = ValidityIndex(entries, sum_hourly_tariffs)
+
+    day = date(2025, 12, 25)
+    while day < date(2026, 7, 10):
+        check_date = day.isoformat()
+        assert index.get(check_date) == linear_lookup(entries, check_date), check_date
+        day += timedelta(days=1)
+
+
+def test_validity_index_gaps_are_empty() -> None:
+    """Dates before the first row and between rows have no value."""
+    entries = [
+        row("2026-01-01", "2026-02-01"),
+        row("2026-03-01", "2026-04-01"),
+    ]
+    index = ValidityIndex(entries, sum_hourly_tariffs)
+
+    assert index.get("2025-12-31") is None
+    assert index.get("2026-01-31") is not None
+    assert index.get("2026-02-01") is None
+    assert index.get("2026-03-01") is not None
+    assert index.get("2026-04-01") is None
+
+
+def test_validity_index_combines_each_segment_once() -> None:
+    """The value of a segment is calculated on the first lookup only."""
+    calls = []
+
+    def combine(entries):
+        calls.append(entries)
+        return len(entries)
+
+    entries = [row("2026-01-01", None), row("2026-02-01", "2026-03-01")]
+    index = ValidityIndex(entries, combine)
+
+    assert [index.get(day) for day in ("2026-01-10", "2026-01-20")] == [1, 1]
+    assert index.get("2026-02-10") == 2
+    assert calls == [(entries[0],), tuple(entries)]